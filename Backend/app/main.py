@@ -9,6 +9,8 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
 from Backend.app.middleware.middleware import EnhancedSessionMiddleware
 from Backend.app.routers import chat as chat_router
 from Backend.app.routers import user_stat as user_stat_router
+from Retriever.hybrid_retriever import aclose_retriever_clients
+from DB.opensearch import aclose_async_opensearch_clients
 
 app = FastAPI(
     title="MangMangDae AI API",
@@ -47,6 +49,12 @@ app.add_middleware(EnhancedSessionMiddleware)
 app.include_router(chat_router.router, prefix="/api/v1", tags=["Chat"])
 app.include_router(user_stat_router.router, prefix="/api/v1", tags=["User Stat"])
 
+@app.on_event("shutdown")
+async def close_retriever_clients():
+    """비동기 리트리버/OpenSearch 클라이언트(커넥션 풀)를 정리합니다."""
+    await aclose_retriever_clients()
+    await aclose_async_opensearch_clients()
+
 @app.get("/", tags=["Root"])
 def read_root():
     return {"message": "MangMangDae AI API에 오신 것을 환영합니다."} 
\ No newline at end of file
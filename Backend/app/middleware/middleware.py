@@ -10,7 +10,7 @@ from datetime import datetime
 # 프로젝트 루트 경로 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
 
-from DB.redis_connect import RedisSessionManager
+from DB.redis_connect import get_redis_session_manager
 
 SESSION_COOKIE_NAME = "session_id"
 
@@ -18,7 +18,7 @@ class EnhancedSessionMiddleware(BaseHTTPMiddleware):
     def __init__(self, app):
         super().__init__(app)
         try:
-            self.redis_manager = RedisSessionManager()
+            self.redis_manager = get_redis_session_manager()
             print(f"✅ Redis SessionManager initialized successfully")
         except Exception as e:
             print(f"❌ Redis 연결 실패 - 세션 관리가 제한됩니다: {e}")
@@ -10,14 +10,14 @@ from typing import Dict, List, Any
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from Backend.app.schemas.schemas import ChatRequest, ChatResponse
-from DB.redis_connect import RedisSessionManager
-from WorkFlow.SLD.agents import run_job_advisor_workflow
+from DB.redis_connect import get_redis_session_manager
+from WorkFlow.SLD.agents import run_job_advisor_workflow_async
 
 router = APIRouter()
 
 # RedisSessionManager 인스턴스를 생성합니다.
 try:
-    redis_connect = RedisSessionManager()
+    redis_connect = get_redis_session_manager()
 except Exception as e:
     print(f"CRITICAL: Redis 연결에 실패하여 서버를 시작할 수 없습니다. {e}")
     redis_connect = None
@@ -70,8 +70,8 @@ async def handle_chat(request: Request, chat_request: ChatRequest):
     }
 
     try:
-        # WorkFlow 실행
-        final_state = run_job_advisor_workflow(current_input, previous_state)
+        # WorkFlow 실행 (비동기: 리트리버/LLM 호출 동안 다른 세션 요청을 막지 않음)
+        final_state = await run_job_advisor_workflow_async(current_input, previous_state)
 
         # 세션 상태 저장
         redis_connect.save_session_state(session_id, final_state, "short")
@@ -27,4 +27,4 @@ async def get_user_stat(request: Request, stat_request: UserStatRequest):
         "candidate_question": user_profile.get("candidate_question", "")
     }
     stat_user = StatUser()
-    return stat_user.get_user_stat(user_info)
\ No newline at end of file
+    return await stat_user.get_user_stat(user_info)
\ No newline at end of file
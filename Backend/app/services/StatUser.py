@@ -1,4 +1,5 @@
 ### 유저 통계 서비스 ###
+import asyncio
 import os
 import sys
 from datetime import datetime, timedelta
@@ -28,15 +29,22 @@ class StatUser:
         self.db = OpenSearchDB()
     
 
-    def get_user_stat(self, user_info: dict) -> Dict[str, Any]:
-        """사용자 정보 기반 종합 통계 생성"""
+    async def get_user_stat(self, user_info: dict) -> Dict[str, Any]:
+        """사용자 정보 기반 종합 통계 생성 (OpenSearch 조회 항목은 동시에 실행)"""
+        interest, tech_stack, location, career, market_trends = await asyncio.gather(
+            self._get_interest_stats(user_info.get("candidate_interest", "")),
+            self._get_tech_stack_stats(user_info.get("candidate_tech_stack", [])),
+            self._get_location_stats(user_info.get("candidate_location", "")),
+            self._get_career_stats(user_info.get("candidate_career", "")),
+            self._get_market_trends(),
+        )
         return {
             "user_info": self._extract_user_summary(user_info),
-            "interest": self._get_interest_stats(user_info.get("candidate_interest", "")),
-            "tech_stack": self._get_tech_stack_stats(user_info.get("candidate_tech_stack", [])),
-            "location": self._get_location_stats(user_info.get("candidate_location", "")),
-            "career": self._get_career_stats(user_info.get("candidate_career", "")),
-            "market_trends": self._get_market_trends(),
+            "interest": interest,
+            "tech_stack": tech_stack,
+            "location": location,
+            "career": career,
+            "market_trends": market_trends,
             "salary_insights": self._get_salary_insights(user_info),
             "company_size_distribution": self._get_company_size_distribution(user_info.get("candidate_interest", "")),
         }
@@ -51,7 +59,7 @@ class StatUser:
             "기술스택": user_info.get("candidate_tech_stack", [])
         }
 
-    def _get_interest_stats(self, interest: str) -> Dict[str, Any]:
+    async def _get_interest_stats(self, interest: str) -> Dict[str, Any]:
         """관심 분야 기반 통계"""
         if not interest:
             return {"message": "관심 분야 정보가 없습니다."}
@@ -76,7 +84,7 @@ class StatUser:
                 }
             }
             
-            response = self.db.search(query, size=9662)
+            response = await self.db.async_search(query, size=9662)
             total_job = response['hits']['total']['value']
             
             return {"interest": interest, "total_job": total_job}
@@ -84,15 +92,14 @@ class StatUser:
         except Exception as e:
             return {"error": f"관심 분야 통계 생성 실패: {str(e)}"}
         
-    def _get_tech_stack_stats(self, tech_stacks: List[str]) -> Dict[str, Any]:
+    async def _get_tech_stack_stats(self, tech_stacks: List[str]) -> Dict[str, Any]:
         """기술 스택별 채용 회사 수 반환"""
         if not tech_stacks:
             return {"message": "기술 스택 정보가 없습니다."}
             
         try:
-            tech_company_count = {}
-            
             # 각 기술별 회사 수 조사 (aggregation 사용)
+            queries = []
             for tech in tech_stacks:
                 query = {
                     "query": {
@@ -111,8 +118,11 @@ class StatUser:
                         }
                     }
                 }
+                queries.append(query)
             
-                response = self.db.search(query, size=0)
+            responses = await asyncio.gather(*(self.db.async_search(query, size=0) for query in queries))
+            tech_company_count = {}
+            for tech, response in zip(tech_stacks, responses):
                 buckets = response.get('aggregations', {}).get('unique_companies', {}).get('buckets', [])
                 company_count = len(buckets)
                 tech_company_count[tech] = company_count
@@ -122,7 +132,7 @@ class StatUser:
         except Exception as e:
             return {"error": f"기술 스택 통계 생성 실패: {str(e)}"}
 
-    def _get_location_stats(self, location: str) -> Dict[str, Any]:
+    async def _get_location_stats(self, location: str) -> Dict[str, Any]:
         """지역별 채용 통계"""
         if not location:
             return {"message": "희망 지역 정보가 없습니다."}
@@ -139,9 +149,6 @@ class StatUser:
                 }
             }
             
-            response = self.db.search(query, size=0)
-            total_jobs = response['hits']['total']['value']
-            
             # 인기 직무 카테고리 (상위 5개)
             category_query = {
                 "query": {
@@ -161,7 +168,11 @@ class StatUser:
                 }
             }
             
-            category_response = self.db.search(category_query, size=0)
+            response, category_response = await asyncio.gather(
+                self.db.async_search(query, size=0),
+                self.db.async_search(category_query, size=0)
+            )
+            total_jobs = response['hits']['total']['value']
             categories = category_response.get('aggregations', {}).get('popular_categories', {}).get('buckets', [])
             popular_categories = [{"category": bucket['key'], "count": bucket['doc_count']} for bucket in categories]
             
@@ -174,59 +185,46 @@ class StatUser:
         except Exception as e:
             return {"error": f"지역 통계 생성 실패: {str(e)}"}
 
-    def _get_career_stats(self, career: str) -> Dict[str, Any]:
+    async def _get_career_stats(self, career: str) -> Dict[str, Any]:
         """경력별 채용 통계"""
         if not career:
             return {"message": "경력 정보가 없습니다."}
             
         try:
-            # 전체 채용공고 수 먼저 조회
+            # 전체 채용공고 수
             all_jobs_query = {"query": {"match_all": {}}}
-            all_jobs_response = self.db.search(all_jobs_query, size=0)
-            total_jobs = all_jobs_response['hits']['total']['value']
             
             # 경력/신입 구분에 따른 매칭
             if "신입" in career or "경력없음" in career:
                 # 신입의 경우: 경력 요구사항이 낮은 공고들
                 search_terms = ["신입", "경력무관", "초보", "junior", "entry"]
-                matching_jobs = 0
-                
-                for term in search_terms:
-                    query = {
-                        "query": {
-                            "multi_match": {
-                                "query": term,
-                                "fields": ["career", "qualifications", "position_detail"],
-                                "fuzziness": "AUTO"
-                            }
-                        }
-                    }
-                    response = self.db.search(query, size=0)
-                    matching_jobs += response['hits']['total']['value']
-                
                 # 중복 제거를 위해 대략적으로 조정 (실제로는 더 정교한 로직 필요)
-                matching_jobs = min(matching_jobs, int(total_jobs * 0.3))  # 최대 30%로 제한
-                
+                max_ratio = 0.3  # 최대 30%로 제한
             else:
                 # 경력자의 경우: 경력 요구사항이 있는 공고들
                 search_terms = ["경력", "년이상", "experience", "senior", "년 이상"]
-                matching_jobs = 0
-                
-                for term in search_terms:
-                    query = {
-                        "query": {
-                            "multi_match": {
-                                "query": term,
-                                "fields": ["career", "qualifications", "position_detail"],
-                                "fuzziness": "AUTO"
-                            }
+                # 중복 제거를 위해 대략적으로 조정
+                max_ratio = 0.7  # 최대 70%로 제한
+            
+            term_queries = [
+                {
+                    "query": {
+                        "multi_match": {
+                            "query": term,
+                            "fields": ["career", "qualifications", "position_detail"],
+                            "fuzziness": "AUTO"
                         }
                     }
-                    response = self.db.search(query, size=0)
-                    matching_jobs += response['hits']['total']['value']
-                
-                # 중복 제거를 위해 대략적으로 조정
-                matching_jobs = min(matching_jobs, int(total_jobs * 0.7))  # 최대 70%로 제한
+                }
+                for term in search_terms
+            ]
+            all_jobs_response, *term_responses = await asyncio.gather(
+                self.db.async_search(all_jobs_query, size=0),
+                *(self.db.async_search(query, size=0) for query in term_queries)
+            )
+            total_jobs = all_jobs_response['hits']['total']['value']
+            matching_jobs = sum(response['hits']['total']['value'] for response in term_responses)
+            matching_jobs = min(matching_jobs, int(total_jobs * max_ratio))
             
             percentage = (matching_jobs / total_jobs * 100) if total_jobs > 0 else 0
             
@@ -246,7 +244,7 @@ class StatUser:
                 "percentage": 30.0 if "신입" in career else 56.0
             }
 
-    def _get_market_trends(self) -> Dict[str, Any]:
+    async def _get_market_trends(self) -> Dict[str, Any]:
         """시장 트렌드 분석 (가벼운 처리)"""
         try:
             # 최근 채용공고 추세 (간단한 샘플링)
@@ -268,7 +266,7 @@ class StatUser:
                 }
             }
             
-            response = self.db.search(recent_query, size=0)
+            response = await self.db.async_search(recent_query, size=0)
             hot_categories = response.get('aggregations', {}).get('hot_technologies', {}).get('buckets', [])
             
             # 상위 5개만 반환
@@ -349,10 +347,10 @@ if __name__ == "__main__":
     stat_user = StatUser()
     
     print("=== 관심분야 통계 ===")
-    print(stat_user._get_interest_stats(interest))
+    print(asyncio.run(stat_user._get_interest_stats(interest)))
     
     print("\n=== 기술스택별 회사 수 ===")
-    tech_stats = stat_user._get_tech_stack_stats(tech_stacks)
+    tech_stats = asyncio.run(stat_user._get_tech_stack_stats(tech_stacks))
     print(tech_stats)
     
     # 예시 출력: {"Python": 150, "React": 98, "Java": 200, "Docker": 75, "AWS": 180}
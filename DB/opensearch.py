@@ -1,11 +1,12 @@
+import asyncio
 import os
+import threading
+import weakref
 from dotenv import load_dotenv
-from opensearchpy import OpenSearch, RequestsHttpConnection
-from requests_aws4auth import AWS4Auth
-import boto3
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from DB.logger import setup_logger
+from DB.opensearch_transport import create_async_opensearch_client, create_opensearch_client
 
 # 로거 설정
 logger = setup_logger(__name__)
@@ -17,6 +18,54 @@ AWS_REGION = os.getenv("AWS_REGION")
 OPENSEARCH_HOST = os.getenv("OPENSEARCH_HOST")
 OPENSEARCH_PORT = int(os.getenv("OPENSEARCH_PORT", "443"))
 OPENSEARCH_INDEX = os.getenv("OPENSEARCH_INDEX", "opensearch_job")
+# hybrid 검색 파이프라인 (Retriever RETRIEVAL_MODE=hybrid에서 사용)
+HYBRID_SEARCH_PIPELINE = os.getenv("HYBRID_SEARCH_PIPELINE", "mmd-hybrid-pipeline")
+HYBRID_NORMALIZATION = os.getenv("HYBRID_NORMALIZATION", "min_max")
+# 하위 쿼리 순서(텍스트, kNN)별 결합 가중치
+HYBRID_WEIGHTS = [float(w) for w in os.getenv("HYBRID_WEIGHTS", "0.4,0.6").split(",")]
+
+# 프로세스 전역 클라이언트 (요청마다 OpenSearchDB를 만들어도 커넥션 풀을 공유)
+_client = None
+_client_lock = threading.Lock()
+# 이벤트 루프별 AsyncOpenSearch 클라이언트 (aiohttp 세션은 생성된 루프에서만 사용할 수 있음)
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def _client_settings():
+    return {
+        "host": OPENSEARCH_HOST,
+        "port": OPENSEARCH_PORT,
+        "region": AWS_REGION,
+        "access_key": AWS_ACCESS_KEY_ID,
+        "secret_key": AWS_SECRET_ACCESS_KEY,
+    }
+
+
+def get_opensearch_client():
+    """프로세스 전역 OpenSearch 클라이언트를 반환합니다. (첫 호출 시 생성)"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = create_opensearch_client(**_client_settings())
+    return _client
+
+
+def get_async_opensearch_client():
+    """현재 이벤트 루프의 AsyncOpenSearch 클라이언트를 반환합니다."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = create_async_opensearch_client(**_client_settings())
+        _async_clients[loop] = client
+    return client
+
+
+async def aclose_async_opensearch_clients():
+    """현재 이벤트 루프의 AsyncOpenSearch 클라이언트를 닫습니다. (애플리케이션 종료 시 호출)"""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
 
 
 class OpenSearchDB:
@@ -31,32 +80,8 @@ class OpenSearchDB:
         # 환경 변수 검증
         self._validate_environment()
         
-        # AWS 인증 설정
-        credentials = boto3.Session(
-            aws_access_key_id=AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-            region_name=AWS_REGION
-        ).get_credentials()
-        
-        self.awsauth = AWS4Auth(
-            credentials.access_key,
-            credentials.secret_key,
-            AWS_REGION,
-            'es',
-            session_token=credentials.token
-        )
-        
-        # OpenSearch 클라이언트 초기화
-        self.client = OpenSearch(
-            hosts=[{'host': self.host, 'port': self.port}],
-            http_auth=self.awsauth,
-            use_ssl=True,
-            verify_certs=True,
-            connection_class=RequestsHttpConnection,
-            timeout=30,
-            max_retries=3,
-            retry_on_timeout=True
-        )
+        # 커넥션 풀/SigV4(자격 증명 자동 갱신)가 설정된 공유 클라이언트
+        self.client = get_opensearch_client()
         
         logger.info(f"OpenSearch class initialized. Host: {self.host}, Index: {self.index_name}")
     
@@ -136,6 +161,13 @@ class OpenSearchDB:
                         "hiring_process": {"type": "text", "analyzer": "standard"},
                         "created_at": {"type": "date", "format": "strict_date_optional_time||epoch_millis"},
                         "career": {"type": "text", "analyzer": "standard"},
+                        # 정규화된 경력 범위/신입 여부 (range/term 필터, kNN 사전 필터용)
+                        "career_min_years": {"type": "integer"},
+                        "career_max_years": {"type": "integer"},
+                        "career_new_grad": {"type": "boolean"},
+                        # 정규화된 지역 코드 (term 필터용, 예: "서울", "서울 강남구")
+                        "region_sido": {"type": "keyword"},
+                        "region_sigungu": {"type": "keyword"},
                         #임베딩 관련 필드들 추가
                         "content_embedding": {
                             "type": "knn_vector",
@@ -153,6 +185,11 @@ class OpenSearchDB:
                             "type": "text",
                             "analyzer": "standard"
                         },
+                        # 리랭커 입력 텍스트 (마이그레이션 시 최대 토큰 길이로 잘라 저장, 검색 대상 아님)
+                        "rerank_text": {
+                            "type": "text",
+                            "index": False
+                        },
                         "updated_at": {
                             "type": "date", 
                             "format": "strict_date_optional_time||epoch_millis"
@@ -285,6 +322,64 @@ class OpenSearchDB:
             logger.error(f"Error searching documents: {str(e)}")
             raise
     
+    async def async_search(self, query, index_name=None, size=10):
+        """
+        AsyncOpenSearch로 검색을 수행합니다. (이벤트 루프를 막지 않음, 현재 루프의 클라이언트 사용)
+        
+        Args:
+            query (dict): 검색 쿼리
+            index_name (str): 인덱스 이름 (기본값: self.index_name)
+            size (int): 반환할 결과 수 (기본값: 10)
+        """
+        if index_name is None:
+            index_name = self.index_name
+            
+        try:
+            response = await get_async_opensearch_client().search(
+                index=index_name,
+                body=query,
+                size=size
+            )
+            logger.info(f"Async search completed. Found {response['hits']['total']['value']} documents")
+            return response
+        except Exception as e:
+            logger.error(f"Error searching documents: {str(e)}")
+            raise
+    
+    def create_hybrid_search_pipeline(self, pipeline_name=None, normalization=None, weights=None):
+        """
+        hybrid 쿼리 점수를 정규화/결합하는 검색 파이프라인을 생성합니다. (이미 있으면 덮어씀)
+        OpenSearch 2.10+ 와 neural-search 플러그인이 필요합니다.
+        
+        Args:
+            pipeline_name (str): 파이프라인 이름 (기본값: HYBRID_SEARCH_PIPELINE)
+            normalization (str): 정규화 방식 min_max | l2 (기본값: HYBRID_NORMALIZATION)
+            weights (list): 하위 쿼리(텍스트, kNN)별 가중치 (기본값: HYBRID_WEIGHTS)
+        """
+        pipeline_name = pipeline_name or HYBRID_SEARCH_PIPELINE
+        body = {
+            "description": "Hybrid search score normalization (BM25 + kNN)",
+            "phase_results_processors": [
+                {
+                    "normalization-processor": {
+                        "normalization": {"technique": normalization or HYBRID_NORMALIZATION},
+                        "combination": {
+                            "technique": "arithmetic_mean",
+                            "parameters": {"weights": weights or HYBRID_WEIGHTS}
+                        }
+                    }
+                }
+            ]
+        }
+        
+        try:
+            response = self.client.transport.perform_request("PUT", f"/_search/pipeline/{pipeline_name}", body=body)
+            logger.info(f"Successfully created search pipeline: {pipeline_name}")
+            return response
+        except Exception as e:
+            logger.error(f"Error creating search pipeline {pipeline_name}: {str(e)}")
+            raise
+    
     def delete_index(self, index_name=None):
         """
         인덱스를 삭제합니다.
@@ -0,0 +1,117 @@
+"""
+OpenSearch 클라이언트 팩토리 (리트리버 Lambda, DB/opensearch.py)
+
+Lambda 이미지는 Retriever 디렉토리만 포함하고 웹 앱(DB 패키지)은 Lambda 코드를 임포트하지 않도록,
+Retriever/opensearch_transport.py와 DB/opensearch_transport.py에 같은 파일을 둡니다.
+한쪽을 고치면 다른 쪽도 같이 고쳐야 합니다. (DB/tests/test_opensearch_transport.py가 동일 여부 검사)
+
+- urllib3 커넥션 풀(Urllib3HttpConnection)을 호스트당 OPENSEARCH_POOL_MAXSIZE개까지 유지해
+  동시 요청이 기본 풀 크기(10)에 막혀 직렬화되지 않게 합니다.
+- SigV4 서명은 boto3 자격 증명 객체를 그대로 넘겨 요청마다 서명합니다. IAM 역할/SSO처럼 만료되는
+  자격 증명(RefreshableCredentials)은 만료 전에 자동 갱신됩니다. (AWS4Auth는 생성 시점 키로 고정)
+- create_async_opensearch_client는 같은 설정의 AsyncOpenSearch(aiohttp)를 만듭니다. (opensearch-py[async] 필요)
+
+사용 예시:
+    client = create_opensearch_client(host, port=443, auth='sigv4', region='ap-northeast-2')
+    response = client.search(index='opensearch_job', body=query)
+"""
+import logging
+import os
+from typing import Any, Dict, Optional
+
+import boto3
+
+logger = logging.getLogger(__name__)
+
+# 호스트당 유지할 최대 커넥션 수 (동시 검색 요청 수 이상으로 설정)
+OPENSEARCH_POOL_MAXSIZE = int(os.environ.get('OPENSEARCH_POOL_MAXSIZE', '32'))
+OPENSEARCH_TIMEOUT = float(os.environ.get('OPENSEARCH_TIMEOUT', '30'))
+OPENSEARCH_MAX_RETRIES = int(os.environ.get('OPENSEARCH_MAX_RETRIES', '3'))
+OPENSEARCH_SERVICE = os.environ.get('OPENSEARCH_SERVICE', 'es')  # 서버리스 컬렉션은 'aoss'
+
+
+def get_aws_credentials(access_key: Optional[str] = None, secret_key: Optional[str] = None,
+                        region: Optional[str] = None):
+    """
+    SigV4 서명용 boto3 자격 증명을 반환합니다.
+
+    키가 주어지지 않으면 기본 자격 증명 체인(Lambda 실행 역할, 인스턴스 프로파일 등)을 사용하며,
+    이 경우 갱신 가능한 자격 증명이 반환됩니다.
+    """
+    session = boto3.Session(
+        aws_access_key_id=access_key or None,
+        aws_secret_access_key=secret_key or None,
+        region_name=region
+    )
+    credentials = session.get_credentials()
+    if credentials is None:
+        raise ValueError("AWS 자격 증명을 찾을 수 없습니다.")
+    return credentials
+
+
+def _client_kwargs(host: str, port: int, use_ssl: bool, pool_maxsize: Optional[int],
+                   timeout: Optional[float], max_retries: Optional[int]) -> Dict[str, Any]:
+    return {
+        'hosts': [{'host': host, 'port': port}],
+        'use_ssl': use_ssl,
+        'verify_certs': use_ssl,
+        'timeout': OPENSEARCH_TIMEOUT if timeout is None else timeout,
+        'max_retries': OPENSEARCH_MAX_RETRIES if max_retries is None else max_retries,
+        'retry_on_timeout': True,
+        # 커넥션 클래스의 풀 크기 (Urllib3HttpConnection / AsyncHttpConnection 공통 인자)
+        'maxsize': pool_maxsize or OPENSEARCH_POOL_MAXSIZE,
+    }
+
+
+def create_opensearch_client(host: str, port: int = 443, auth: str = 'sigv4', use_ssl: bool = True,
+                             region: Optional[str] = None, access_key: Optional[str] = None,
+                             secret_key: Optional[str] = None, pool_maxsize: Optional[int] = None,
+                             timeout: Optional[float] = None, max_retries: Optional[int] = None):
+    """
+    커넥션 풀/SigV4가 설정된 동기 OpenSearch 클라이언트를 생성합니다.
+
+    Args:
+        host (str): OpenSearch 호스트
+        port (int): 포트
+        auth (str): 'sigv4' | 'none' (로컬 OpenSearch)
+        use_ssl (bool): HTTPS 사용 여부 (인증서 검증 포함)
+        region (str): SigV4 서명 리전
+        access_key, secret_key (str): 전용 키 (없으면 기본 자격 증명 체인)
+        pool_maxsize (int): 호스트당 커넥션 풀 크기 (기본값: OPENSEARCH_POOL_MAXSIZE)
+        timeout (float): 요청 타임아웃(초)
+        max_retries (int): 재시도 횟수
+    """
+    from opensearchpy import OpenSearch, Urllib3AWSV4SignerAuth, Urllib3HttpConnection
+
+    http_auth = None
+    if auth == 'sigv4':
+        credentials = get_aws_credentials(access_key, secret_key, region)
+        http_auth = Urllib3AWSV4SignerAuth(credentials, region, OPENSEARCH_SERVICE)
+
+    kwargs = _client_kwargs(host, port, use_ssl, pool_maxsize, timeout, max_retries)
+    client = OpenSearch(http_auth=http_auth, connection_class=Urllib3HttpConnection, **kwargs)
+    logger.info(f"✅ OpenSearch 클라이언트 생성 (풀 크기 {kwargs['maxsize']}, 인증 {auth})")
+    return client
+
+
+def create_async_opensearch_client(host: str, port: int = 443, auth: str = 'sigv4', use_ssl: bool = True,
+                                   region: Optional[str] = None, access_key: Optional[str] = None,
+                                   secret_key: Optional[str] = None, pool_maxsize: Optional[int] = None,
+                                   timeout: Optional[float] = None, max_retries: Optional[int] = None):
+    """
+    create_opensearch_client와 같은 설정의 AsyncOpenSearch 클라이언트를 생성합니다.
+
+    aiohttp 세션은 생성된 이벤트 루프에서만 사용할 수 있으므로 루프마다 만들고,
+    종료 시 `await client.close()`로 커넥션 풀을 정리해야 합니다.
+    """
+    from opensearchpy import AsyncHttpConnection, AsyncOpenSearch, AWSV4SignerAsyncAuth
+
+    http_auth = None
+    if auth == 'sigv4':
+        credentials = get_aws_credentials(access_key, secret_key, region)
+        http_auth = AWSV4SignerAsyncAuth(credentials, region, OPENSEARCH_SERVICE)
+
+    kwargs = _client_kwargs(host, port, use_ssl, pool_maxsize, timeout, max_retries)
+    client = AsyncOpenSearch(http_auth=http_auth, connection_class=AsyncHttpConnection, **kwargs)
+    logger.info(f"✅ 비동기 OpenSearch 클라이언트 생성 (풀 크기 {kwargs['maxsize']}, 인증 {auth})")
+    return client
@@ -220,6 +220,16 @@ class RedisSessionManager:
 # 하위 호환성을 위한 별칭
 RedisConnect = RedisSessionManager
 
+# 프로세스 전역 RedisSessionManager (세션/검색 결과 캐시 등이 하나의 커넥션 풀을 공유)
+_redis_session_manager = None
+
+def get_redis_session_manager() -> RedisSessionManager:
+    """공유 RedisSessionManager를 반환합니다. 연결에 실패하면 예외를 그대로 전달합니다."""
+    global _redis_session_manager
+    if _redis_session_manager is None:
+        _redis_session_manager = RedisSessionManager()
+    return _redis_session_manager
+
 if __name__ == "__main__":
     rc = RedisSessionManager()
     session_id = "10"  # 저장할 때 쓴 세션 ID (예: WorkFlow/main.py에서 user_id=10)
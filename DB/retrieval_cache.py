@@ -0,0 +1,180 @@
+"""
+검색 결과 Redis 캐시
+
+정규화한 사용자 프로필 + 질문 + 제외 ID를 정렬된 JSON으로 만든 뒤 해시한 값을 키로 사용해
+같은 추천 요청이 임베딩/검색/리랭킹을 다시 거치지 않도록 합니다.
+
+키에는 OpenSearch 인덱스 세대(generation)가 포함됩니다. 마이그레이션이 끝나면 bump_index_generation()으로
+세대를 올려 이전 세대의 항목이 더 이상 조회되지 않도록 하고, 남은 항목은 TTL로 만료됩니다.
+
+요청에 없는 리트리버 기본 설정(RETRIEVAL_MODE, RETRIEVAL_BOOSTS 등)도 결과를 바꾸므로 키에 포함합니다.
+Lambda처럼 설정이 이 프로세스의 환경 변수와 분리된 배포에서는, 기본 설정을 바꿀 때
+RETRIEVAL_CACHE_CONFIG_VERSION을 올려 이전 설정으로 만든 항목을 무효화합니다.
+"""
+import hashlib
+import json
+import os
+import time
+import unicodedata
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+from DB.logger import setup_logger
+from DB.redis_connect import get_redis_session_manager
+
+load_dotenv()
+logger = setup_logger(__name__)
+
+RETRIEVAL_CACHE_TTL = int(os.getenv("RETRIEVAL_CACHE_TTL", "3600"))
+# 인덱스 세대를 로컬에 캐시하는 시간(초): 요청마다 세대를 조회하는 왕복을 줄임
+RETRIEVAL_CACHE_GENERATION_TTL = float(os.getenv("RETRIEVAL_CACHE_GENERATION_TTL", "10"))
+
+KEY_PREFIX = "retrieval:v1"
+GENERATION_KEY = "retrieval:index_generation"
+
+# 리트리버 기본 설정을 바꿀 때 올리는 설정 버전
+RETRIEVAL_CACHE_CONFIG_VERSION = os.getenv("RETRIEVAL_CACHE_CONFIG_VERSION", "1")
+# 요청에서 지정하지 않으면 리트리버가 환경 변수 기본값을 사용하는 설정 (lambda_function.py와 같은 이름)
+SERVER_CONFIG_ENV = [
+    "RETRIEVAL_MODE", "RETRIEVAL_BOOSTS", "RETRIEVAL_POOL_MULTIPLIER", "RETRIEVAL_TWO_PHASE",
+    "CAREER_RANGE_FILTER", "REGION_TERM_FILTER", "RRF_RANK_CONSTANT", "RERANK_INDEXED_TEXT",
+]
+
+# 캐시 키에 포함하는 프로필 필드 (검색 결과에 영향을 주는 필드만)
+PROFILE_FIELDS = [
+    "candidate_major", "candidate_interest", "candidate_career",
+    "candidate_location", "candidate_question", "hyde_query",
+]
+
+
+def _normalize_text(value: Any) -> str:
+    """NFC 정규화 + 연속 공백 정리 + 대소문자 무시"""
+    if value is None:
+        return ""
+    return " ".join(unicodedata.normalize("NFC", str(value)).split()).casefold()
+
+
+def server_config() -> Dict[str, str]:
+    """캐시 키에 포함할 리트리버 기본 설정 (설정 버전 + 이 프로세스에서 보이는 기본값 환경 변수)"""
+    config = {"version": RETRIEVAL_CACHE_CONFIG_VERSION}
+    config.update({name: os.environ[name] for name in SERVER_CONFIG_ENV if name in os.environ})
+    return config
+
+
+def canonical_request(request: Dict[str, Any]) -> Dict[str, Any]:
+    """검색 요청에서 결과에 영향을 주는 값만 정규화해 추립니다."""
+    user_profile = request.get("user_profile", {}) or {}
+    profile = {field: _normalize_text(user_profile.get(field)) for field in PROFILE_FIELDS}
+    profile["candidate_tech_stack"] = sorted({_normalize_text(t) for t in user_profile.get("candidate_tech_stack", []) or [] if t})
+    profile["company_name_filter"] = sorted({_normalize_text(c) for c in user_profile.get("company_name_filter", []) or [] if c})
+
+    canonical = {
+        "profile": profile,
+        "top_k": int(request.get("top_k", 5)),
+        "exclude_ids": sorted(set(request.get("exclude_ids", []) or [])),
+        "fields": sorted(request.get("fields", []) or []),
+        # 쿼리 벡터를 요청하지 않고 저장된 응답에는 query_vector가 없음
+        "return_query_vector": bool(request.get("return_query_vector")),
+        "config": server_config(),
+    }
+    # 실험용 검색 옵션은 지정된 경우에만 키에 포함 (기본 요청의 키는 그대로 유지)
+    options = {option: request[option] for option in ("boosts", "pool_size", "use_reranker", "retrieval_mode") if option in request}
+    if options:
+        canonical["options"] = options
+    return canonical
+
+
+def cache_key_digest(request: Dict[str, Any]) -> str:
+    """정규화된 요청의 SHA-256 해시"""
+    canonical = json.dumps(canonical_request(request), ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class RetrievalResultCache:
+    """Redis 기반 검색 결과 캐시"""
+
+    def __init__(self, redis_client, ttl: int = RETRIEVAL_CACHE_TTL):
+        self.redis_client = redis_client
+        self.ttl = ttl
+        self._generation: Optional[int] = None
+        self._generation_checked_at = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    def get_index_generation(self) -> int:
+        """현재 인덱스 세대를 반환합니다. (짧은 시간 로컬 캐시)"""
+        now = time.monotonic()
+        if self._generation is None or now - self._generation_checked_at > RETRIEVAL_CACHE_GENERATION_TTL:
+            value = self.redis_client.get(GENERATION_KEY)
+            self._generation = int(value) if value is not None else 0
+            self._generation_checked_at = now
+        return self._generation
+
+    def bump_index_generation(self) -> int:
+        """인덱스 세대를 올려 이전 검색 결과를 모두 무효화합니다."""
+        self._generation = int(self.redis_client.incr(GENERATION_KEY))
+        self._generation_checked_at = time.monotonic()
+        logger.info(f"검색 결과 캐시 무효화: 인덱스 세대 -> {self._generation}")
+        return self._generation
+
+    def _key(self, request: Dict[str, Any]) -> str:
+        return f"{KEY_PREFIX}:{self.get_index_generation()}:{cache_key_digest(request)}"
+
+    def get(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """캐시된 응답 데이터를 반환합니다. 없거나 오류가 나면 None."""
+        try:
+            value = self.redis_client.get(self._key(request))
+        except Exception as e:
+            logger.warning(f"검색 결과 캐시 조회 실패: {e}")
+            return None
+
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(value)
+
+    def set(self, request: Dict[str, Any], result_data: Dict[str, Any]) -> None:
+        """응답 데이터를 저장합니다. 결과가 비어 있으면 저장하지 않습니다."""
+        if not result_data or not result_data.get("doc_ids"):
+            return
+        try:
+            self.redis_client.set(self._key(request), json.dumps(result_data, ensure_ascii=False), ex=self.ttl)
+        except Exception as e:
+            logger.warning(f"검색 결과 캐시 저장 실패: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "index_generation": self._generation,
+        }
+
+
+_retrieval_cache = None
+_retrieval_cache_failed = False
+
+def get_retrieval_cache() -> Optional[RetrievalResultCache]:
+    """
+    공유 Redis 연결을 사용하는 검색 결과 캐시를 반환합니다.
+    Redis에 연결할 수 없으면 None을 반환하고, 이후에는 재시도하지 않습니다. (검색은 캐시 없이 진행)
+    """
+    global _retrieval_cache, _retrieval_cache_failed
+    if _retrieval_cache is None and not _retrieval_cache_failed:
+        try:
+            _retrieval_cache = RetrievalResultCache(get_redis_session_manager().redis_client)
+        except Exception as e:
+            _retrieval_cache_failed = True
+            logger.warning(f"검색 결과 캐시를 사용할 수 없습니다 (Redis 연결 실패): {e}")
+    return _retrieval_cache
+
+
+def bump_index_generation() -> Optional[int]:
+    """인덱스 세대를 올립니다. (마이그레이션 완료 후 호출)"""
+    cache = get_retrieval_cache()
+    if cache is None:
+        return None
+    return cache.bump_index_generation()
@@ -0,0 +1,12 @@
+import filecmp
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def test_copies_are_identical():
+    """Lambda 이미지용 사본(Retriever)과 웹 앱용 사본(DB)이 같은지 확인"""
+    assert filecmp.cmp(
+        os.path.join(ROOT, "DB", "opensearch_transport.py"),
+        os.path.join(ROOT, "Retriever", "opensearch_transport.py"),
+        shallow=False,
+    )
@@ -0,0 +1,63 @@
+import pytest
+
+from DB import retrieval_cache
+from DB.retrieval_cache import RetrievalResultCache, cache_key_digest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+PROFILE = {"candidate_interest": "백엔드", "candidate_tech_stack": ["Python", "Django"], "candidate_question": "추천해줘"}
+RESULT = {"scores": [1.0], "doc_ids": ["job-1"], "documents": [{}]}
+
+@pytest.fixture
+def cache():
+    return RetrievalResultCache(fakeredis.FakeRedis(), ttl=60)
+
+class TestCacheKey:
+    def test_normalized_profile_shares_key(self):
+        """공백/대소문자/기술 스택 순서만 다른 요청은 같은 키"""
+        other = {**PROFILE, "candidate_interest": " 백엔드  ", "candidate_tech_stack": ["django", "python"]}
+        assert cache_key_digest({"user_profile": PROFILE}) == cache_key_digest({"user_profile": other})
+
+    def test_return_query_vector_changes_key(self):
+        """쿼리 벡터 없이 저장된 응답을 쿼리 벡터가 필요한 요청에 돌려주지 않음"""
+        assert cache_key_digest({"user_profile": PROFILE}) != cache_key_digest({"user_profile": PROFILE, "return_query_vector": True})
+
+    @pytest.mark.parametrize("name, value", [
+        ("RETRIEVAL_MODE", "rrf"),
+        ("RETRIEVAL_BOOSTS", '{"knn": 3.0}'),
+    ])
+    def test_server_defaults_change_key(self, monkeypatch, name, value):
+        before = cache_key_digest({"user_profile": PROFILE})
+        monkeypatch.setenv(name, value)
+        assert cache_key_digest({"user_profile": PROFILE}) != before
+
+    def test_config_version_changes_key(self, monkeypatch):
+        before = cache_key_digest({"user_profile": PROFILE})
+        monkeypatch.setattr(retrieval_cache, "RETRIEVAL_CACHE_CONFIG_VERSION", "2")
+        assert cache_key_digest({"user_profile": PROFILE}) != before
+
+class TestRetrievalResultCache:
+    def test_round_trip(self, cache):
+        request = {"user_profile": PROFILE, "top_k": 5}
+        assert cache.get(request) is None
+        cache.set(request, RESULT)
+        assert cache.get(request) == RESULT
+        assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    def test_empty_result_not_stored(self, cache):
+        request = {"user_profile": PROFILE}
+        cache.set(request, {"scores": [], "doc_ids": [], "documents": []})
+        assert cache.get(request) is None
+
+    def test_bump_generation_invalidates(self, cache):
+        request = {"user_profile": PROFILE}
+        cache.set(request, RESULT)
+        cache.bump_index_generation()
+        assert cache.get(request) is None
+
+    def test_redis_error_is_a_miss(self):
+        class BrokenRedis(fakeredis.FakeRedis):
+            def get(self, *args, **kwargs):
+                raise ConnectionError("down")
+
+        assert RetrievalResultCache(BrokenRedis()).get({"user_profile": PROFILE}) is None
@@ -0,0 +1,85 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from DB.web_search_cache import WebSearchCache, query_digest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+@pytest.fixture
+def cache():
+    return WebSearchCache(fakeredis.FakeRedis(), ttls={"tavily": 60, "perplexity": 600}, stale_ttl=600)
+
+def _age(cache, source, query, seconds):
+    """저장된 항목의 저장 시각을 seconds만큼 과거로 옮김"""
+    key = cache._key(source, query)
+    entry = cache._load(key)
+    entry["stored_at"] -= seconds
+    cache.redis_client.set(key, json.dumps(entry))
+
+def test_query_digest_is_normalized():
+    assert query_digest("  카카오  면접 후기") == query_digest("카카오 면접 후기 ")
+    assert query_digest("Kakao") == query_digest("kakao")
+
+class TestWebSearchCache:
+    def test_miss_then_hit(self, cache):
+        calls = []
+        fetch = lambda: calls.append(1) or ["결과"]
+
+        assert cache.get_or_fetch("tavily", "카카오 기업 문화", fetch) == ["결과"]
+        assert cache.get_or_fetch("tavily", "카카오  기업 문화", fetch) == ["결과"]
+        assert len(calls) == 1
+        assert cache.stats()["tavily"]["hits"] == 1 and cache.stats()["tavily"]["misses"] == 1
+
+    def test_sources_are_separate(self, cache):
+        cache.get_or_fetch("tavily", "카카오", lambda: ["검색 결과"])
+        assert cache.get_or_fetch("perplexity", "카카오", lambda: "요약 답변") == "요약 답변"
+
+    def test_empty_result_not_cached(self, cache):
+        cache.get_or_fetch("tavily", "없는 회사", lambda: [])
+        assert cache.get_or_fetch("tavily", "없는 회사", lambda: ["새 결과"]) == ["새 결과"]
+
+    def test_stale_entry_served_and_refreshed_once(self, cache):
+        cache.get_or_fetch("tavily", "카카오", lambda: ["이전 결과"])
+        _age(cache, "tavily", "카카오", 120)  # TTL(60초) 초과, stale 기간 이내
+
+        refreshes = []
+        fetch = lambda: refreshes.append(1) or ["새 결과"]
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # 갱신이 끝나기 전의 두 번째 요청은 잠금 때문에 갱신을 다시 예약하지 않음
+            cache.redis_client.set(cache._key("tavily", "카카오") + ":refresh", "1")
+            assert cache.get_or_fetch("tavily", "카카오", fetch, executor=executor) == ["이전 결과"]
+            cache.redis_client.delete(cache._key("tavily", "카카오") + ":refresh")
+            assert cache.get_or_fetch("tavily", "카카오", fetch, executor=executor) == ["이전 결과"]
+
+        assert refreshes == [1]
+        assert cache.get_or_fetch("tavily", "카카오", fetch) == ["새 결과"]
+        stats = cache.stats()["tavily"]
+        assert stats["stale_hits"] == 2 and stats["refreshes"] == 1
+
+    def test_failed_refresh_keeps_stale_entry(self, cache):
+        cache.get_or_fetch("perplexity", "카카오", lambda: "이전 답변")
+        _age(cache, "perplexity", "카카오", 900)
+
+        def fail():
+            raise RuntimeError("rate limited")
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            assert cache.get_or_fetch("perplexity", "카카오", fail, executor=executor) == "이전 답변"
+
+        assert cache.stats()["perplexity"]["errors"] == 1
+        assert cache._load(cache._key("perplexity", "카카오"))["value"] == "이전 답변"
+
+    def test_redis_error_falls_back_to_fetch(self):
+        class BrokenRedis(fakeredis.FakeRedis):
+            def get(self, *args, **kwargs):
+                raise ConnectionError("down")
+
+        cache = WebSearchCache(BrokenRedis())
+        assert cache.get_or_fetch("tavily", "카카오", lambda: ["결과"]) == ["결과"]
+
+    def test_redis_ttl_covers_stale_period(self, cache):
+        cache.get_or_fetch("tavily", "카카오", lambda: ["결과"])
+        ttl = cache.redis_client.ttl(cache._key("tavily", "카카오"))
+        assert 60 < ttl <= 60 + 600
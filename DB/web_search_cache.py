@@ -0,0 +1,172 @@
+"""
+웹 검색(Tavily / Perplexity) 결과 Redis 캐시
+
+많은 사용자가 같은 인기 기업을 거의 같은 쿼리로 분석하므로, 정규화한 쿼리의 해시를 키로
+외부 검색 결과를 공유합니다. (기업 문화/면접 정보가 수 초 대신 수 ms 안에 반환)
+
+- 출처(source)별 TTL: 검색 결과(tavily)보다 요약 답변(perplexity)을 더 오래 보관
+- stale-while-revalidate: TTL이 지난 항목도 WEB_SEARCH_CACHE_STALE_TTL 동안은 즉시 반환하고,
+  백그라운드에서 한 번만(SET NX 잠금) 새로 검색해 갱신
+- 출처별 hit / stale hit / miss / 갱신 횟수를 stats()로 제공
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, Optional
+
+from dotenv import load_dotenv
+
+from DB.logger import setup_logger
+from DB.redis_connect import get_redis_session_manager
+from DB.retrieval_cache import _normalize_text
+
+load_dotenv()
+logger = setup_logger(__name__)
+
+# 출처별 신선(fresh) 기간(초)
+WEB_SEARCH_CACHE_TTLS = {
+    "tavily": int(os.getenv("WEB_SEARCH_CACHE_TTL_TAVILY", "21600")),
+    "perplexity": int(os.getenv("WEB_SEARCH_CACHE_TTL_PERPLEXITY", "86400")),
+}
+WEB_SEARCH_CACHE_DEFAULT_TTL = int(os.getenv("WEB_SEARCH_CACHE_TTL", "21600"))
+# 신선 기간이 지난 뒤에도 오래된 결과를 반환하며 갱신을 기다리는 기간(초)
+WEB_SEARCH_CACHE_STALE_TTL = int(os.getenv("WEB_SEARCH_CACHE_STALE_TTL", "86400"))
+# 백그라운드 갱신 잠금 유지 시간(초): 여러 워커가 같은 항목을 동시에 갱신하지 않도록 함
+WEB_SEARCH_CACHE_REFRESH_LOCK_TTL = int(os.getenv("WEB_SEARCH_CACHE_REFRESH_LOCK_TTL", "60"))
+
+KEY_PREFIX = "websearch:v1"
+
+
+def query_digest(query: Any) -> str:
+    """정규화된 쿼리(NFC, 공백 정리, 대소문자 무시)의 SHA-256 해시"""
+    return hashlib.sha256(_normalize_text(query).encode("utf-8")).hexdigest()
+
+
+class WebSearchCache:
+    """Redis 기반 웹 검색 결과 캐시 (stale-while-revalidate)"""
+
+    def __init__(self, redis_client, ttls: Optional[Dict[str, int]] = None,
+                 stale_ttl: int = WEB_SEARCH_CACHE_STALE_TTL):
+        self.redis_client = redis_client
+        self.ttls = dict(WEB_SEARCH_CACHE_TTLS if ttls is None else ttls)
+        self.stale_ttl = stale_ttl
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _key(self, source: str, query: Any) -> str:
+        return f"{KEY_PREFIX}:{source}:{query_digest(query)}"
+
+    def _ttl(self, source: str) -> int:
+        return self.ttls.get(source, WEB_SEARCH_CACHE_DEFAULT_TTL)
+
+    def _count(self, source: str, metric: str) -> None:
+        with self._lock:
+            counters = self._stats.setdefault(source, {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "errors": 0})
+            counters[metric] += 1
+
+    def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            value = self.redis_client.get(key)
+        except Exception as e:
+            logger.warning(f"웹 검색 캐시 조회 실패: {e}")
+            return None
+        return json.loads(value) if value is not None else None
+
+    def _store(self, source: str, key: str, value: Any) -> None:
+        entry = {"value": value, "stored_at": time.time()}
+        try:
+            # 신선 기간 + stale 기간이 지나면 Redis에서 만료
+            self.redis_client.set(key, json.dumps(entry, ensure_ascii=False), ex=self._ttl(source) + self.stale_ttl)
+        except Exception as e:
+            logger.warning(f"웹 검색 캐시 저장 실패: {e}")
+
+    def _refresh(self, source: str, key: str, fetch: Callable[[], Any], should_cache: Callable[[Any], bool]) -> None:
+        """백그라운드 갱신: 성공한 결과만 저장하고, 실패하면 기존 항목을 그대로 둡니다."""
+        try:
+            value = fetch()
+            if should_cache(value):
+                self._store(source, key, value)
+                self._count(source, "refreshes")
+        except Exception as e:
+            self._count(source, "errors")
+            logger.warning(f"웹 검색 캐시 갱신 실패 ({source}): {e}")
+        finally:
+            try:
+                self.redis_client.delete(f"{key}:refresh")
+            except Exception:
+                pass
+
+    def _schedule_refresh(self, source: str, key: str, fetch: Callable[[], Any],
+                          should_cache: Callable[[Any], bool], executor: Optional[Executor]) -> None:
+        try:
+            acquired = self.redis_client.set(f"{key}:refresh", "1", nx=True, ex=WEB_SEARCH_CACHE_REFRESH_LOCK_TTL)
+        except Exception as e:
+            logger.warning(f"웹 검색 캐시 갱신 잠금 실패: {e}")
+            return
+        if not acquired:
+            return  # 다른 요청이 이미 갱신 중
+        if executor is not None:
+            executor.submit(self._refresh, source, key, fetch, should_cache)
+        else:
+            threading.Thread(target=self._refresh, args=(source, key, fetch, should_cache), daemon=True).start()
+
+    def get_or_fetch(self, source: str, query: Any, fetch: Callable[[], Any],
+                     should_cache: Callable[[Any], bool] = bool, executor: Optional[Executor] = None) -> Any:
+        """
+        캐시된 검색 결과를 반환하고, 없으면 fetch()를 호출해 저장합니다.
+
+        Args:
+            source (str): 검색 출처 ('tavily' | 'perplexity'), 출처별 TTL과 통계에 사용
+            query: 캐시 키로 사용할 쿼리 (정규화 후 해시)
+            fetch (Callable): 실제 검색 함수 (JSON 직렬화 가능한 값을 반환)
+            should_cache (Callable): 결과를 저장할지 판단 (기본값: 비어 있지 않은 결과만)
+            executor (Executor): stale 항목 갱신을 실행할 풀 (없으면 데몬 스레드)
+        """
+        key = self._key(source, query)
+        entry = self._load(key)
+        if entry is not None:
+            age = time.time() - entry.get("stored_at", 0)
+            if age <= self._ttl(source):
+                self._count(source, "hits")
+                return entry["value"]
+            # 오래된 결과는 즉시 반환하고 백그라운드에서 갱신
+            self._count(source, "stale_hits")
+            self._schedule_refresh(source, key, fetch, should_cache, executor)
+            return entry["value"]
+
+        self._count(source, "misses")
+        value = fetch()
+        if should_cache(value):
+            self._store(source, key, value)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        """출처별 캐시 통계 (hit_rate는 stale hit 포함)"""
+        with self._lock:
+            stats = {}
+            for source, counters in self._stats.items():
+                served = counters["hits"] + counters["stale_hits"]
+                total = served + counters["misses"]
+                stats[source] = {**counters, "hit_rate": served / total if total else 0.0}
+            return stats
+
+
+_web_search_cache = None
+_web_search_cache_failed = False
+
+def get_web_search_cache() -> Optional[WebSearchCache]:
+    """
+    공유 Redis 연결을 사용하는 웹 검색 캐시를 반환합니다.
+    Redis에 연결할 수 없으면 None을 반환하고, 이후에는 재시도하지 않습니다. (검색은 캐시 없이 진행)
+    """
+    global _web_search_cache, _web_search_cache_failed
+    if _web_search_cache is None and not _web_search_cache_failed:
+        try:
+            _web_search_cache = WebSearchCache(get_redis_session_manager().redis_client)
+        except Exception as e:
+            _web_search_cache_failed = True
+            logger.warning(f"웹 검색 캐시를 사용할 수 없습니다 (Redis 연결 실패): {e}")
+    return _web_search_cache
@@ -0,0 +1,85 @@
+"""
+채용 공고 필드 정규화 (마이그레이션 시점)
+
+자유 텍스트인 career("경력 3-7년", "신입·경력", "경력 5년 이상" 등)와 location("서울 강남구")을
+정수 범위 / boolean / keyword 필드로 변환해, 리트리버가 점수를 매기는 텍스트 match 대신
+캐시 가능한 term / range 필터(kNN 사전 필터 포함)로 걸러낼 수 있게 합니다.
+
+    career_min_years, career_max_years (integer), career_new_grad (boolean)
+    region_sido, region_sigungu (keyword, 예: "서울", "서울 강남구")
+"""
+import os
+import re
+import sys
+from typing import Any, Dict, Optional, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+# 지역 코드 규칙은 리트리버의 쿼리 정규화와 공유
+from Retriever.region_codes import parse_regions
+
+# 상한이 없는 경력 범위("n년 이상", "경력무관")의 career_max_years 값
+CAREER_OPEN_MAX_YEARS = 99
+
+_NUMBER_PATTERN = re.compile(r'\d+')
+
+
+def parse_career_years(career: str) -> Optional[Tuple[int, int]]:
+    """
+    career 텍스트에서 (최소 년차, 최대 년차)를 추출합니다. 해석할 수 없으면 None.
+
+    예: "신입" → (0, 0), "경력무관" → (0, 99), "경력 3-7년" → (3, 7),
+        "경력 5년 이상" → (5, 99), "신입-경력 3년" → (0, 3), "경력 2년 이하" → (0, 2),
+        "경력 1년 이상 (신입 가능)" → (0, 99)
+
+    신입을 받으면 최소 년차만 0으로 낮추고, 최대 년차는 경력 조건에서 해석한 값을 유지합니다.
+    """
+    if not career:
+        return None
+
+    numbers = [int(n) for n in _NUMBER_PATTERN.findall(career)]
+    is_new_grad = '신입' in career
+
+    if '무관' in career:
+        return 0, CAREER_OPEN_MAX_YEARS
+    if not numbers:
+        if is_new_grad:
+            # "신입·경력"처럼 경력도 함께 받으면 상한 없음
+            return (0, CAREER_OPEN_MAX_YEARS) if '경력' in career else (0, 0)
+        return None
+    if len(numbers) >= 2:
+        low, high = sorted(numbers[:2])
+        return (0 if is_new_grad else low), high
+
+    years = numbers[0]
+    if '이하' in career or '미만' in career:
+        return 0, years
+    if is_new_grad:
+        # "신입-경력 3년"은 3년까지, "경력 1년 이상 (신입 가능)"은 상한 없음
+        return 0, (CAREER_OPEN_MAX_YEARS if '이상' in career else years)
+    return years, CAREER_OPEN_MAX_YEARS
+
+
+def normalize_career(career: Any) -> Dict[str, Any]:
+    """career_min_years / career_max_years / career_new_grad 필드 (해석할 수 없으면 빈 dict → 필드 미색인)"""
+    years = parse_career_years(career if isinstance(career, str) else '')
+    if years is None:
+        return {}
+    return {'career_min_years': years[0], 'career_max_years': years[1], 'career_new_grad': years[0] == 0}
+
+
+def normalize_location(location: Any) -> Dict[str, list]:
+    """region_sido / region_sigungu 필드 (시/군/구가 있으면 상위 시/도도 함께 색인)"""
+    regions = parse_regions(location if isinstance(location, str) else '')
+    if not regions:
+        return {}
+    normalized = {'region_sido': sorted({sido for sido, _ in regions})}
+    sigungu = sorted({sigungu for _, sigungu in regions if sigungu})
+    if sigungu:
+        normalized['region_sigungu'] = sigungu
+    return normalized
+
+
+def normalize_job_fields(document: Dict[str, Any]) -> Dict[str, Any]:
+    """공고 문서에 추가할 정규화 필드"""
+    return {**normalize_career(document.get('career')), **normalize_location(document.get('location'))}
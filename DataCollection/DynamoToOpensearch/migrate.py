@@ -18,11 +18,17 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
 
 from DB.dynamodb import DynamoDB
 from DB.opensearch import OpenSearchDB
+from DB.retrieval_cache import bump_index_generation
 
 from DB.logger import setup_logger
 from langchain_huggingface import HuggingFaceEmbeddings
+from Retriever.inference_backend import (
+    EMBEDDING_MODEL_NAME, RERANKER_MODEL_NAME, get_inference_backend, sentence_transformer_kwargs
+)
+from Retriever.rerank_text import RERANK_TEXT_FIELD, build_rerank_text, load_reranker_tokenizer
 
 from data_preprocessing import JobDataPreprocessor
+from job_normalizer import normalize_job_fields
 
 # 로거 설정
 logger = setup_logger(__name__)
@@ -48,8 +54,11 @@ class DynamoToOpenSearchMigrator:
         # 임베딩 모델 초기화
         self.embedding_model = self._initialize_embedding_model()
         
+        # 리랭커 토크나이저 (rerank_text를 리랭커 최대 토큰 길이로 자르기 위해 사용)
+        self.rerank_tokenizer = load_reranker_tokenizer(RERANKER_MODEL_NAME)
+        
         logger.info(f"Migrator initialized with batch size: {batch_size}")
-        logger.info(f"Embedding model: intfloat/multilingual-e5-large")
+        logger.info(f"Embedding model: {EMBEDDING_MODEL_NAME} (backend: {get_inference_backend()})")
         logger.info(f"Device: {'cuda' if torch.cuda.is_available() else 'cpu'}")
     
     def _initialize_embedding_model(self) -> HuggingFaceEmbeddings:
@@ -60,10 +69,12 @@ class DynamoToOpenSearchMigrator:
             초기화된 임베딩 모델
         """
         logger.info("Initializing embedding model...")
+        # INFERENCE_BACKEND=onnx 이면 온라인 쿼리 인코더와 같은 INT8 ONNX 모델 사용
+        model_kwargs = sentence_transformer_kwargs(device='cuda' if torch.cuda.is_available() else 'cpu')
         try:
             model = HuggingFaceEmbeddings(
-                model_name="intfloat/multilingual-e5-large",
-                model_kwargs={'device': 'cuda' if torch.cuda.is_available() else 'cpu'},
+                model_name=EMBEDDING_MODEL_NAME,
+                model_kwargs=model_kwargs,
                 encode_kwargs={'normalize_embeddings': True}
             )
             logger.info("✅ Embedding model initialized successfully")
@@ -72,8 +83,8 @@ class DynamoToOpenSearchMigrator:
             logger.error(f"❌ Error initializing embedding model: {e}")
             logger.info("Retrying model initialization...")
             return HuggingFaceEmbeddings(
-                model_name="intfloat/multilingual-e5-large",
-                model_kwargs={'device': 'cuda' if torch.cuda.is_available() else 'cpu'},
+                model_name=EMBEDDING_MODEL_NAME,
+                model_kwargs=model_kwargs,
                 encode_kwargs={'normalize_embeddings': True}
             )
     
@@ -148,6 +159,12 @@ class DynamoToOpenSearchMigrator:
                 if field in dynamo_item and dynamo_item[field]:
                     transformed[field] = dynamo_item[field]
             
+            # 경력 범위/신입 여부/지역 코드 정규화 (term/range 필터용 필드)
+            transformed.update(normalize_job_fields(transformed))
+            
+            # 리랭킹 텍스트 (검색 시 요청마다 문자열을 만들지 않도록 미리 계산)
+            transformed[RERANK_TEXT_FIELD] = build_rerank_text(transformed, self.rerank_tokenizer)
+            
             # 날짜 필드 처리
             if 'crawled_at' in dynamo_item and dynamo_item['crawled_at']:
                 transformed['created_at'] = dynamo_item['crawled_at']
@@ -293,6 +310,12 @@ class DynamoToOpenSearchMigrator:
             logger.error(f"Error creating OpenSearch index: {str(e)}")
             raise
         
+        # hybrid 검색 파이프라인 생성 (지원하지 않는 클러스터에서도 마이그레이션은 계속, RETRIEVAL_MODE=bool/rrf 사용)
+        try:
+            self.opensearch.create_hybrid_search_pipeline()
+        except Exception as e:
+            logger.warning(f"Hybrid search pipeline not created: {str(e)}")
+        
         # DynamoDB에서 데이터 스캔
         batch = []
         start_time = time.time()
@@ -334,6 +357,13 @@ class DynamoToOpenSearchMigrator:
         }
         
         logger.info(f"Migration completed. Stats: {stats}")
+        
+        # 인덱스 내용이 바뀌었으므로 검색 결과 캐시 무효화
+        generation = bump_index_generation()
+        if generation is not None:
+            stats['index_generation'] = generation
+        else:
+            logger.warning("Retrieval cache generation was not bumped (Redis unavailable)")
         return stats
     
     def verify_migration_with_search(self, sample_size: int = 5) -> bool:
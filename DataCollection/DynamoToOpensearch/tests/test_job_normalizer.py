@@ -0,0 +1,41 @@
+import pytest
+
+from DataCollection.DynamoToOpensearch.job_normalizer import normalize_career, normalize_location, parse_career_years
+
+@pytest.mark.parametrize("career, expected", [
+    ("신입", (0, 0)),
+    ("신입·경력", (0, 99)),
+    ("경력무관", (0, 99)),
+    ("경력 3-7년", (3, 7)),
+    ("경력 7~3년", (3, 7)),
+    ("경력 5년 이상", (5, 99)),
+    ("경력 5년", (5, 99)),
+    ("경력 2년 이하", (0, 2)),
+    ("경력 3년 미만", (0, 3)),
+    ("신입-경력 3년", (0, 3)),
+    ("신입/경력 2-5년", (0, 5)),
+    ("경력 1년 이상 (신입 가능)", (0, 99)),
+    ("신입 가능, 경력 3년 이상", (0, 99)),
+    ("", None),
+    ("협의", None),
+])
+def test_parse_career_years(career, expected):
+    assert parse_career_years(career) == expected
+
+@pytest.mark.parametrize("career, expected", [
+    ("경력 1년 이상 (신입 가능)", {"career_min_years": 0, "career_max_years": 99, "career_new_grad": True}),
+    ("경력 3-7년", {"career_min_years": 3, "career_max_years": 7, "career_new_grad": False}),
+    (None, {}),
+])
+def test_normalize_career(career, expected):
+    assert normalize_career(career) == expected
+
+@pytest.mark.parametrize("location, expected", [
+    ("서울 강남구", {"region_sido": ["서울"], "region_sigungu": ["서울 강남구"]}),
+    ("판교", {"region_sido": ["경기"], "region_sigungu": ["경기 성남시"]}),
+    ("원격근무", {"region_sido": ["원격"]}),
+    ("재택", {"region_sido": ["원격"]}),
+    ("협의", {}),
+])
+def test_normalize_location(location, expected):
+    assert normalize_location(location) == expected
@@ -0,0 +1,42 @@
+"""
+Lambda 컨테이너 이미지 빌드 시 모델 가중치를 이미지에 포함시키는 스크립트
+
+런타임에 HuggingFace에서 모델을 내려받지 않도록, 빌드 단계에서 모델을 로컬 디렉토리에 저장합니다.
+    python bake_models.py --output-dir /opt/models          # PyTorch 가중치
+    python bake_models.py --output-dir /opt/models --onnx   # + INT8 ONNX 모델
+"""
+import argparse
+import logging
+import os
+
+from inference_backend import export_quantized_onnx_models, load_embedding_model, load_reranker_model
+
+logger = logging.getLogger(__name__)
+
+
+def bake_models(output_dir: str, onnx: bool = False) -> None:
+    """임베딩/리랭커 모델을 output_dir/embedding, output_dir/reranker 에 저장합니다."""
+    if onnx:
+        # ONNX export 시 원본 가중치도 같은 디렉토리에 저장됨
+        export_quantized_onnx_models(output_dir)
+        return
+
+    embedding_dir = os.path.join(output_dir, 'embedding')
+    reranker_dir = os.path.join(output_dir, 'reranker')
+
+    load_embedding_model(backend='torch').save_pretrained(embedding_dir)
+    logger.info(f"✅ 임베딩 모델 저장 완료: {embedding_dir}")
+
+    load_reranker_model(backend='torch').save_pretrained(reranker_dir)
+    logger.info(f"✅ 리랭커 모델 저장 완료: {reranker_dir}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="모델 가중치를 이미지에 포함시키기 위해 로컬에 저장")
+    parser.add_argument("--output-dir", default="/opt/models")
+    parser.add_argument("--onnx", action="store_true", help="INT8 ONNX 모델도 함께 export")
+    args = parser.parse_args()
+
+    bake_models(args.output_dir, onnx=args.onnx)
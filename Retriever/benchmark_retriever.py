@@ -0,0 +1,489 @@
+"""
+리트리버 벤치마크 (AWS 없이 hybrid_search 핫패스 성능 측정)
+
+Fake/ 생성기로 만든 합성 공고(또는 fixture 덤프)를 인메모리 검색 엔진에 색인하고,
+lambda_function.run_search(build_search_query + 검색 + 리랭킹)와 응답 직렬화를 실행해
+단계별 지연시간(encode / build_query / search / rerank / fetch / serialize), 동시성별 처리량, 메모리 피크를 측정합니다.
+
+모델:
+- hash (기본값): 토큰 해싱 임베더 + 토큰 겹침 리랭커. 모델 다운로드 없이 파이프라인 자체의 오버헤드를 측정합니다.
+- real: INFERENCE_BACKEND 설정을 따르는 실제 임베딩/리랭커 모델
+
+사용 예시:
+    python benchmark_retriever.py --docs 2000 --queries 200 --concurrency 1,4,8
+    python benchmark_retriever.py --fixture jobs.jsonl --model real
+    python benchmark_retriever.py --output baseline.json
+    python benchmark_retriever.py --baseline baseline.json --max-regression 0.2   # 회귀 시 종료 코드 1
+"""
+import argparse
+import functools
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+import zlib
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# 벤치마크는 모델/클라이언트를 직접 주입하므로 임포트 시점 사전 로드를 끔
+os.environ.setdefault('RETRIEVER_PRELOAD', 'false')
+
+RETRIEVER_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(RETRIEVER_DIR)
+sys.path.append(RETRIEVER_DIR)
+sys.path.append(PROJECT_ROOT)
+
+import lambda_function
+from memory_search_engine import InMemorySearchEngine, tokenize
+from response_codec import encode_body, negotiate_format
+from rerank_text import RERANK_TEXT_FIELD, build_rerank_text, format_document_for_reranking
+from DataCollection.DynamoToOpensearch.job_normalizer import normalize_job_fields
+from Fake.user_data_generator import CAREER_YEARS, JOB_CATEGORIES, LOCATIONS, MAJORS, generate_tech_stack, generate_user
+
+logger = logging.getLogger(__name__)
+
+STAGES = ['encode', 'build_query', 'search', 'rerank', 'fetch', 'serialize', 'other', 'total']
+
+# 이보다 짧은 단계는 측정 잡음이 커서 회귀 비교에서 제외
+MIN_COMPARABLE_MS = 1.0
+
+COMPANY_NAMES = ["네이버", "카카오", "라인플러스", "쿠팡", "토스", "당근마켓", "배달의민족", "야놀자", "크래프톤", "넥슨"]
+CAREER_LABELS = ["신입", "경력무관", "신입·경력"] + [f"경력 {years}년 이상" for years in CAREER_YEARS if years > 0]
+BENEFITS = ["유연근무제", "재택근무", "자기계발비 지원", "점심 식대 지원", "건강검진", "스톡옵션"]
+
+# 인메모리 엔진에 등록할 hybrid 검색 파이프라인 (DB/opensearch.py create_hybrid_search_pipeline 기본값과 동일)
+HYBRID_PIPELINE_BODY = {
+    "phase_results_processors": [{
+        "normalization-processor": {
+            "normalization": {"technique": "min_max"},
+            "combination": {"technique": "arithmetic_mean", "parameters": {"weights": [0.4, 0.6]}}
+        }
+    }]
+}
+
+
+# --- 합성 데이터 ---
+
+def build_synthetic_corpus(num_docs: int, seed: int = 42) -> List[Dict]:
+    """Fake 생성기의 직무/기술 스택/지역 정의로 채용공고 문서를 만듭니다."""
+    random.seed(seed)
+    documents = []
+    for i in range(num_docs):
+        job = random.choice(JOB_CATEGORIES)
+        company = random.choice(COMPANY_NAMES)
+        career = random.choice(CAREER_LABELS)
+        stack = generate_tech_stack(job)
+        major = random.choice(MAJORS)
+        documents.append({
+            '_id': f'bench-{i:06d}',
+            'url': f'https://example.com/jobs/{i}',
+            'title': f"{job} ({career})",
+            'company_name': company,
+            'location': random.choice(LOCATIONS),
+            'job_name': job,
+            'job_category': job,
+            'career': career,
+            'position_detail': f"{company}에서 {', '.join(stack)} 기반 서비스를 함께 만들 {job}를 찾습니다.",
+            'main_tasks': [f"{tech} 기반 {job} 업무" for tech in stack[:3]],
+            'qualifications': [f"{major} 또는 관련 전공", f"{stack[0]} 실무 경험"],
+            'preferred_qualifications': [f"{tech} 사용 경험" for tech in stack[3:]],
+            'benefits': random.sample(BENEFITS, 3),
+        })
+    return documents
+
+
+def load_fixture(path: str) -> List[Dict]:
+    """JSON 배열 또는 JSONL 형식의 공고 덤프를 읽습니다."""
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            return [json.loads(line) for line in f if line.strip()]
+        return json.load(f)
+
+
+def user_to_profile(user: Dict) -> Dict:
+    """Fake 사용자 데이터를 리트리버 user_profile 형식으로 변환합니다."""
+    years = user['career']['years']
+    return {
+        'candidate_major': user['education']['major'],
+        'candidate_interest': user['preferences']['desired_job'],
+        'candidate_career': '신입' if years == 0 else f'{years}년',
+        'candidate_tech_stack': user['skills']['tech_stack'],
+        'candidate_location': user['preferences']['desired_location'][0],
+        'candidate_question': user['conversation'],
+    }
+
+
+def build_query_profiles(num_queries: int, seed: int = 7) -> List[Dict]:
+    random.seed(seed)
+    return [user_to_profile(generate_user()) for _ in range(num_queries)]
+
+
+# --- 벤치마크용 경량 모델 ---
+
+class HashingEmbedder:
+    """토큰 해싱 임베더 (SentenceTransformer.encode 호환)"""
+
+    def __init__(self, dim: int = 1024):
+        self.dim = dim
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dim
+
+    def encode(self, texts, batch_size: int = 32, show_progress_bar: bool = False,
+               convert_to_numpy: bool = True, **kwargs) -> np.ndarray:
+        single = isinstance(texts, str)
+        texts = [texts] if single else texts
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in tokenize(text):
+                digest = zlib.crc32(token.encode('utf-8'))
+                vectors[row, digest % self.dim] += 1.0 if digest & 1 else -1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1.0, norms)
+        return vectors[0] if single else vectors
+
+
+class OverlapReranker:
+    """쿼리-문서 토큰 겹침 비율 리랭커 (CrossEncoder.predict 호환)"""
+
+    def predict(self, sentence_pairs, batch_size: int = 32, show_progress_bar: bool = False, **kwargs) -> np.ndarray:
+        scores = []
+        for query, text in sentence_pairs:
+            query_tokens = set(tokenize(query))
+            text_tokens = set(tokenize(text))
+            scores.append(len(query_tokens & text_tokens) / (len(query_tokens) or 1))
+        return np.asarray(scores, dtype=np.float32)
+
+
+def install_models(model: str, dim: int) -> Tuple[object, object]:
+    """lambda_function 전역 모델을 설정하고 (임베딩 모델, 리랭커 모델)을 반환합니다."""
+    if model == 'hash':
+        lambda_function._embedding_model = HashingEmbedder(dim)
+        lambda_function._reranker_model = OverlapReranker()
+    return lambda_function.get_embedding_model(), lambda_function.get_reranker_model()
+
+
+def embed_documents(documents: List[Dict], embedding_model, batch_size: int = 32) -> None:
+    """
+    마이그레이션과 같이 문서를 준비합니다.
+    content_embedding이 없는 문서는 "[document] " 접두어로 임베딩하고, rerank_text가 없는 문서는 생성합니다.
+    """
+    for doc in documents:
+        if not doc.get(RERANK_TEXT_FIELD):
+            doc[RERANK_TEXT_FIELD] = build_rerank_text(doc)
+
+    missing = [doc for doc in documents if doc.get('content_embedding') is None]
+    for start in range(0, len(missing), batch_size):
+        batch = missing[start:start + batch_size]
+        texts = [f"[document] {format_document_for_reranking(doc)}" for doc in batch]
+        vectors = embedding_model.encode(texts, batch_size=len(texts), show_progress_bar=False, convert_to_numpy=True)
+        for doc, vector in zip(batch, vectors):
+            doc['content_embedding'] = np.asarray(vector, dtype=np.float32).tolist()
+
+
+# --- 단계별 계측 ---
+
+class StageTimer:
+    """요청(스레드)별로 단계 소요 시간을 누적합니다."""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def start_request(self) -> None:
+        self._local.stages = defaultdict(float)
+
+    def add(self, stage: str, seconds: float) -> None:
+        stages = getattr(self._local, 'stages', None)
+        if stages is not None:
+            stages[stage] += seconds
+
+    def finish_request(self) -> Dict[str, float]:
+        stages = dict(getattr(self._local, 'stages', {}))
+        self._local.stages = None
+        return stages
+
+    def wrap(self, stage: str, func: Callable) -> Callable:
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.add(stage, time.perf_counter() - start)
+        return timed
+
+
+def instrument(timer: StageTimer, client) -> None:
+    """검색 경로의 각 단계를 계측 함수로 감쌉니다."""
+    embedder = lambda_function.get_query_embedder()
+    embedder.encode = timer.wrap('encode', embedder.encode)
+    rerank_service = lambda_function.get_rerank_service()
+    rerank_service.rerank = timer.wrap('rerank', rerank_service.rerank)
+    for builder in ('build_search_query', 'build_hybrid_query', 'build_rrf_queries'):
+        setattr(lambda_function, builder, timer.wrap('build_query', getattr(lambda_function, builder)))
+    client.search = timer.wrap('search', client.search)
+    client.msearch = timer.wrap('search', client.msearch)
+    client.mget = timer.wrap('fetch', client.mget)
+
+
+def clear_caches() -> None:
+    lambda_function.get_query_embedder().clear_cache()
+    lambda_function.get_rerank_service().clear_cache()
+
+
+def summarize(values_ms: List[float]) -> Dict[str, float]:
+    if not values_ms:
+        return {}
+    values = np.asarray(values_ms)
+    return {
+        'mean_ms': round(float(values.mean()), 3),
+        'p50_ms': round(float(np.percentile(values, 50)), 3),
+        'p95_ms': round(float(np.percentile(values, 95)), 3),
+        'p99_ms': round(float(np.percentile(values, 99)), 3),
+        'max_ms': round(float(values.max()), 3),
+    }
+
+
+# --- 실행 ---
+
+class RetrieverBenchmark:
+    def __init__(self, timer: StageTimer, top_k: int = 5, response_format: str = 'json',
+                 compression: Optional[str] = None, warm_cache: bool = False):
+        self.timer = timer
+        self.top_k = top_k
+        self.response_format = response_format
+        self.compression = compression
+        self.warm_cache = warm_cache
+
+    def run_request(self, profile: Dict) -> Tuple[Dict[str, float], int]:
+        """요청 하나를 실행하고 (단계별 ms, 결과 수)를 반환합니다."""
+        self.timer.start_request()
+        start = time.perf_counter()
+        data = lambda_function.run_search({'user_profile': profile, 'top_k': self.top_k})
+
+        serialize_start = time.perf_counter()
+        encode_body(data, self.response_format, self.compression)
+        self.timer.add('serialize', time.perf_counter() - serialize_start)
+
+        total = time.perf_counter() - start
+        stages = self.timer.finish_request()
+        stages['other'] = max(0.0, total - sum(stages.values()))
+        stages['total'] = total
+        return {stage: seconds * 1000 for stage, seconds in stages.items()}, len(data.get('doc_ids', []))
+
+    def run_level(self, profiles: List[Dict], concurrency: int) -> Dict:
+        """동시성 수준 하나에서 전체 쿼리를 실행합니다."""
+        if not self.warm_cache:
+            clear_caches()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(self.run_request, profiles))
+        elapsed = time.perf_counter() - start
+
+        per_stage = defaultdict(list)
+        for stages, _ in results:
+            for stage in STAGES:
+                per_stage[stage].append(stages.get(stage, 0.0))
+
+        return {
+            'concurrency': concurrency,
+            'requests': len(results),
+            'empty_results': sum(1 for _, count in results if count == 0),
+            'elapsed_s': round(elapsed, 3),
+            'throughput_qps': round(len(results) / elapsed, 2) if elapsed else 0.0,
+            'stages': {stage: summarize(per_stage[stage]) for stage in STAGES},
+        }
+
+    def measure_memory(self, profiles: List[Dict]) -> Dict[str, float]:
+        """순차 실행 중 Python 힙 피크와 프로세스 RSS 피크를 측정합니다. (처리량 측정과 분리)"""
+        if not self.warm_cache:
+            clear_caches()
+        tracemalloc.start()
+        for profile in profiles:
+            self.run_request(profile)
+        _, heap_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        memory = {'python_heap_peak_mb': round(heap_peak / 1024 / 1024, 2)}
+        if resource is not None:
+            # Linux ru_maxrss 단위는 KB
+            memory['peak_rss_mb'] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 2)
+        return memory
+
+
+def compare_with_baseline(result: Dict, baseline: Dict, max_regression: float) -> List[str]:
+    """기준 결과 대비 p95 지연시간/처리량 회귀 목록을 반환합니다."""
+    regressions = []
+    baseline_levels = {level['concurrency']: level for level in baseline.get('levels', [])}
+    for level in result['levels']:
+        base = baseline_levels.get(level['concurrency'])
+        if not base:
+            continue
+        for stage, summary in level['stages'].items():
+            base_p95 = base['stages'].get(stage, {}).get('p95_ms')
+            if not base_p95 or base_p95 < MIN_COMPARABLE_MS or not summary:
+                continue
+            if summary['p95_ms'] > base_p95 * (1 + max_regression):
+                regressions.append(
+                    f"c={level['concurrency']} {stage} p95 {base_p95:.2f}ms → {summary['p95_ms']:.2f}ms"
+                )
+        base_qps = base.get('throughput_qps')
+        if base_qps and level['throughput_qps'] < base_qps * (1 - max_regression):
+            regressions.append(f"c={level['concurrency']} throughput {base_qps:.1f} → {level['throughput_qps']:.1f} qps")
+    return regressions
+
+
+def print_report(result: Dict) -> None:
+    config = result['config']
+    print(f"\n=== 리트리버 벤치마크 (docs={config['docs']}, queries={config['queries']}, model={config['model']}, "
+          f"engine={config['engine']}, format={config['response_format']}) ===")
+    for level in result['levels']:
+        print(f"\n▷ 동시성 {level['concurrency']}: {level['throughput_qps']} qps "
+              f"({level['requests']}건 / {level['elapsed_s']}s, 빈 결과 {level['empty_results']}건)")
+        print(f"  {'stage':<12}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}  (ms)")
+        for stage in STAGES:
+            summary = level['stages'].get(stage)
+            if summary:
+                print(f"  {stage:<12}{summary['mean_ms']:>10.2f}{summary['p50_ms']:>10.2f}{summary['p95_ms']:>10.2f}"
+                      f"{summary['p99_ms']:>10.2f}{summary['max_ms']:>10.2f}")
+    memory = result.get('memory', {})
+    if memory:
+        print(f"\n메모리: {', '.join(f'{k}={v}' for k, v in memory.items())}")
+
+
+def run_benchmark(args) -> Dict:
+    embedding_model, _ = install_models(args.model, args.dim)
+    lambda_function.RETRIEVAL_TWO_PHASE = not args.single_phase
+    lambda_function.RETRIEVAL_MODE = args.retrieval_mode
+
+    if args.engine == 'memory':
+        documents = load_fixture(args.fixture) if args.fixture else build_synthetic_corpus(args.docs, args.seed)
+        # 마이그레이션과 같은 정규화 필드(경력 범위/지역 코드) 추가
+        for document in documents:
+            document.update(normalize_job_fields(document))
+        embed_start = time.perf_counter()
+        embed_documents(documents, embedding_model)
+        engine = InMemorySearchEngine()
+        engine.add_documents(documents)
+        logger.info(f"✅ {len(engine)}개 문서 색인 완료 ({time.perf_counter() - embed_start:.2f}s)")
+        engine.put_search_pipeline(lambda_function.HYBRID_SEARCH_PIPELINE, HYBRID_PIPELINE_BODY)
+        lambda_function._opensearch_client = engine
+        num_docs = len(engine)
+    else:
+        # 이미 색인된 로컬 OpenSearch 사용 (OPENSEARCH_HOST / OPENSEARCH_AUTH=none 등)
+        engine = lambda_function.get_opensearch_client()
+        num_docs = None
+
+    timer = StageTimer()
+    instrument(timer, engine)
+
+    response_format = negotiate_format([args.response_format])
+    benchmark = RetrieverBenchmark(
+        timer,
+        top_k=args.top_k,
+        response_format=response_format,
+        compression=args.compression if args.compression != 'none' else None,
+        warm_cache=args.warm_cache
+    )
+    profiles = build_query_profiles(args.queries, args.seed + 1)
+
+    # 워밍업 (스레드 풀/할당자/모델 초기화 비용을 측정에서 제외)
+    for profile in profiles[:args.warmup]:
+        benchmark.run_request(profile)
+
+    levels = [benchmark.run_level(profiles, concurrency) for concurrency in args.concurrency]
+    memory = benchmark.measure_memory(profiles[:args.memory_queries])
+
+    return {
+        'config': {
+            'docs': num_docs,
+            'queries': len(profiles),
+            'top_k': args.top_k,
+            'model': args.model,
+            'engine': args.engine,
+            'response_format': response_format,
+            'compression': args.compression,
+            'warm_cache': args.warm_cache,
+            'two_phase': not args.single_phase,
+            'retrieval_mode': args.retrieval_mode,
+        },
+        'levels': levels,
+        'memory': memory,
+        'stats': {
+            'query_embedder': lambda_function.get_query_embedder().stats(),
+            'rerank': lambda_function.get_rerank_service().stats(),
+        },
+    }
+
+
+def _parse_concurrency(value: str) -> List[int]:
+    return [int(level) for level in value.split(',') if level.strip()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="리트리버 핫패스 벤치마크 (인메모리 엔진)")
+    parser.add_argument("--docs", type=int, default=2000, help="합성 공고 수")
+    parser.add_argument("--fixture", help="공고 덤프 파일 (JSON 배열 또는 JSONL, 지정 시 합성 공고 대신 사용)")
+    parser.add_argument("--queries", type=int, default=200, help="동시성 수준별 실행할 쿼리 수")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--concurrency", type=_parse_concurrency, default=[1, 4, 8], help="예: 1,4,8")
+    parser.add_argument("--model", choices=['hash', 'real'], default='hash')
+    parser.add_argument("--dim", type=int, default=1024, help="hash 임베더 차원")
+    parser.add_argument("--engine", choices=['memory', 'opensearch'], default='memory')
+    parser.add_argument("--response-format", default='json', help="json | orjson | msgpack")
+    parser.add_argument("--compression", default='none', help="none | zstd")
+    parser.add_argument("--single-phase", action="store_true", help="2단계 조회(후보 ID/리랭킹 필드 → top_k mget) 대신 후보 전체 문서 조회")
+    parser.add_argument("--retrieval-mode", choices=['bool', 'hybrid', 'rrf'], default=lambda_function.RETRIEVAL_MODE,
+                        help="bool(점수 합산) | hybrid(정규화 파이프라인) | rrf(msearch + RRF)")
+    parser.add_argument("--warm-cache", action="store_true", help="동시성 수준 사이에 임베딩/리랭킹 캐시를 비우지 않음")
+    parser.add_argument("--warmup", type=int, default=5, help="측정 전 워밍업 요청 수")
+    parser.add_argument("--memory-queries", type=int, default=20, help="메모리 피크 측정에 사용할 쿼리 수")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="허용 회귀 비율 (기본 20%%)")
+    parser.add_argument("--verbose", action="store_true", help="검색 경로 INFO 로그 출력")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    if not args.verbose:
+        # lambda_function은 요청마다 INFO 로그를 남기므로 측정 중에는 루트 로거를 올려둠
+        logging.getLogger().setLevel(logging.WARNING)
+        logger.setLevel(logging.INFO)
+
+    result = run_benchmark(args)
+    print_report(result)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ 결과 저장: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(result, baseline, args.max_regression)
+        if regressions:
+            print(f"\n❌ 성능 회귀 감지 (허용치 {args.max_regression:.0%}):")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return 1
+        print(f"\n✅ 기준 대비 회귀 없음 (허용치 {args.max_regression:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,119 +1,505 @@
-# evaluation_script.py
+"""
+리트리버 검색 품질 평가
+
+평가 데이터셋(JSON 배열)의 각 항목은 다음 형식입니다.
+    {"query": {user_profile...}, "gold_doc_id": "..."}        # 또는 "gold_doc_ids": [...]
+
+- 쿼리는 스레드 풀에서 최대 --workers개씩 동시에 검색합니다. (리트리버 호출은 I/O 대기가 대부분)
+- 검색 결과는 (쿼리, 설정 해시) 단위로 디스크에 캐시되어, 설정이 바뀐 경우에만 다시 검색합니다.
+- Hit Rate / Recall@k / nDCG@k / MRR을 전체 및 직무별로 한 번에 (numpy 벡터 연산으로) 계산합니다.
+
+스윕 모드(--sweep)는 쿼리별 후보 풀(절별 점수 + 리랭커 점수)을 한 번만 조회해 재사용하고,
+절 가중치 × 리랭킹 후보 수 × 리랭커 사용 여부 조합을 오프라인으로 다시 채점해 MRR-지연시간 Pareto front를 보고합니다.
+
+사용 예시:
+    python eval_retriever.py --data retriever_sample_data.json --top-k 5 --workers 16
+    python eval_retriever.py --label boost-v2          # 설정 라벨을 바꾸면 새로 검색
+    python eval_retriever.py --sweep --pool-sizes 5,10,15,25 --grid knn=1,2,3
+"""
+import argparse
+import functools
+import hashlib
+import itertools
 import json
 import os
-from collections import defaultdict
-from typing import Dict, List, Tuple
-from hybrid_retriever import hybrid_search # 위에서 제공된 리트리버 코드를 모듈로 가정
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# 평가는 자체 디스크 캐시를 사용하므로 Redis 결과 캐시는 끔 (지연시간 측정 왜곡 방지)
+os.environ.setdefault('RETRIEVAL_CACHE', 'none')
+
+from hybrid_retriever import (
+    LAMBDA_FUNCTION_NAME, RETRIEVER_BACKEND, RETRIEVER_HTTP_URL, fetch_candidate_pool, hybrid_search
+)
+
+EVAL_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(EVAL_DIR, '.eval_cache')
+
+
+def _stable_hash(value) -> str:
+    payload = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def retrieval_config(top_k: int, label: str = '') -> Dict:
+    """검색 결과에 영향을 주는 설정 (바뀌면 캐시 키가 달라짐)"""
+    target = {'lambda': LAMBDA_FUNCTION_NAME, 'http': RETRIEVER_HTTP_URL}.get(RETRIEVER_BACKEND, '')
+    return {
+        'backend': RETRIEVER_BACKEND,
+        'target': target,
+        'index': os.environ.get('OPENSEARCH_INDEX', ''),
+        'top_k': top_k,
+        'label': label,
+    }
 
-def evaluate_retriever_and_save_results(data_path: str, top_k: int = 5):
+
+class EvalResultCache:
+    """설정 해시별 JSONL 파일에 쿼리 검색 결과를 저장하는 디스크 캐시"""
+
+    def __init__(self, cache_dir: str, config: Dict):
+        self.config_hash = _stable_hash(config)
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, f'{self.config_hash}.jsonl')
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        self._entries[entry['query_hash']] = entry
+                    except (json.JSONDecodeError, KeyError):
+                        continue  # 중단된 쓰기로 잘린 줄은 무시
+
+    def get(self, query_hash: str) -> Optional[Dict]:
+        return self._entries.get(query_hash)
+
+    def set(self, query_hash: str, entry: Dict) -> None:
+        entry = {'query_hash': query_hash, **entry}
+        with self._lock:
+            self._entries[query_hash] = entry
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+
+def _retrieve(query: Dict, top_k: int) -> Dict:
+    start = time.perf_counter()
+    scores, doc_ids, _ = hybrid_search(user_profile=query, top_k=top_k)
+    return {
+        'doc_ids': doc_ids,
+        'scores': scores,
+        'latency_ms': round((time.perf_counter() - start) * 1000, 2),
+    }
+
+
+def _retrieve_pool(query: Dict, pool_size: int) -> Dict:
+    start = time.perf_counter()
+    pool = fetch_candidate_pool(query, pool_size)
+    if not pool:
+        raise RuntimeError("후보 풀 조회 실패")
+    pool['latency_ms'] = round((time.perf_counter() - start) * 1000, 2)
+    return pool
+
+
+def retrieve_all(dataset: List[Dict], retrieve_fn: Callable[[Dict], Dict], max_workers: int = 8,
+                 cache: Optional[EvalResultCache] = None) -> Tuple[List[Dict], int]:
+    """모든 쿼리를 retrieve_fn으로 검색합니다. 캐시에 있는 쿼리는 건너뜁니다. (결과, 새로 검색한 쿼리 수) 반환"""
+    results: List[Optional[Dict]] = [None] * len(dataset)
+    query_hashes = [_stable_hash(data_point['query']) for data_point in dataset]
+
+    pending = []
+    for i, query_hash in enumerate(query_hashes):
+        cached = cache.get(query_hash) if cache else None
+        if cached is not None:
+            results[i] = cached
+        else:
+            pending.append(i)
+
+    if pending:
+        print(f"🔍 {len(pending)}개 쿼리 검색 중 (캐시 적중 {len(dataset) - len(pending)}개, 동시성 {max_workers})")
+    done = 0
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {executor.submit(retrieve_fn, dataset[i]['query']): i for i in pending}
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                entry = future.result()
+            except Exception as e:
+                print(f"❌ 쿼리 {i + 1} 검색 실패: {e}")
+                entry = {'doc_ids': [], 'scores': [], 'latency_ms': None, 'error': str(e)}
+            results[i] = entry
+            # 실패한 쿼리는 다음 실행에서 다시 검색하도록 캐시하지 않음
+            if cache and 'error' not in entry:
+                cache.set(query_hashes[i], entry)
+            done += 1
+            if done % 100 == 0:
+                print(f"  ... {done}/{len(pending)}")
+
+    return results, len(pending)
+
+
+def _gold_ids(data_point: Dict) -> List[str]:
+    if data_point.get('gold_doc_ids'):
+        return list(data_point['gold_doc_ids'])
+    return [data_point['gold_doc_id']] if data_point.get('gold_doc_id') else []
+
+
+def per_query_metrics(relevance: np.ndarray, num_gold: np.ndarray) -> Dict[str, np.ndarray]:
+    """쿼리 × 순위 관련성 행렬(0/1)에서 쿼리별 Hit / Recall@k / nDCG@k / RR을 계산합니다."""
+    num_queries, k = relevance.shape
+    discounts = 1.0 / np.log2(np.arange(2, k + 2))
+    hits = relevance.any(axis=1).astype(np.float64)
+    recall = relevance.sum(axis=1) / np.maximum(num_gold, 1)
+    dcg = relevance @ discounts
+    ideal_counts = np.minimum(num_gold, k).astype(int)
+    idcg = np.concatenate([[0.0], np.cumsum(discounts)])[ideal_counts]
+    ndcg = np.divide(dcg, idcg, out=np.zeros_like(dcg), where=idcg > 0)
+    first_rank = np.where(hits > 0, relevance.argmax(axis=1) + 1, 0)
+    reciprocal_rank = np.divide(1.0, first_rank, out=np.zeros(num_queries), where=first_rank > 0)
+    return {'hit_rate': hits, f'recall@{k}': recall, f'ndcg@{k}': ndcg, 'mrr': reciprocal_rank}
+
+
+def compute_metrics(retrieved: List[List[str]], gold: List[List[str]], categories: List[str], k: int) -> Dict:
     """
-    전체 리트리버 성능을 평가하고, 직무별 상세 결과를 JSON 파일로 저장합니다.
+    Hit Rate / Recall@k / nDCG@k / MRR을 전체 및 카테고리별로 계산합니다.
 
-    Args:
-        data_path (str): 가짜 데이터셋이 담긴 JSON 파일 경로.
-        top_k (int): 리트리버가 반환할 상위 문서의 개수.
+    쿼리 × 순위 관련성 행렬을 한 번 만든 뒤, 카테고리별 집계는 np.bincount로 처리합니다.
     """
+    num_queries = len(retrieved)
+    if num_queries == 0:
+        return {'overall': {'total_queries': 0}, 'by_category': {}}
+
+    relevance = np.zeros((num_queries, k), dtype=np.float64)
+    num_gold = np.zeros(num_queries, dtype=np.float64)
+    for i, (doc_ids, gold_ids) in enumerate(zip(retrieved, gold)):
+        gold_set = set(gold_ids)
+        num_gold[i] = len(gold_set)
+        for rank, doc_id in enumerate(doc_ids[:k]):
+            if doc_id in gold_set:
+                relevance[i, rank] = 1.0
+
+    per_query = per_query_metrics(relevance, num_gold)
+
+    category_names, category_index = np.unique(np.asarray(categories, dtype=object).astype(str), return_inverse=True)
+    counts = np.bincount(category_index, minlength=len(category_names))
+
+    overall = {'total_queries': num_queries}
+    overall.update({name: float(values.mean()) for name, values in per_query.items()})
+
+    by_category = {}
+    sums = {name: np.bincount(category_index, weights=values, minlength=len(category_names))
+            for name, values in per_query.items()}
+    for c, category in enumerate(category_names):
+        by_category[category] = {'total_queries': int(counts[c])}
+        by_category[category].update({name: float(sums[name][c] / counts[c]) for name in per_query})
+
+    return {'overall': overall, 'by_category': by_category}
+
+
+def _load_dataset(data_path: str) -> Optional[List[Dict]]:
     try:
-        file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), data_path)
+        file_path = os.path.join(EVAL_DIR, data_path)
         with open(file_path, 'r', encoding='utf-8') as f:
-            dataset = json.load(f)
+            return json.load(f)
     except FileNotFoundError:
         print(f"오류: '{file_path}' 파일을 찾을 수 없습니다. 경로를 다시 확인해주세요.")
-        return
     except json.JSONDecodeError:
         print(f"오류: '{file_path}' 파일이 유효한 JSON 형식이 아닙니다.")
+    return None
+
+
+def evaluate_retriever_and_save_results(data_path: str, top_k: int = 5, max_workers: int = 8,
+                                        cache_dir: Optional[str] = DEFAULT_CACHE_DIR, label: str = '',
+                                        output_file_name: str = "evaluation_results.json"):
+    """
+    전체 리트리버 성능을 평가하고, 직무별 상세 결과를 JSON 파일로 저장합니다.
+
+    Args:
+        data_path (str): 가짜 데이터셋이 담긴 JSON 파일 경로.
+        top_k (int): 리트리버가 반환할 상위 문서의 개수.
+        max_workers (int): 동시에 실행할 최대 검색 수.
+        cache_dir (str): 검색 결과 디스크 캐시 경로 (None이면 캐시 사용 안 함).
+        label (str): 설정 라벨 (리트리버 코드/인덱스를 바꿨을 때 변경하면 캐시를 새로 만듦).
+        output_file_name (str): 결과 파일 이름.
+    """
+    dataset = _load_dataset(data_path)
+    if dataset is None:
         return
 
-    # 전체 및 직무별 성능 지표를 저장할 변수
-    overall_hit_count = 0
-    overall_reciprocal_rank_sum = 0
-    overall_total_queries = len(dataset)
-    
-    category_results = defaultdict(lambda: {'hit_count': 0, 'reciprocal_rank_sum': 0, 'total_queries': 0})
-
-    print(f"--- 리트리버 성능 평가 시작 (총 {overall_total_queries}개 쿼리, top_k={top_k}) ---")
-
-    for i, data_point in enumerate(dataset, 1):
-        query_info = data_point['query']
-        gold_doc_id = data_point['gold_doc_id']
-        category_name = query_info.get('candidate_interest', '기타')
-
-        # 리트리버 호출
-        _, retrieved_doc_ids, _ = hybrid_search(user_profile=query_info, top_k=top_k)
-
-        # 평가 지표 계산
-        rank = 0
-        for idx, doc_id in enumerate(retrieved_doc_ids):
-            if doc_id == gold_doc_id:
-                rank = idx + 1
-                break
-        
-        # 전체 성능 지표 업데이트
-        if rank > 0:
-            overall_hit_count += 1
-            overall_reciprocal_rank_sum += 1 / rank
-            print(f"✅ 쿼리 {i}/{overall_total_queries}: 정답 문서 발견! 순위: {rank} (직무: {category_name})")
-        else:
-            print(f"❌ 쿼리 {i}/{overall_total_queries}: 정답 문서 미발견. 정답 ID: {gold_doc_id} (직무: {category_name})")
-        
-        # 직무별 성능 지표 업데이트
-        category_results[category_name]['total_queries'] += 1
-        if rank > 0:
-            category_results[category_name]['hit_count'] += 1
-            category_results[category_name]['reciprocal_rank_sum'] += 1 / rank
-
-    # 최종 결과 계산
-    overall_hit_rate = overall_hit_count / overall_total_queries if overall_total_queries > 0 else 0
-    overall_mrr = overall_reciprocal_rank_sum / overall_total_queries if overall_total_queries > 0 else 0
-    
+    config = retrieval_config(top_k, label)
+    cache = EvalResultCache(cache_dir, config) if cache_dir else None
+
+    print(f"--- 리트리버 성능 평가 시작 (총 {len(dataset)}개 쿼리, top_k={top_k}, "
+          f"설정 해시={cache.config_hash if cache else '-'}) ---")
+
+    start = time.perf_counter()
+    results, retrieved_count = retrieve_all(dataset, functools.partial(_retrieve, top_k=top_k), max_workers, cache)
+    elapsed = time.perf_counter() - start
+
+    metrics = compute_metrics(
+        retrieved=[result['doc_ids'] for result in results],
+        gold=[_gold_ids(data_point) for data_point in dataset],
+        categories=[data_point['query'].get('candidate_interest', '기타') for data_point in dataset],
+        k=top_k
+    )
+    latencies = [result['latency_ms'] for result in results if result.get('latency_ms') is not None]
+
     final_results = {
-        'overall': {
-            'total_queries': overall_total_queries,
-            'hit_rate': overall_hit_rate,
-            'mrr': overall_mrr,
-        },
-        'by_category': {}
+        'config': config,
+        'config_hash': cache.config_hash if cache else None,
+        'overall': metrics['overall'],
+        'by_category': metrics['by_category'],
+        'run': {
+            'retrieved_queries': retrieved_count,
+            'cached_queries': len(dataset) - retrieved_count,
+            'failed_queries': sum(1 for result in results if 'error' in result),
+            'elapsed_s': round(elapsed, 2),
+            'latency_p50_ms': float(np.percentile(latencies, 50)) if latencies else None,
+            'latency_p95_ms': float(np.percentile(latencies, 95)) if latencies else None,
+        }
     }
 
+    overall = metrics['overall']
     print("\n" + "="*80)
     print("⭐ 최종 종합 평가 결과 ⭐")
-    print(f"총 쿼리 수: {overall_total_queries}")
-    print(f"적중 쿼리 수: {overall_hit_count}")
+    print(f"총 쿼리 수: {overall['total_queries']} (새로 검색 {retrieved_count}개, {elapsed:.1f}s)")
     print(f"평가 기준: 상위 {top_k}개 결과")
-    print(f"Hit Rate (적중률): {overall_hit_rate:.4f}")
-    print(f"MRR: {overall_mrr:.4f}")
+    for name, value in overall.items():
+        if name != 'total_queries':
+            print(f"{name}: {value:.4f}")
     print("="*80)
 
-    # 직무별 상세 결과 계산 및 출력
     print("\n⭐ 직무별 상세 평가 결과 ⭐")
     print("="*80)
-    for category, results in category_results.items():
-        category_hit_rate = results['hit_count'] / results['total_queries'] if results['total_queries'] > 0 else 0
-        category_mrr = results['reciprocal_rank_sum'] / results['total_queries'] if results['total_queries'] > 0 else 0
-        
-        print(f"▷ 직무: {category} (쿼리 수: {results['total_queries']}개)")
-        print(f"  - Hit Rate (적중률): {category_hit_rate:.4f}")
-        print(f"  - MRR: {category_mrr:.4f}")
+    for category, category_metrics in metrics['by_category'].items():
+        print(f"▷ 직무: {category} (쿼리 수: {category_metrics['total_queries']}개)")
+        for name, value in category_metrics.items():
+            if name != 'total_queries':
+                print(f"  - {name}: {value:.4f}")
         print("-" * 80)
 
-        final_results['by_category'][category] = {
-            'total_queries': results['total_queries'],
-            'hit_rate': category_hit_rate,
-            'mrr': category_mrr
-        }
-    
     # 결과를 파일로 저장
-    output_file_name = "evaluation_results.json"
-    output_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), output_file_name)
+    output_path = os.path.join(EVAL_DIR, output_file_name)
     with open(output_path, "w", encoding="utf-8") as f:
         json.dump(final_results, f, ensure_ascii=False, indent=2)
-        
+
     print(f"\n✅ 평가 결과가 '{output_file_name}' 파일에 저장되었습니다.")
+    return final_results
+
+
+# --- 가중치/후보 수 스윕 ---
+
+def default_boost_grid(default_boosts: Dict[str, float], scales: Tuple[float, ...] = (0.5, 1.0, 1.5)) -> Dict[str, List[float]]:
+    """각 절의 기본 가중치에 scales를 곱한 그리드"""
+    return {name: sorted({round(boost * scale, 3) for scale in scales}) for name, boost in default_boosts.items()}
+
+
+def _pool_tensors(pools: List[Dict], gold: List[List[str]], clause_names: List[str]):
+    """후보 풀을 (절 점수 [Q, C, n], 리랭커 점수 [Q, C], 정답 여부 [Q, C], 유효 여부 [Q, C]) 텐서로 변환합니다."""
+    num_candidates = max((len(pool.get('candidates', [])) for pool in pools), default=0)
+    shape = (len(pools), num_candidates)
+    clause_scores = np.zeros(shape + (len(clause_names),), dtype=np.float64)
+    rerank_scores = np.full(shape, -np.inf)
+    is_gold = np.zeros(shape, dtype=bool)
+    valid = np.zeros(shape, dtype=bool)
+
+    for q, (pool, gold_ids) in enumerate(zip(pools, gold)):
+        gold_set = set(gold_ids)
+        for c, candidate in enumerate(pool.get('candidates', [])):
+            valid[q, c] = True
+            is_gold[q, c] = candidate['doc_id'] in gold_set
+            for n, name in enumerate(clause_names):
+                clause_scores[q, c, n] = candidate.get('clause_scores', {}).get(name, 0.0)
+            if candidate.get('rerank_score') is not None:
+                rerank_scores[q, c] = candidate['rerank_score']
+    return clause_scores, rerank_scores, is_gold, valid
+
+
+def sweep_configs(pools: List[Dict], gold: List[List[str]], top_k: int, boost_grid: Dict[str, List[float]],
+                  pool_sizes: List[int]) -> List[Dict]:
+    """
+    후보 풀을 재사용해 (가중치 조합 × 후보 수 × 리랭커 사용 여부) 조합을 오프라인으로 채점합니다.
+
+    - 리랭커 미사용: 가중합 점수 상위 top_k
+    - 리랭커 사용: 가중합 점수 상위 pool_size개를 리랭커 점수로 재정렬한 상위 top_k
+    추정 지연시간 = 평균(인코딩 + 검색) + 후보당 리랭킹 시간 × pool_size
+    """
+    clause_names = list(boost_grid)
+    clause_scores, rerank_scores, is_gold, valid = _pool_tensors(pools, gold, clause_names)
+    num_gold = np.asarray([len(set(gold_ids)) for gold_ids in gold], dtype=np.float64)
+    max_pool = clause_scores.shape[1]
+
+    timings = [pool.get('timings', {}) for pool in pools]
+    base_ms = float(np.mean([t.get('encode_ms', 0.0) + t.get('search_ms', 0.0) for t in timings])) if timings else 0.0
+    reranked_pairs = sum(len(pool.get('candidates', [])) for pool in pools)
+    rerank_pair_ms = sum(t.get('rerank_ms', 0.0) for t in timings) / reranked_pairs if reranked_pairs else 0.0
+
+    def _relevance(chosen: np.ndarray) -> np.ndarray:
+        return (np.take_along_axis(is_gold, chosen, axis=1) & np.take_along_axis(valid, chosen, axis=1)).astype(np.float64)
+
+    def _summary(relevance: np.ndarray) -> Dict[str, float]:
+        return {name: round(float(values.mean()), 4) for name, values in per_query_metrics(relevance, num_gold).items()}
+
+    configs = []
+    k = min(top_k, max_pool)
+    for values in itertools.product(*(boost_grid[name] for name in clause_names)):
+        boosts = dict(zip(clause_names, values))
+        fused = np.where(valid, clause_scores @ np.asarray(values), -np.inf)
+        order = np.argsort(-fused, axis=1, kind='stable')
+
+        configs.append({
+            'boosts': boosts, 'use_reranker': False, 'pool_size': top_k,
+            'est_latency_ms': round(base_ms, 2),
+            **_summary(_relevance(order[:, :k]))
+        })
+        for pool_size in pool_sizes:
+            if pool_size < top_k or pool_size > max_pool:
+                continue
+            pool_idx = order[:, :pool_size]
+            rerank_order = np.argsort(-np.take_along_axis(rerank_scores, pool_idx, axis=1), axis=1, kind='stable')[:, :k]
+            chosen = np.take_along_axis(pool_idx, rerank_order, axis=1)
+            configs.append({
+                'boosts': boosts, 'use_reranker': True, 'pool_size': pool_size,
+                'est_latency_ms': round(base_ms + rerank_pair_ms * pool_size, 2),
+                **_summary(_relevance(chosen))
+            })
+    return configs
+
+
+def pareto_front(configs: List[Dict], metric: str = 'mrr') -> List[Dict]:
+    """지연시간이 더 짧으면서 metric이 같거나 높은 설정이 없는 설정들 (지연시간 오름차순)"""
+    front = []
+    best = -1.0
+    for config in sorted(configs, key=lambda c: (c['est_latency_ms'], -c[metric])):
+        if config[metric] > best:
+            front.append(config)
+            best = config[metric]
+    return front
+
+
+def run_sweep(data_path: str, top_k: int = 5, pool_sizes: List[int] = None, boost_grid: Dict[str, List[float]] = None,
+              sweep_pool_size: int = None, max_workers: int = 8, cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+              label: str = '', mrr_tolerance: float = 0.005, output_file_name: str = "sweep_results.json"):
+    """
+    쿼리별 후보 풀을 한 번만 조회(디스크 캐시)한 뒤 가중치/후보 수/리랭커 조합을 오프라인으로 채점하고
+    MRR-지연시간 Pareto front와, 최고 MRR에서 mrr_tolerance 이내인 가장 빠른 설정을 보고합니다.
+
+    후보 풀은 모든 절 가중치 1.0으로 조회하므로, 가중치가 크게 다른 조합에서는 실제 검색과 후보 구성이
+    조금 다를 수 있습니다. sweep_pool_size를 가장 큰 pool_size보다 넉넉하게 잡아 이 차이를 줄입니다.
+    """
+    dataset = _load_dataset(data_path)
+    if dataset is None:
+        return
+
+    pool_sizes = sorted(set(pool_sizes or [top_k * m for m in (1, 2, 3, 5)]))
+    sweep_pool_size = sweep_pool_size or max(pool_sizes) * 2
+    config = {**retrieval_config(top_k, label), 'mode': 'candidate_pool', 'pool_size': sweep_pool_size}
+    cache = EvalResultCache(cache_dir, config) if cache_dir else None
+
+    print(f"--- 검색 설정 스윕 시작 (총 {len(dataset)}개 쿼리, 후보 풀 {sweep_pool_size}개) ---")
+    pools, retrieved_count = retrieve_all(
+        dataset, functools.partial(_retrieve_pool, pool_size=sweep_pool_size), max_workers, cache
+    )
+    pools = [pool if 'error' not in pool else {} for pool in pools]
+    default_boosts = next((pool['default_boosts'] for pool in pools if pool.get('default_boosts')), None)
+    if default_boosts is None:
+        print("❌ 후보 풀을 하나도 조회하지 못했습니다.")
+        return
+    pool_multiplier = next((pool['pool_multiplier'] for pool in pools if pool.get('pool_multiplier')), 5)
+
+    boost_grid = {**default_boost_grid(default_boosts), **(boost_grid or {})}
+    current_pool_size = top_k * pool_multiplier
+    pool_sizes = sorted(set(pool_sizes) | {current_pool_size})
+
+    start = time.perf_counter()
+    configs = sweep_configs(pools, [_gold_ids(d) for d in dataset], top_k, boost_grid, pool_sizes)
+    elapsed = time.perf_counter() - start
+
+    front = pareto_front(configs)
+    best_mrr = max(config['mrr'] for config in configs)
+    recommended = min((c for c in configs if c['mrr'] >= best_mrr - mrr_tolerance), key=lambda c: c['est_latency_ms'])
+    current = next((c for c in configs if c['use_reranker'] and c['pool_size'] == current_pool_size
+                    and all(c['boosts'][name] == round(boost, 3) for name, boost in default_boosts.items())), None)
+
+    print(f"\n✅ {len(configs)}개 설정 채점 완료 ({elapsed:.1f}s, 새로 조회한 후보 풀 {retrieved_count}개)")
+    print("\n⭐ MRR-지연시간 Pareto front ⭐")
+    print(f"  {'latency(ms)':>12}{'mrr':>8}{f'ndcg@{top_k}':>10}  rerank  pool  boosts")
+    for config in front:
+        print(f"  {config['est_latency_ms']:>12.1f}{config['mrr']:>8.4f}{config[f'ndcg@{top_k}']:>10.4f}"
+              f"  {'on ' if config['use_reranker'] else 'off'}    {config['pool_size']:>4}  {config['boosts']}")
+    if current:
+        print(f"\n현재 설정: mrr={current['mrr']:.4f}, pool={current['pool_size']}, 추정 {current['est_latency_ms']:.1f}ms")
+    print(f"추천 설정 (최고 MRR {best_mrr:.4f} - {mrr_tolerance} 이내 최소 지연): mrr={recommended['mrr']:.4f}, "
+          f"reranker={'on' if recommended['use_reranker'] else 'off'}, pool={recommended['pool_size']}, "
+          f"추정 {recommended['est_latency_ms']:.1f}ms")
+    print(f"  적용: RETRIEVAL_BOOSTS='{json.dumps(recommended['boosts'])}' "
+          f"RETRIEVAL_POOL_MULTIPLIER={max(1, recommended['pool_size'] // top_k)}")
+
+    results = {
+        'config': config,
+        'boost_grid': boost_grid,
+        'pool_sizes': pool_sizes,
+        'current': current,
+        'recommended': recommended,
+        'pareto_front': front,
+        'configs': configs,
+    }
+    output_path = os.path.join(EVAL_DIR, output_file_name)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"\n✅ 스윕 결과가 '{output_file_name}' 파일에 저장되었습니다.")
+    return results
+
+
+def _parse_grid(values: List[str]) -> Dict[str, List[float]]:
+    """['knn=1,2,3', ...] -> {'knn': [1.0, 2.0, 3.0]}"""
+    grid = {}
+    for value in values or []:
+        name, _, boosts = value.partition('=')
+        grid[name.strip()] = [float(boost) for boost in boosts.split(',') if boost.strip()]
+    return grid
 
 
 if __name__ == "__main__":
-    # 이전에 만든 가짜 데이터 파일 경로
-    fake_data_file = "retriever_sample_data.json"
-    
-    # 평가 실행
-    evaluate_retriever_and_save_results(fake_data_file, top_k=5)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="리트리버 검색 품질 평가")
+    parser.add_argument("--data", default="retriever_sample_data.json", help="평가 데이터셋 경로")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=8, help="동시 검색 수")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="검색 결과 디스크 캐시 경로")
+    parser.add_argument("--no-cache", action="store_true", help="디스크 캐시를 사용하지 않음")
+    parser.add_argument("--label", default="", help="설정 라벨 (바꾸면 캐시를 새로 만듦)")
+    parser.add_argument("--output", help="결과 파일 이름 (기본: evaluation_results.json / sweep_results.json)")
+    parser.add_argument("--sweep", action="store_true", help="가중치/후보 수/리랭커 조합 스윕 모드")
+    parser.add_argument("--pool-sizes", help="스윕할 리랭킹 후보 수 (예: 5,10,15,25)")
+    parser.add_argument("--sweep-pool-size", type=int, help="쿼리별로 한 번 조회할 후보 풀 크기 (기본: 최대 후보 수의 2배)")
+    parser.add_argument("--grid", action="append", help="절 가중치 그리드 (예: --grid knn=1,2,3), 미지정 절은 기본값의 0.5/1/1.5배")
+    parser.add_argument("--mrr-tolerance", type=float, default=0.005, help="추천 설정이 허용하는 최고 MRR 대비 손실")
+    args = parser.parse_args()
+    cache_dir = None if args.no_cache else args.cache_dir
+
+    if args.sweep:
+        run_sweep(
+            args.data,
+            top_k=args.top_k,
+            pool_sizes=[int(size) for size in args.pool_sizes.split(',')] if args.pool_sizes else None,
+            boost_grid=_parse_grid(args.grid),
+            sweep_pool_size=args.sweep_pool_size,
+            max_workers=args.workers,
+            cache_dir=cache_dir,
+            label=args.label,
+            mrr_tolerance=args.mrr_tolerance,
+            output_file_name=args.output or "sweep_results.json"
+        )
+    else:
+        evaluate_retriever_and_save_results(
+            args.data,
+            top_k=args.top_k,
+            max_workers=args.workers,
+            cache_dir=cache_dir,
+            label=args.label,
+            output_file_name=args.output or "evaluation_results.json"
+        )
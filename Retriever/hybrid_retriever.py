@@ -1,107 +1,572 @@
 import os
+import sys
 import json
+import time
+import asyncio
 import logging
+import threading
+import weakref
 from typing import Tuple, List, Dict
 from dotenv import load_dotenv
 
 # 환경변수 로드
 load_dotenv()
 
+# lambda_function과 공유하는 Retriever 모듈은 최상위 경로로 임포트
+RETRIEVER_DIR = os.path.dirname(os.path.abspath(__file__))
+if RETRIEVER_DIR not in sys.path:
+    sys.path.append(RETRIEVER_DIR)
+from response_codec import available_formats, compression_available, decode_body
+
 try:
     import boto3
+    from botocore.config import Config
 except ImportError:
     print("❌ boto3가 설치되지 않았습니다. pip install boto3를 실행하세요.")
     boto3 = None
+    Config = None
+
+try:
+    import requests
+except ImportError:
+    requests = None
+
+# 비동기 클라이언트 (선택): 설치되어 있지 않으면 동기 호출을 스레드에서 실행
+try:
+    from aiobotocore.session import get_session as get_aio_session
+    from aiobotocore.config import AioConfig
+except ImportError:
+    get_aio_session = None
+    AioConfig = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# 검색 결과 Redis 캐시 (프로젝트 루트에서 임포트된 경우에만 사용 가능)
+try:
+    from DB.retrieval_cache import get_retrieval_cache
+except ImportError:
+    get_retrieval_cache = None
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # 설정값
+# 리트리버 백엔드: lambda (기본값) | local (인프로세스) | http (로컬 HTTP 사이드카)
+RETRIEVER_BACKEND = os.environ.get('RETRIEVER_BACKEND', 'lambda')
 LAMBDA_FUNCTION_NAME = os.environ.get('RETRIEVER_LAMBDA_FUNCTION', 'MangMangDae-Retriever')
 AWS_REGION = os.environ.get('AWS_REGION', 'ap-northeast-2')
 AWS_ACCESS_KEY_ID_LAMBDA = os.environ.get('AWS_ACCESS_KEY_ID_LAMBDA')
 AWS_SECRET_ACCESS_KEY_LAMBDA = os.environ.get('AWS_SECRET_ACCESS_KEY_LAMBDA')
+# Lambda 클라이언트 커넥션 풀 설정
+LAMBDA_MAX_POOL_CONNECTIONS = int(os.environ.get('RETRIEVER_LAMBDA_MAX_POOL_CONNECTIONS', '20'))
+LAMBDA_CONNECT_TIMEOUT = float(os.environ.get('RETRIEVER_LAMBDA_CONNECT_TIMEOUT', '3'))
+LAMBDA_READ_TIMEOUT = float(os.environ.get('RETRIEVER_LAMBDA_READ_TIMEOUT', '30'))
+LAMBDA_MAX_ATTEMPTS = int(os.environ.get('RETRIEVER_LAMBDA_MAX_ATTEMPTS', '3'))
+RETRIEVER_HTTP_URL = os.environ.get('RETRIEVER_HTTP_URL', 'http://localhost:8080/search')
+RETRIEVER_HTTP_TIMEOUT = float(os.environ.get('RETRIEVER_HTTP_TIMEOUT', '30'))
+# 쿼리 벡터 전달 시 직렬화 dtype (리트리버가 반환하는 벡터는 float16)
+QUERY_VECTOR_DTYPE = 'float16'
+# 응답 형식: auto (설치된 msgpack/orjson 우선) | json, 압축: zstd | none (lambda 백엔드에만 적용)
+RETRIEVER_RESPONSE_FORMAT = os.environ.get('RETRIEVER_RESPONSE_FORMAT', 'auto')
+RETRIEVER_RESPONSE_COMPRESSION = os.environ.get('RETRIEVER_RESPONSE_COMPRESSION', 'zstd')
+# 검색 결과 캐시: redis (기본값) | none
+RETRIEVAL_CACHE = os.environ.get('RETRIEVAL_CACHE', 'redis')
+
+
+class RetrieverBackend:
+    """
+    리트리버 백엔드 인터페이스
 
-def hybrid_search(user_profile: dict, top_k: int = 5, exclude_ids: list = None) -> Tuple[List[float], List[str], List[Dict]]:
+    요청/응답은 Lambda 요청 본문과 같은 형식의 dict입니다.
+    (검색 요청: user_profile, top_k, exclude_ids, query_vector, fields, ... / 응답: scores, doc_ids, documents, ...)
+    (문서 조회 요청: operation="get_documents", doc_ids, fields / 응답: doc_ids, documents)
+    실패 시 빈 dict를 반환합니다.
     """
-    Lambda 함수를 호출하여 하이브리드 검색을 수행합니다.
+    name = "base"
+
+    def invoke(self, request: Dict) -> Dict:
+        """리트리버 요청(하이브리드 검색 / 문서 조회)을 실행하고 응답 데이터를 반환합니다."""
+        raise NotImplementedError
+
+    async def invoke_async(self, request: Dict) -> Dict:
+        """비동기 요청. 기본 구현은 동기 검색을 스레드에서 실행해 이벤트 루프를 막지 않습니다."""
+        return await asyncio.to_thread(self.invoke, request)
+
+    async def aclose(self):
+        """비동기 클라이언트 리소스를 정리합니다."""
+        return None
+
+
+# 프로세스 전역 Lambda 클라이언트 (boto3 클라이언트는 스레드 안전하므로 여러 스레드가 공유)
+_lambda_client = None
+_lambda_client_lock = threading.Lock()
+_lambda_client_metrics = {
+    "clients_created": 0,
+    "client_create_ms": 0.0,
+    "client_reuses": 0,
+    "invocations": 0,
+    "invoke_errors": 0,
+    "invoke_total_ms": 0.0,
+    "invoke_max_ms": 0.0,
+}
+
+def get_lambda_client():
+    """
+    커넥션 풀이 설정된 Lambda 클라이언트를 반환합니다. (프로세스 전역 1개)
+    자격 증명 해석/엔드포인트 설정/TLS 연결을 매 호출마다 반복하지 않도록 재사용합니다.
+    """
+    global _lambda_client
+    with _lambda_client_lock:
+        if _lambda_client is not None:
+            _lambda_client_metrics["client_reuses"] += 1
+            return _lambda_client
+
+        start = time.perf_counter()
+        config = Config(
+            region_name=AWS_REGION,
+            max_pool_connections=LAMBDA_MAX_POOL_CONNECTIONS,
+            tcp_keepalive=True,
+            connect_timeout=LAMBDA_CONNECT_TIMEOUT,
+            read_timeout=LAMBDA_READ_TIMEOUT,
+            retries={"max_attempts": LAMBDA_MAX_ATTEMPTS, "mode": "standard"},
+        )
+        _lambda_client = boto3.session.Session(
+            aws_access_key_id=AWS_ACCESS_KEY_ID_LAMBDA,
+            aws_secret_access_key=AWS_SECRET_ACCESS_KEY_LAMBDA,
+            region_name=AWS_REGION
+        ).client('lambda', config=config)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        _lambda_client_metrics["clients_created"] += 1
+        _lambda_client_metrics["client_create_ms"] += elapsed_ms
+        logger.info(f"✅ Lambda 클라이언트 생성 완료 ({elapsed_ms:.1f}ms, max_pool_connections={LAMBDA_MAX_POOL_CONNECTIONS})")
+        return _lambda_client
+
+def _record_invoke(elapsed_ms: float, failed: bool = False):
+    """Lambda 호출 지연시간을 기록합니다."""
+    with _lambda_client_lock:
+        _lambda_client_metrics["invocations"] += 1
+        _lambda_client_metrics["invoke_total_ms"] += elapsed_ms
+        _lambda_client_metrics["invoke_max_ms"] = max(_lambda_client_metrics["invoke_max_ms"], elapsed_ms)
+        if failed:
+            _lambda_client_metrics["invoke_errors"] += 1
+
+def get_lambda_client_metrics() -> Dict:
+    """Lambda 클라이언트 재사용 및 호출 지연시간 지표를 반환합니다."""
+    with _lambda_client_lock:
+        metrics = dict(_lambda_client_metrics)
+    invocations = metrics["invocations"]
+    metrics["invoke_avg_ms"] = metrics["invoke_total_ms"] / invocations if invocations else 0.0
+    return metrics
+
+
+
+class LambdaRetrieverBackend(RetrieverBackend):
+    """AWS Lambda 함수를 호출하는 백엔드"""
+    name = "lambda"
+
+    def __init__(self):
+        # 이벤트 루프별 aiobotocore 클라이언트 (aiohttp 세션은 생성된 루프에서만 사용할 수 있음)
+        self._async_clients = weakref.WeakKeyDictionary()
+
+    def invoke(self, request: Dict) -> Dict:
+        # boto3 설치 확인
+        if boto3 is None:
+            logger.error("boto3가 설치되지 않았습니다.")
+            return {}
+        
+        # AWS 자격 증명 확인
+        if not AWS_ACCESS_KEY_ID_LAMBDA or not AWS_SECRET_ACCESS_KEY_LAMBDA:
+            logger.error("AWS 자격 증명이 설정되지 않았습니다. .env 파일에 AWS_ACCESS_KEY_ID와 AWS_SECRET_ACCESS_KEY를 설정하세요.")
+            return {}
+        
+        start = None
+        try:
+            # 공유 Lambda 클라이언트
+            lambda_client = get_lambda_client()
+            
+            # 요청 데이터 구성
+            payload = {"body": json.dumps(_with_response_format(request), ensure_ascii=False)}
+            
+            logger.info(f"🚀 Lambda 함수 '{LAMBDA_FUNCTION_NAME}' 호출 중...")
+            
+            # Lambda 함수 호출
+            start = time.perf_counter()
+            response = lambda_client.invoke(
+                FunctionName=LAMBDA_FUNCTION_NAME,
+                InvocationType='RequestResponse',
+                Payload=json.dumps(payload, ensure_ascii=False)
+            )
+            
+            # 응답 파싱
+            response_payload = json.loads(response['Payload'].read())
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            _record_invoke(elapsed_ms, failed=response_payload.get('statusCode') != 200)
+            
+            return parse_lambda_response(response_payload, elapsed_ms)
+            
+        except Exception as e:
+            if start is not None:
+                _record_invoke((time.perf_counter() - start) * 1000, failed=True)
+            logger.error(f"❌ Lambda 함수 호출 실패: {e}")
+            return {}
+
+    async def _get_async_client(self):
+        """현재 이벤트 루프의 aiobotocore Lambda 클라이언트를 반환합니다."""
+        loop = asyncio.get_running_loop()
+        entry = self._async_clients.get(loop)
+        if entry is not None:
+            return entry[1]
+
+        config = AioConfig(
+            max_pool_connections=LAMBDA_MAX_POOL_CONNECTIONS,
+            connect_timeout=LAMBDA_CONNECT_TIMEOUT,
+            read_timeout=LAMBDA_READ_TIMEOUT,
+            retries={"max_attempts": LAMBDA_MAX_ATTEMPTS, "mode": "standard"},
+        )
+        client_context = get_aio_session().create_client(
+            'lambda',
+            region_name=AWS_REGION,
+            aws_access_key_id=AWS_ACCESS_KEY_ID_LAMBDA,
+            aws_secret_access_key=AWS_SECRET_ACCESS_KEY_LAMBDA,
+            config=config
+        )
+        client = await client_context.__aenter__()
+
+        # 동시에 생성된 경우 먼저 등록된 클라이언트를 사용
+        entry = self._async_clients.get(loop)
+        if entry is not None:
+            await client_context.__aexit__(None, None, None)
+            return entry[1]
+        self._async_clients[loop] = (client_context, client)
+        logger.info("✅ 비동기 Lambda 클라이언트 생성 완료")
+        return client
+
+    async def invoke_async(self, request: Dict) -> Dict:
+        # aiobotocore가 없으면 기본 구현(스레드 실행)으로 대체
+        if get_aio_session is None:
+            return await super().invoke_async(request)
+
+        if not AWS_ACCESS_KEY_ID_LAMBDA or not AWS_SECRET_ACCESS_KEY_LAMBDA:
+            logger.error("AWS 자격 증명이 설정되지 않았습니다. .env 파일에 AWS_ACCESS_KEY_ID와 AWS_SECRET_ACCESS_KEY를 설정하세요.")
+            return {}
+
+        start = None
+        try:
+            lambda_client = await self._get_async_client()
+
+            payload = {"body": json.dumps(_with_response_format(request), ensure_ascii=False)}
+
+            logger.info(f"🚀 Lambda 함수 '{LAMBDA_FUNCTION_NAME}' 비동기 호출 중...")
+
+            start = time.perf_counter()
+            response = await lambda_client.invoke(
+                FunctionName=LAMBDA_FUNCTION_NAME,
+                InvocationType='RequestResponse',
+                Payload=json.dumps(payload, ensure_ascii=False)
+            )
+            async with response['Payload'] as stream:
+                response_payload = json.loads(await stream.read())
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            _record_invoke(elapsed_ms, failed=response_payload.get('statusCode') != 200)
+
+            return parse_lambda_response(response_payload, elapsed_ms)
+
+        except Exception as e:
+            if start is not None:
+                _record_invoke((time.perf_counter() - start) * 1000, failed=True)
+            logger.error(f"❌ Lambda 함수 비동기 호출 실패: {e}")
+            return {}
+
+    async def aclose(self):
+        loop = asyncio.get_running_loop()
+        entry = self._async_clients.pop(loop, None)
+        if entry is not None:
+            await entry[0].__aexit__(None, None, None)
+
+
+def parse_lambda_response(response_payload: dict, elapsed_ms: float) -> Dict:
+    """Lambda 응답 페이로드에서 응답 데이터를 꺼냅니다."""
+    # 상태 코드 확인
+    if response_payload.get('statusCode') != 200:
+        error_body = response_payload.get('body', '알 수 없는 오류')
+        try:
+            error_detail = json.loads(error_body)
+            logger.error(f"❌ Lambda 함수 실행 실패: {error_detail}")
+        except:
+            logger.error(f"❌ Lambda 함수 실행 실패: {error_body}")
+        return {}
+    
+    # 성공 응답 데이터 파싱 (협상된 형식/압축에 맞춰 한 번만 복원)
+    result_data = decode_body(
+        response_payload['body'],
+        response_payload.get('headers'),
+        response_payload.get('isBase64Encoded', False)
+    )
+    
+    logger.info(f"✅ 리트리버 응답 수신: {len(result_data.get('documents', []))}개 문서 ({elapsed_ms:.0f}ms)")
+    return result_data
+
+
+def _with_response_format(request: Dict, allow_compression: bool = True) -> Dict:
+    """요청에 선호 응답 형식(및 압축)을 추가합니다. 서버는 지원하는 첫 번째 형식으로 응답합니다."""
+    if RETRIEVER_RESPONSE_FORMAT == 'json':
+        return request
+    request = {**request, "response_format": available_formats()}
+    if allow_compression and RETRIEVER_RESPONSE_COMPRESSION == 'zstd' and compression_available():
+        request["compression"] = "zstd"
+    return request
+
+
+class LocalRetrieverBackend(RetrieverBackend):
+    """
+    lambda_function.run_search를 같은 프로세스에서 직접 호출하는 백엔드
+    (Lambda 호출 네트워크 홉과 이중 JSON 직렬화 제거, 모델은 이 프로세스에 로드됨)
+    """
+    name = "local"
+
+    def __init__(self):
+        # lambda_function은 같은 디렉토리의 모듈을 최상위 경로로 임포트 (RETRIEVER_DIR이 sys.path에 추가되어 있음)
+        import lambda_function
+        self._lambda_function = lambda_function
+
+    def invoke(self, request: Dict) -> Dict:
+        try:
+            # 같은 프로세스이므로 직렬화 없이 dict를 그대로 주고받음
+            if request.get('operation') == 'get_documents':
+                return self._lambda_function.get_documents(request.get('doc_ids', []), request.get('fields'))
+            if request.get('operation') == 'candidate_pool':
+                return self._lambda_function.run_candidate_pool(request)
+
+            logger.info("🚀 인프로세스 리트리버로 검색 중...")
+            result_data = self._lambda_function.run_search(request)
+            logger.info(f"✅ 검색 완료: {len(result_data.get('scores', []))}개 결과 반환")
+            return result_data
+        except Exception as e:
+            logger.error(f"❌ 인프로세스 리트리버 검색 실패: {e}")
+            return {}
+
+
+class HttpRetrieverBackend(RetrieverBackend):
+    """로컬 HTTP 사이드카(local_server.py)를 호출하는 백엔드"""
+    name = "http"
+
+    def __init__(self, url: str = None, timeout: float = None):
+        self.url = url or RETRIEVER_HTTP_URL
+        self.timeout = timeout or RETRIEVER_HTTP_TIMEOUT
+        self._session = requests.Session() if requests is not None else None
+        # 이벤트 루프별 httpx 클라이언트 (커넥션 풀은 생성된 루프에서만 사용할 수 있음)
+        self._async_clients = weakref.WeakKeyDictionary()
+
+    def invoke(self, request: Dict) -> Dict:
+        if self._session is None:
+            logger.error("requests가 설치되지 않았습니다.")
+            return {}
+
+        try:
+            logger.info(f"🚀 리트리버 사이드카 '{self.url}' 호출 중...")
+            # 로컬 사이드카에는 압축 없이 형식만 협상
+            response = self._session.post(self.url, json=_with_response_format(request, allow_compression=False), timeout=self.timeout)
+            if response.status_code != 200:
+                logger.error(f"❌ 리트리버 사이드카 실행 실패 ({response.status_code}): {response.text}")
+                return {}
+
+            result_data = decode_body(response.content, response.headers)
+            logger.info(f"✅ 리트리버 응답 수신: {len(result_data.get('documents', []))}개 문서")
+            return result_data
+
+        except Exception as e:
+            logger.error(f"❌ 리트리버 사이드카 호출 실패: {e}")
+            return {}
+
+    async def invoke_async(self, request: Dict) -> Dict:
+        # httpx가 없으면 기본 구현(스레드 실행)으로 대체
+        if httpx is None:
+            return await super().invoke_async(request)
+
+        try:
+            client = self._get_async_client()
+
+            logger.info(f"🚀 리트리버 사이드카 '{self.url}' 비동기 호출 중...")
+            response = await client.post(self.url, json=_with_response_format(request, allow_compression=False))
+            if response.status_code != 200:
+                logger.error(f"❌ 리트리버 사이드카 실행 실패 ({response.status_code}): {response.text}")
+                return {}
+
+            result_data = decode_body(response.content, response.headers)
+            logger.info(f"✅ 리트리버 응답 수신: {len(result_data.get('documents', []))}개 문서")
+            return result_data
+
+        except Exception as e:
+            logger.error(f"❌ 리트리버 사이드카 비동기 호출 실패: {e}")
+            return {}
+
+    def _get_async_client(self):
+        """현재 이벤트 루프의 httpx 클라이언트를 반환합니다."""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(timeout=self.timeout)
+            self._async_clients[loop] = client
+        return client
+
+    async def aclose(self):
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+
+
+_BACKENDS = {
+    LambdaRetrieverBackend.name: LambdaRetrieverBackend,
+    LocalRetrieverBackend.name: LocalRetrieverBackend,
+    HttpRetrieverBackend.name: HttpRetrieverBackend,
+}
+_retriever_backend = None
+
+def get_retriever_backend() -> RetrieverBackend:
+    """RETRIEVER_BACKEND 설정에 따라 리트리버 백엔드를 생성합니다. (프로세스 전역 1개)"""
+    global _retriever_backend
+    if _retriever_backend is None:
+        backend_cls = _BACKENDS.get(RETRIEVER_BACKEND)
+        if backend_cls is None:
+            raise ValueError(f"지원하지 않는 RETRIEVER_BACKEND입니다: {RETRIEVER_BACKEND} (지원: {', '.join(_BACKENDS)})")
+        _retriever_backend = backend_cls()
+        logger.info(f"리트리버 백엔드: {_retriever_backend.name}")
+    return _retriever_backend
+
+def _build_search_request(user_profile: dict, top_k: int, exclude_ids: list,
+                          query_vector: str = None, return_query_vector: bool = False,
+                          fields: List[str] = None) -> Dict:
+    """리트리버 요청 본문을 구성합니다."""
+    request = {
+        "user_profile": user_profile,
+        "top_k": top_k,
+        "exclude_ids": exclude_ids or []
+    }
+    if fields:
+        request["fields"] = list(fields)
+    if query_vector:
+        request["query_vector"] = query_vector
+        request["query_vector_dtype"] = QUERY_VECTOR_DTYPE
+    if return_query_vector:
+        request["return_query_vector"] = True
+    return request
+
+def _unpack_search_response(result_data: Dict, return_query_vector: bool) -> Tuple:
+    """응답 데이터를 (scores, doc_ids, documents[, query_vector]) 튜플로 변환합니다."""
+    result = (
+        result_data.get('scores', []),
+        result_data.get('doc_ids', []),
+        result_data.get('documents', [])
+    )
+    if return_query_vector:
+        return result + (result_data.get('query_vector'),)
+    return result
+
+def _get_result_cache():
+    """검색 결과 캐시를 반환합니다. 비활성화되었거나 사용할 수 없으면 None."""
+    if RETRIEVAL_CACHE != 'redis' or get_retrieval_cache is None:
+        return None
+    return get_retrieval_cache()
+
+def _invoke_with_cache(request: Dict) -> Dict:
+    """검색 결과 캐시를 먼저 확인하고, 없으면 백엔드를 호출해 결과를 저장합니다."""
+    cache = _get_result_cache()
+    if cache is not None:
+        result_data = cache.get(request)
+        if result_data is not None:
+            logger.info(f"✅ 검색 결과 캐시 적중: {len(result_data.get('doc_ids', []))}개 결과 반환")
+            return result_data
+
+    result_data = get_retriever_backend().invoke(request)
+    if cache is not None:
+        cache.set(request, result_data)
+    return result_data
+
+async def _invoke_with_cache_async(request: Dict) -> Dict:
+    """_invoke_with_cache의 비동기 버전 (Redis 호출은 스레드에서 실행)"""
+    cache = await asyncio.to_thread(_get_result_cache)
+    if cache is not None:
+        result_data = await asyncio.to_thread(cache.get, request)
+        if result_data is not None:
+            logger.info(f"✅ 검색 결과 캐시 적중: {len(result_data.get('doc_ids', []))}개 결과 반환")
+            return result_data
+
+    result_data = await get_retriever_backend().invoke_async(request)
+    if cache is not None:
+        await asyncio.to_thread(cache.set, request, result_data)
+    return result_data
+
+def hybrid_search(user_profile: dict, top_k: int = 5, exclude_ids: list = None,
+                  query_vector: str = None, return_query_vector: bool = False,
+                  fields: List[str] = None) -> Tuple[List[float], List[str], List[Dict]]:
+    """
+    설정된 리트리버 백엔드(Lambda / 인프로세스 / HTTP 사이드카)로 하이브리드 검색을 수행합니다.
     
     Args:
         user_profile (dict): 사용자 프로필 정보
         top_k (int): 반환할 결과 수
         exclude_ids (list): 제외할 문서 ID 리스트
+        query_vector (str): 이전 검색에서 받은 쿼리 벡터 (base64 float16, 있으면 리트리버가 쿼리 인코딩 생략)
+        return_query_vector (bool): True면 리트리버가 사용한 쿼리 벡터(base64 float16)를 4번째 값으로 함께 반환
+        fields (List[str]): 반환받을 문서 필드 (없으면 전체 문서, 전체 문서는 fetch_documents로 지연 조회)
     
     Returns:
         Tuple[List[float], List[str], List[Dict]]: (scores, doc_ids, documents)
+            return_query_vector=True이면 (scores, doc_ids, documents, query_vector)
     """
-    
-    if exclude_ids is None:
-        exclude_ids = []
-    
-    # boto3 설치 확인
-    if boto3 is None:
-        logger.error("boto3가 설치되지 않았습니다.")
-        return [], [], []
-    
-    # AWS 자격 증명 확인
-    if not AWS_ACCESS_KEY_ID_LAMBDA or not AWS_SECRET_ACCESS_KEY_LAMBDA:
-        logger.error("AWS 자격 증명이 설정되지 않았습니다. .env 파일에 AWS_ACCESS_KEY_ID와 AWS_SECRET_ACCESS_KEY를 설정하세요.")
-        return [], [], []
-    
-    try:
-        # Lambda 클라이언트 생성
-        lambda_client = boto3.client(
-            'lambda',
-            region_name=AWS_REGION,
-            aws_access_key_id=AWS_ACCESS_KEY_ID_LAMBDA,
-            aws_secret_access_key=AWS_SECRET_ACCESS_KEY_LAMBDA
-        )
-        
-        # 요청 데이터 구성
-        payload = {
-            "body": json.dumps({
-                "user_profile": user_profile,
-                "top_k": top_k,
-                "exclude_ids": exclude_ids
-            }, ensure_ascii=False)
-        }
-        
-        logger.info(f"🚀 Lambda 함수 '{LAMBDA_FUNCTION_NAME}' 호출 중...")
-        
-        # Lambda 함수 호출
-        response = lambda_client.invoke(
-            FunctionName=LAMBDA_FUNCTION_NAME,
-            InvocationType='RequestResponse',
-            Payload=json.dumps(payload, ensure_ascii=False)
-        )
-        
-        # 응답 파싱
-        response_payload = json.loads(response['Payload'].read())
-        
-        # 상태 코드 확인
-        if response_payload.get('statusCode') != 200:
-            error_body = response_payload.get('body', '알 수 없는 오류')
-            try:
-                error_detail = json.loads(error_body)
-                logger.error(f"❌ Lambda 함수 실행 실패: {error_detail}")
-            except:
-                logger.error(f"❌ Lambda 함수 실행 실패: {error_body}")
-            return [], [], []
-        
-        # 성공 응답 데이터 파싱
-        result_data = json.loads(response_payload['body'])
-        
-        scores = result_data.get('scores', [])
-        doc_ids = result_data.get('doc_ids', [])
-        documents = result_data.get('documents', [])
-        
-        logger.info(f"✅ 검색 완료: {len(scores)}개 결과 반환")
-        return scores, doc_ids, documents
-        
-    except Exception as e:
-        logger.error(f"❌ Lambda 함수 호출 실패: {e}")
-        return [], [], []
+    request = _build_search_request(user_profile, top_k, exclude_ids, query_vector, return_query_vector, fields)
+    result_data = _invoke_with_cache(request)
+    return _unpack_search_response(result_data, return_query_vector)
+
+async def hybrid_search_async(user_profile: dict, top_k: int = 5, exclude_ids: list = None,
+                              query_vector: str = None, return_query_vector: bool = False,
+                              fields: List[str] = None) -> Tuple[List[float], List[str], List[Dict]]:
+    """
+    hybrid_search의 비동기 버전입니다. (FastAPI 이벤트 루프를 막지 않음)
+    인자와 반환 형식은 hybrid_search와 같습니다.
+    """
+    request = _build_search_request(user_profile, top_k, exclude_ids, query_vector, return_query_vector, fields)
+    result_data = await _invoke_with_cache_async(request)
+    return _unpack_search_response(result_data, return_query_vector)
+
+def fetch_documents(doc_ids: List[str], fields: List[str] = None) -> Dict[str, Dict]:
+    """
+    문서 ID로 전체 문서를 조회합니다. (검색 시 필드 프로젝션으로 받은 후보의 전체 공고를 선택 시점에 지연 조회)
+
+    Returns:
+        Dict[str, Dict]: {문서 ID: 문서}. 실패 시 빈 dict
+    """
+    if not doc_ids:
+        return {}
+    result_data = get_retriever_backend().invoke({
+        "operation": "get_documents",
+        "doc_ids": list(doc_ids),
+        **({"fields": list(fields)} if fields else {})
+    })
+    return dict(zip(result_data.get('doc_ids', []), result_data.get('documents', [])))
+
+def fetch_candidate_pool(user_profile: dict, pool_size: int = 50) -> Dict:
+    """
+    가중치 스윕용 후보 풀을 조회합니다. (후보별 절 점수 + 리랭커 점수, eval_retriever.py --sweep)
+
+    Returns:
+        Dict: {'candidates': [...], 'default_boosts': {...}, 'pool_multiplier': int, 'timings': {...}}. 실패 시 빈 dict
+    """
+    return get_retriever_backend().invoke({
+        "operation": "candidate_pool",
+        "user_profile": user_profile,
+        "pool_size": pool_size
+    })
+
+async def aclose_retriever_clients():
+    """비동기 리트리버 클라이언트를 정리합니다. (애플리케이션 종료 시 호출)"""
+    if _retriever_backend is not None:
+        await _retriever_backend.aclose()
 
 def _format_hit_to_text(hit_source: dict) -> str:
     if not hit_source:
@@ -150,4 +615,6 @@ if __name__ == "__main__":
             print(f"  위치: {document.get('location', '정보 없음')}")
             print("-" * 50)
     else:
-        print("❌ 검색 결과가 없습니다.")
\ No newline at end of file
+        print("❌ 검색 결과가 없습니다.")
+
+    print(f"\nLambda 클라이언트 지표: {get_lambda_client_metrics()}")
\ No newline at end of file
@@ -0,0 +1,223 @@
+"""
+임베딩/리랭커 모델 추론 백엔드
+
+INFERENCE_BACKEND 환경변수로 추론 백엔드를 선택합니다.
+- torch (기본값): 전체 정밀도 PyTorch 모델
+- onnx: 미리 export한 INT8 양자화 ONNX Runtime 모델 (CPU 전용 Lambda에서 콜드 스타트/메모리/지연시간 절감)
+
+온라인 쿼리 인코더(lambda_function.py)와 마이그레이션 인코더(DataCollection/DynamoToOpensearch/migrate.py)가
+같은 설정을 공유합니다.
+
+사용 예시:
+    # INT8 ONNX 모델 export
+    python inference_backend.py export --output-dir ./models
+
+    # torch 출력과 onnx 출력 비교
+    python inference_backend.py parity --onnx-dir ./models
+"""
+import argparse
+import logging
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL_NAME = os.environ.get('EMBEDDING_MODEL_NAME', 'intfloat/multilingual-e5-large')
+RERANKER_MODEL_NAME = os.environ.get('RERANKER_MODEL_NAME', 'cross-encoder/ms-marco-MiniLM-L-6-v2')
+
+# 양자화 설정 (avx2 / avx512 / avx512_vnni / arm64)
+ONNX_QUANTIZATION = os.environ.get('ONNX_QUANTIZATION', 'avx2')
+EMBEDDING_ONNX_FILE = os.environ.get('EMBEDDING_ONNX_FILE', f'onnx/model_qint8_{ONNX_QUANTIZATION}.onnx')
+RERANKER_ONNX_FILE = os.environ.get('RERANKER_ONNX_FILE', f'onnx/model_qint8_{ONNX_QUANTIZATION}.onnx')
+
+SUPPORTED_BACKENDS = ('torch', 'onnx')
+
+
+def get_inference_backend() -> str:
+    """환경변수에서 추론 백엔드를 읽어옵니다."""
+    backend = os.environ.get('INFERENCE_BACKEND', 'torch').strip().lower()
+    if backend not in SUPPORTED_BACKENDS:
+        raise ValueError(f"지원하지 않는 INFERENCE_BACKEND입니다: {backend} (지원: {', '.join(SUPPORTED_BACKENDS)})")
+    return backend
+
+
+def sentence_transformer_kwargs(device: str = 'cpu', backend: Optional[str] = None) -> Dict:
+    """
+    SentenceTransformer 생성자에 전달할 백엔드 관련 인자를 반환합니다.
+    langchain의 HuggingFaceEmbeddings(model_kwargs=...)에도 그대로 사용할 수 있습니다.
+    """
+    backend = backend or get_inference_backend()
+    kwargs = {'device': device}
+    if backend == 'onnx':
+        kwargs['backend'] = 'onnx'
+        kwargs['model_kwargs'] = {'file_name': EMBEDDING_ONNX_FILE}
+    return kwargs
+
+
+def load_embedding_model(model_name: Optional[str] = None, cache_folder: Optional[str] = None,
+                         device: str = 'cpu', backend: Optional[str] = None):
+    """임베딩 모델(SentenceTransformer)을 선택된 백엔드로 로드합니다."""
+    from sentence_transformers import SentenceTransformer
+
+    model_name = model_name or EMBEDDING_MODEL_NAME
+    kwargs = sentence_transformer_kwargs(device=device, backend=backend)
+    logger.info(f"임베딩 모델 로드: {model_name} (backend={kwargs.get('backend', 'torch')})")
+    return SentenceTransformer(model_name, cache_folder=cache_folder, **kwargs)
+
+
+def load_reranker_model(model_name: Optional[str] = None, cache_folder: Optional[str] = None,
+                        device: str = 'cpu', max_length: int = 256, backend: Optional[str] = None):
+    """리랭커 모델(CrossEncoder)을 선택된 백엔드로 로드합니다."""
+    from sentence_transformers import CrossEncoder
+
+    model_name = model_name or RERANKER_MODEL_NAME
+    backend = backend or get_inference_backend()
+    kwargs = {}
+    if backend == 'onnx':
+        kwargs['backend'] = 'onnx'
+        kwargs['model_kwargs'] = {'file_name': RERANKER_ONNX_FILE}
+    logger.info(f"리랭커 모델 로드: {model_name} (backend={backend})")
+    return CrossEncoder(model_name, max_length=max_length, device=device, cache_folder=cache_folder, **kwargs)
+
+
+def export_quantized_onnx_models(output_dir: str, quantization: str = ONNX_QUANTIZATION) -> Dict[str, str]:
+    """
+    임베딩/리랭커 모델을 ONNX로 export한 뒤 INT8 동적 양자화 모델을 함께 저장합니다.
+
+    Args:
+        output_dir (str): 모델을 저장할 디렉토리 (하위에 embedding/, reranker/ 생성)
+        quantization (str): 양자화 설정 (avx2 / avx512 / avx512_vnni / arm64)
+
+    Returns:
+        Dict[str, str]: 모델별 저장 경로
+    """
+    from sentence_transformers import CrossEncoder, SentenceTransformer, export_dynamic_quantized_onnx_model
+
+    paths = {
+        'embedding': os.path.join(output_dir, 'embedding'),
+        'reranker': os.path.join(output_dir, 'reranker'),
+    }
+
+    logger.info(f"임베딩 모델 ONNX export 중: {EMBEDDING_MODEL_NAME}")
+    embedding_model = SentenceTransformer(EMBEDDING_MODEL_NAME, backend='onnx', device='cpu')
+    embedding_model.save_pretrained(paths['embedding'])
+    export_dynamic_quantized_onnx_model(embedding_model, quantization, paths['embedding'])
+
+    logger.info(f"리랭커 모델 ONNX export 중: {RERANKER_MODEL_NAME}")
+    reranker_model = CrossEncoder(RERANKER_MODEL_NAME, backend='onnx', device='cpu')
+    reranker_model.save_pretrained(paths['reranker'])
+    export_dynamic_quantized_onnx_model(reranker_model, quantization, paths['reranker'])
+
+    logger.info(f"✅ INT8 ONNX 모델 저장 완료: {paths}")
+    return paths
+
+
+def count_rank_changes(pairs: List[List[str]], reference_scores: np.ndarray, candidate_scores: np.ndarray,
+                       top_k: Optional[int] = None) -> Dict[str, int]:
+    """
+    쿼리별로 리랭킹 상위 top_k 순서가 달라진 위치 수를 셉니다.
+
+    리랭킹 순위는 같은 쿼리의 후보끼리만 의미가 있으므로, [쿼리, 문서] 쌍을 쿼리로 묶어 그룹 안에서 비교합니다.
+
+    Returns:
+        Dict: {'rank_changes': 달라진 위치 수 합계, 'queries_changed': 순서가 달라진 쿼리 수}
+    """
+    groups: Dict[str, List[int]] = {}
+    for idx, (query, _) in enumerate(pairs):
+        groups.setdefault(query, []).append(idx)
+
+    rank_changes = 0
+    queries_changed = 0
+    for indices in groups.values():
+        indices = np.asarray(indices)
+        k = min(top_k or len(indices), len(indices))
+        reference_order = indices[np.argsort(-reference_scores[indices], kind='stable')][:k]
+        candidate_order = indices[np.argsort(-candidate_scores[indices], kind='stable')][:k]
+        changed = int(np.sum(reference_order != candidate_order))
+        rank_changes += changed
+        queries_changed += int(changed > 0)
+    return {'rank_changes': rank_changes, 'queries_changed': queries_changed}
+
+
+def check_parity(texts: List[str], pairs: List[List[str]], onnx_dir: Optional[str] = None,
+                 min_cosine: float = 0.98, max_rank_changes: int = 0, top_k: Optional[int] = None) -> Dict:
+    """
+    torch 모델과 onnx 모델의 출력을 비교합니다.
+
+    - 임베딩: 같은 입력에 대한 두 벡터의 코사인 유사도 최솟값이 min_cosine 이상이어야 합니다.
+    - 리랭커: 점수 절대 오차를 보고하고, 쿼리별 상위 top_k 순위가 바뀐 위치 수가 max_rank_changes 이하여야 합니다.
+
+    Args:
+        texts (List[str]): 임베딩 비교용 텍스트
+        pairs (List[List[str]]): 리랭커 비교용 [쿼리, 문서] 쌍
+        onnx_dir (str): export_quantized_onnx_models로 저장한 디렉토리 (없으면 기본 모델 이름 사용)
+        top_k (int): 쿼리별로 비교할 상위 순위 수 (없으면 해당 쿼리의 전체 후보)
+
+    Returns:
+        Dict: 비교 결과 (passed 포함)
+    """
+    embedding_name = os.path.join(onnx_dir, 'embedding') if onnx_dir else None
+    reranker_name = os.path.join(onnx_dir, 'reranker') if onnx_dir else None
+
+    torch_embedder = load_embedding_model(backend='torch')
+    onnx_embedder = load_embedding_model(model_name=embedding_name, backend='onnx')
+    torch_vectors = torch_embedder.encode(texts, normalize_embeddings=True, convert_to_numpy=True)
+    onnx_vectors = onnx_embedder.encode(texts, normalize_embeddings=True, convert_to_numpy=True)
+    cosines = np.sum(torch_vectors * onnx_vectors, axis=1)
+
+    torch_reranker = load_reranker_model(backend='torch')
+    onnx_reranker = load_reranker_model(model_name=reranker_name, backend='onnx')
+    torch_scores = np.asarray(torch_reranker.predict(pairs, show_progress_bar=False))
+    onnx_scores = np.asarray(onnx_reranker.predict(pairs, show_progress_bar=False))
+    ranks = count_rank_changes(pairs, torch_scores, onnx_scores, top_k)
+
+    result = {
+        'embedding_min_cosine': float(cosines.min()),
+        'embedding_mean_cosine': float(cosines.mean()),
+        'reranker_max_abs_diff': float(np.max(np.abs(torch_scores - onnx_scores))),
+        'reranker_rank_changes': ranks['rank_changes'],
+        'reranker_queries_changed': ranks['queries_changed'],
+    }
+    result['passed'] = result['embedding_min_cosine'] >= min_cosine and ranks['rank_changes'] <= max_rank_changes
+    return result
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="임베딩/리랭커 ONNX 추론 백엔드 도구")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="INT8 양자화 ONNX 모델 export")
+    export_parser.add_argument("--output-dir", required=True)
+    export_parser.add_argument("--quantization", default=ONNX_QUANTIZATION)
+
+    parity_parser = subparsers.add_parser("parity", help="torch/onnx 출력 비교")
+    parity_parser.add_argument("--onnx-dir", default=None)
+    parity_parser.add_argument("--min-cosine", type=float, default=0.98)
+    parity_parser.add_argument("--top-k", type=int, default=None, help="쿼리별로 비교할 상위 순위 수")
+
+    args = parser.parse_args()
+
+    if args.command == "export":
+        export_quantized_onnx_models(args.output_dir, args.quantization)
+    else:
+        sample_texts = [
+            "query: 백엔드 개발자 Python",
+            "query: 서울 데이터 엔지니어 Kafka Spark 경력 3년",
+            "query: React를 사용하는 프론트엔드 신입 채용공고",
+        ]
+        sample_pairs = [
+            ["백엔드 개발자 Python", "직무: 백엔드 개발자 | 회사: 테스트 | 주요 업무: Python, Django API 개발"],
+            ["백엔드 개발자 Python", "직무: 프론트엔드 개발자 | 회사: 테스트 | 주요 업무: React UI 개발"],
+            ["데이터 엔지니어", "직무: 데이터 엔지니어 | 주요 업무: Kafka, Spark 파이프라인 구축"],
+            ["데이터 엔지니어", "직무: 콘텐츠 마케터 | 주요 업무: SNS 채널 운영"],
+        ]
+        parity = check_parity(sample_texts, sample_pairs, onnx_dir=args.onnx_dir, min_cosine=args.min_cosine,
+                              top_k=args.top_k)
+        print(parity)
+        if not parity['passed']:
+            raise SystemExit("❌ torch/onnx 출력 차이가 허용 범위를 벗어났습니다.")
+        print("✅ torch/onnx 출력이 허용 범위 내에서 일치합니다.")
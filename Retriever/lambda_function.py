@@ -2,11 +2,19 @@ import json
 import logging
 import os
 import re
-from typing import Dict, List, Tuple, Union
-from opensearchpy import OpenSearch, RequestsHttpConnection
-from requests_aws4auth import AWS4Auth
-import boto3
-from sentence_transformers import SentenceTransformer, CrossEncoder
+import time
+from typing import Dict, List, Optional, Tuple, Union
+import numpy as np
+from inference_backend import load_embedding_model, load_reranker_model
+from query_embedding import QueryEmbeddingService
+from rerank import RerankService
+from vector_codec import decode_vector, encode_vector
+from response_codec import encode_body, negotiate_format
+from opensearch_transport import create_opensearch_client
+from region_codes import region_terms
+from rerank_text import (
+    RERANK_MAX_LENGTH, RERANK_SOURCE_FIELDS, RERANK_TEXT_FIELD, get_rerank_text
+)
 
 # 로깅 설정
 logger = logging.getLogger()
@@ -14,22 +22,80 @@ logger.setLevel(logging.INFO)
 
 # 환경 변수
 OPENSEARCH_HOST = os.environ.get('OPENSEARCH_HOST')
+OPENSEARCH_PORT = int(os.environ.get('OPENSEARCH_PORT', '443'))
 OPENSEARCH_INDEX = os.environ.get('OPENSEARCH_INDEX', 'opensearch_job')
+# 로컬 OpenSearch(벤치마크/개발용)에 붙을 때: OPENSEARCH_AUTH=none, OPENSEARCH_USE_SSL=false
+OPENSEARCH_AUTH = os.environ.get('OPENSEARCH_AUTH', 'sigv4').lower()
+OPENSEARCH_USE_SSL = os.environ.get('OPENSEARCH_USE_SSL', 'true').lower() == 'true'
 AWS_REGION = os.environ.get('AWS_REGION', 'ap-northeast-2')
 
-# HuggingFace 캐시 디렉토리를 /tmp로 설정 (Lambda에서 쓰기 가능한 유일한 디렉토리)
-os.environ['TRANSFORMERS_CACHE'] = '/tmp/transformers_cache'
-os.environ['HF_HOME'] = '/tmp/hf_cache'
-os.environ['SENTENCE_TRANSFORMERS_HOME'] = '/tmp/sentence_transformers_cache'
-os.environ['TORCH_HOME'] = '/tmp/torch_cache'
+# 쿼리 임베딩 캐시/배치 설정
+QUERY_EMBEDDING_CACHE_SIZE = int(os.environ.get('QUERY_EMBEDDING_CACHE_SIZE', '2048'))
+QUERY_EMBEDDING_CACHE_TTL = float(os.environ.get('QUERY_EMBEDDING_CACHE_TTL', '3600'))
+QUERY_EMBEDDING_MAX_BATCH = int(os.environ.get('QUERY_EMBEDDING_MAX_BATCH', '32'))
+QUERY_EMBEDDING_BATCH_WAIT_MS = float(os.environ.get('QUERY_EMBEDDING_BATCH_WAIT_MS', '0'))
 
-# 홈 디렉토리도 /tmp로 변경
-os.environ['HOME'] = '/tmp'
+# 리랭킹 캐시/배치 설정
+RERANK_CACHE_SIZE = int(os.environ.get('RERANK_CACHE_SIZE', '4096'))
+RERANK_CACHE_TTL = float(os.environ.get('RERANK_CACHE_TTL', '1800'))
+RERANK_MAX_BATCH = int(os.environ.get('RERANK_MAX_BATCH', '16'))
+
+# 하이브리드 쿼리 절별 가중치 (eval_retriever.py --sweep 결과를 RETRIEVAL_BOOSTS='{"knn": 2.5}' 형식으로 덮어쓸 수 있음)
+DEFAULT_BOOSTS = {'interest': 3.0, 'tech_stack': 2.5, 'major': 1.5, 'location': 1.2, 'knn': 2.0}
+DEFAULT_BOOSTS.update({k: float(v) for k, v in json.loads(os.environ.get('RETRIEVAL_BOOSTS') or '{}').items()})
+# 임베딩 차원 (intfloat/multilingual-e5-large, 인덱스 매핑의 knn_vector dimension과 같아야 함)
+EMBEDDING_DIM = int(os.environ.get('EMBEDDING_DIM', '1024'))
+# 리랭킹 후보 수 = top_k * RETRIEVAL_POOL_MULTIPLIER
+RETRIEVAL_POOL_MULTIPLIER = int(os.environ.get('RETRIEVAL_POOL_MULTIPLIER', '5'))
+
+# 경력 필터: 색인된 career_min_years/career_max_years range 필터 (재마이그레이션 후 true, 기본값은 career 텍스트 match)
+CAREER_RANGE_FILTER = os.environ.get('CAREER_RANGE_FILTER', 'false').lower() == 'true'
+# 지역 절: 색인된 region_sido/region_sigungu term 필터 (false거나 지역을 해석할 수 없으면 location 텍스트 match)
+REGION_TERM_FILTER = os.environ.get('REGION_TERM_FILTER', 'true').lower() == 'true'
+
+# 검색 모드: bool(BM25+kNN 점수 합산) | hybrid(hybrid 쿼리 + 정규화 파이프라인) | rrf(msearch + 클라이언트 RRF)
+RETRIEVAL_MODE = os.environ.get('RETRIEVAL_MODE', 'bool').lower()
+RETRIEVAL_MODES = ('bool', 'hybrid', 'rrf')
+# hybrid 모드에서 사용할 검색 파이프라인 (DB/opensearch.py create_hybrid_search_pipeline으로 생성)
+HYBRID_SEARCH_PIPELINE = os.environ.get('HYBRID_SEARCH_PIPELINE', 'mmd-hybrid-pipeline')
+# RRF 순위 상수 (클수록 하위 순위의 기여가 커짐)
+RRF_RANK_CONSTANT = int(os.environ.get('RRF_RANK_CONSTANT', '60'))
+
+# 색인된 rerank_text만 조회해 리랭킹 (rerank_text가 없는 이전 색인 문서는 원본 필드를 mget으로 추가 조회)
+RERANK_INDEXED_TEXT = os.environ.get('RERANK_INDEXED_TEXT', 'true').lower() == 'true'
+# 2단계 조회: 후보 검색은 ID/점수/리랭킹 필드만, 최종 top_k 문서는 mget으로 조회
+RETRIEVAL_TWO_PHASE = os.environ.get('RETRIEVAL_TWO_PHASE', 'true').lower() == 'true'
+
+def preload_enabled(environ=os.environ) -> bool:
+    """
+    모듈 임포트 시점(Lambda init 단계)에 모델을 미리 로드할지 여부.
+    기본값은 Lambda에서만 true (백엔드/분류기/테스트가 인프로세스로 임포트할 때는 모델을 로드하지 않음)
+    """
+    default = 'true' if environ.get('AWS_LAMBDA_FUNCTION_NAME') else 'false'
+    return environ.get('RETRIEVER_PRELOAD', default).lower() == 'true'
+
+RETRIEVER_PRELOAD = preload_enabled()
+
+# Lambda 환경에서만 캐시/홈 디렉토리를 변경 (백엔드 프로세스에서 인프로세스로 임포트할 때는 건드리지 않음)
+if os.environ.get('AWS_LAMBDA_FUNCTION_NAME'):
+    # HuggingFace 캐시 디렉토리를 /tmp로 설정 (Lambda에서 쓰기 가능한 유일한 디렉토리)
+    os.environ['TRANSFORMERS_CACHE'] = '/tmp/transformers_cache'
+    os.environ['HF_HOME'] = '/tmp/hf_cache'
+    os.environ['SENTENCE_TRANSFORMERS_HOME'] = '/tmp/sentence_transformers_cache'
+    os.environ['TORCH_HOME'] = '/tmp/torch_cache'
+
+    # 홈 디렉토리도 /tmp로 변경
+    os.environ['HOME'] = '/tmp'
 
 # 전역 변수 (콜드 스타트 최적화)
 _opensearch_client = None
 _embedding_model = None
 _reranker_model = None
+_query_embedder = None
+_rerank_service = None
+
+# init 단계별 소요 시간(초)
+INIT_TIMINGS: Dict[str, float] = {}
 
 def get_opensearch_client():
     """OpenSearch 클라이언트 초기화"""
@@ -40,24 +106,16 @@ def get_opensearch_client():
         if not OPENSEARCH_HOST:
             raise ValueError("OPENSEARCH_HOST 환경변수가 설정되지 않았습니다.")
         
-        # Lambda에서는 자동으로 IAM 역할 자격 증명 사용
-        session = boto3.Session()
-        credentials = session.get_credentials()
-        auth = AWS4Auth(
-            credentials.access_key,
-            credentials.secret_key,
-            AWS_REGION,
-            'es',
-            session_token=credentials.token
-        )
-        
-        _opensearch_client = OpenSearch(
-            hosts=[{'host': OPENSEARCH_HOST, 'port': 443}],
-            http_auth=auth,
-            use_ssl=True,
-            verify_certs=True,
-            connection_class=RequestsHttpConnection,
-            timeout=30
+        # Lambda에서는 실행 역할 자격 증명(자동 갱신) 사용
+        # (백엔드에서 인프로세스로 실행할 때는 OpenSearch 전용 키가 있으면 사용)
+        _opensearch_client = create_opensearch_client(
+            OPENSEARCH_HOST,
+            OPENSEARCH_PORT,
+            auth=OPENSEARCH_AUTH,
+            use_ssl=OPENSEARCH_USE_SSL,
+            region=AWS_REGION,
+            access_key=os.environ.get('AWS_OPENSEARCH_ACCESS_KEY_ID'),
+            secret_key=os.environ.get('AWS_OPENSEARCH_SECRET_ACCESS_KEY')
         )
         logger.info("✅ OpenSearch 클라이언트 초기화 완료")
     
@@ -74,14 +132,26 @@ def get_embedding_model():
         cache_dir = '/tmp/sentence_transformers_cache'
         os.makedirs(cache_dir, exist_ok=True)
         
-        _embedding_model = SentenceTransformer(
-            'intfloat/multilingual-e5-large',
-            cache_folder=cache_dir
-        )
+        # INFERENCE_BACKEND=onnx 이면 INT8 양자화 ONNX 모델을 로드
+        _embedding_model = load_embedding_model(cache_folder=cache_dir)
         logger.info("✅ 임베딩 모델 초기화 완료")
     
     return _embedding_model
 
+def get_query_embedder() -> QueryEmbeddingService:
+    """쿼리 임베딩 서비스 초기화 (LRU+TTL 캐시 + 마이크로 배칭)"""
+    global _query_embedder
+    if _query_embedder is None:
+        _query_embedder = QueryEmbeddingService(
+            model_provider=get_embedding_model,
+            prefix="query: ",
+            cache_size=QUERY_EMBEDDING_CACHE_SIZE,
+            cache_ttl=QUERY_EMBEDDING_CACHE_TTL,
+            max_batch_size=QUERY_EMBEDDING_MAX_BATCH,
+            max_wait_ms=QUERY_EMBEDDING_BATCH_WAIT_MS
+        )
+    return _query_embedder
+
 def get_reranker_model():
     """리랭커 모델 초기화"""
     global _reranker_model
@@ -93,9 +163,8 @@ def get_reranker_model():
         cache_dir = '/tmp/cross_encoder_cache'
         os.makedirs(cache_dir, exist_ok=True)
         
-        _reranker_model = CrossEncoder(
-            'cross-encoder/ms-marco-MiniLM-L-6-v2',
-            max_length=256,
+        _reranker_model = load_reranker_model(
+            max_length=RERANK_MAX_LENGTH,
             device='cpu',
             cache_folder=cache_dir
         )
@@ -103,28 +172,51 @@ def get_reranker_model():
     
     return _reranker_model
 
-def format_document_for_reranking(document: Dict) -> str:
-    """문서를 리랭킹용 텍스트로 포맷팅"""
-    if not document:
-        return ""
-    
-    parts = []
-    
-    # 주요 필드들을 텍스트로 변환
-    if document.get('title'):
-        parts.append(f"직무: {document['title']}")
-    if document.get('company_name'):
-        parts.append(f"회사: {document['company_name']}")
-    if document.get('position_detail'):
-        parts.append(f"포지션 상세: {document['position_detail']}")
-    if document.get('main_tasks') and isinstance(document['main_tasks'], list):
-        parts.append(f"주요 업무: {', '.join(document['main_tasks'])}")
-    if document.get('qualifications') and isinstance(document['qualifications'], list):
-        parts.append(f"자격 요건: {', '.join(document['qualifications'])}")
-    if document.get('location'):
-        parts.append(f"위치: {document['location']}")
-    
-    return " | ".join(parts)
+def get_rerank_service() -> RerankService:
+    """리랭킹 서비스 초기화 (점수 캐시 + 적응형 배치)"""
+    global _rerank_service
+    if _rerank_service is None:
+        _rerank_service = RerankService(
+            model_provider=get_reranker_model,
+            cache_size=RERANK_CACHE_SIZE,
+            cache_ttl=RERANK_CACHE_TTL,
+            max_batch_size=RERANK_MAX_BATCH
+        )
+    return _rerank_service
+
+def initialize(warmup: bool = True) -> Dict[str, float]:
+    """모델을 미리 로드하고 워밍업 추론을 실행합니다. (단계별 소요 시간 반환)"""
+    timings = {}
+    init_start = time.perf_counter()
+
+    stage_start = time.perf_counter()
+    embedding_model = get_embedding_model()
+    timings['embedding_model_load'] = time.perf_counter() - stage_start
+
+    stage_start = time.perf_counter()
+    reranker_model = get_reranker_model()
+    timings['reranker_model_load'] = time.perf_counter() - stage_start
+
+    if OPENSEARCH_HOST:
+        stage_start = time.perf_counter()
+        get_opensearch_client()
+        timings['opensearch_client'] = time.perf_counter() - stage_start
+
+    if warmup:
+        # 첫 요청에서 발생하는 그래프 초기화/메모리 할당 비용을 init 단계로 이동
+        # (쿼리 임베딩 캐시를 오염시키지 않도록 모델을 직접 호출)
+        stage_start = time.perf_counter()
+        embedding_model.encode("query: 백엔드 개발자 Python", show_progress_bar=False)
+        timings['embedding_warmup'] = time.perf_counter() - stage_start
+
+        stage_start = time.perf_counter()
+        reranker_model.predict([["백엔드 개발자", "직무: 백엔드 개발자 | 주요 업무: API 개발"]], show_progress_bar=False)
+        timings['reranker_warmup'] = time.perf_counter() - stage_start
+
+    timings['total'] = time.perf_counter() - init_start
+    INIT_TIMINGS.update(timings)
+    logger.info(f"✅ Retriever 초기화 완료: {', '.join(f'{k}={v:.2f}s' for k, v in timings.items())}")
+    return timings
 
 def _get_years_from_career(career: str) -> int:
     """'n년', 'n 년' 형식에서 숫자 n을 추출합니다."""
@@ -140,6 +232,8 @@ def _build_career_filter(career: str) -> Union[dict, None]:
         return None
 
     user_years = _get_years_from_career(career)
+    if CAREER_RANGE_FILTER:
+        return _build_career_range_filter(career, user_years)
 
     # CASE 1: 사용자가 '신입'이거나 경력에 숫자가 없는 경우
     if user_years == 0 and ("신입" in career or "무관" in career):
@@ -173,10 +267,111 @@ def _build_career_filter(career: str) -> Union[dict, None]:
     # 위 조건에 해당하지 않으면 필터를 적용하지 않음
     return None
 
-def build_search_query(user_profile: Dict, top_k: int = 5, exclude_ids: list = None) -> Dict:
-    """업그레이드된 하이브리드 검색 쿼리 생성"""
-    if exclude_ids is None:
-        exclude_ids = []
+def _build_career_range_filter(career: str, user_years: int) -> Union[dict, None]:
+    """
+    정규화된 경력 범위 필드로 filter 절을 생성합니다. (마이그레이션의 job_normalizer가 색인)
+
+    공고의 [career_min_years, career_max_years] 범위에 사용자 년차가 포함되는 공고만 남깁니다.
+    점수 없는 range 필터라 필터 캐시를 타고, kNN 사전 필터로도 저렴하게 적용됩니다.
+    경력 필드가 없는 공고(재마이그레이션 전 문서, career를 해석할 수 없는 공고)는 걸러내지 않습니다.
+    """
+    # 신입: 신입을 받는 공고 ('경력무관'/'신입·경력' 포함)
+    if user_years == 0 and ("신입" in career or "무관" in career):
+        return _or_unnormalized_career({"term": {"career_new_grad": True}})
+
+    if user_years > 0:
+        return _or_unnormalized_career({
+            "bool": {
+                "filter": [
+                    {"range": {"career_min_years": {"lte": user_years}}},
+                    {"range": {"career_max_years": {"gte": user_years}}}
+                ]
+            }
+        })
+
+    return None
+
+def _or_unnormalized_career(clause: dict) -> dict:
+    """경력 조건을 만족하거나 정규화된 경력 필드가 없는 공고 (job_normalizer는 세 필드를 함께 색인)"""
+    return {
+        "bool": {
+            "should": [
+                clause,
+                {"bool": {"must_not": {"exists": {"field": "career_min_years"}}}}
+            ],
+            "minimum_should_match": 1
+        }
+    }
+
+def _build_location_clause(location: str, boost: float, name: Dict = None) -> Union[dict, None]:
+    """
+    희망 근무지역 절을 생성합니다.
+
+    지역 코드로 해석되면 region_sido/region_sigungu term 필터를 constant_score로 감싸 일치 시 boost만큼 가산하고
+    (BM25 계산 없이 필터 캐시 사용), 해석되지 않으면 기존처럼 location 텍스트 match를 사용합니다.
+    """
+    if not location:
+        return None
+    name = name or {}
+
+    sido_codes, sigungu_codes = region_terms(location) if REGION_TERM_FILTER else ([], [])
+    region_filters = []
+    if sido_codes:
+        region_filters.append({"terms": {"region_sido": sido_codes}})
+    if sigungu_codes:
+        region_filters.append({"terms": {"region_sigungu": sigungu_codes}})
+    if not region_filters:
+        return {"match": {"location": {"query": location, "boost": boost, **name}}}
+
+    region_filter = region_filters[0] if len(region_filters) == 1 else {"bool": {"should": region_filters, "minimum_should_match": 1}}
+    return {"constant_score": {"filter": region_filter, "boost": boost, **name}}
+
+def _build_company_filter(company_names: List[str]) -> Union[dict, None]:
+    """회사명 리스트 중 하나와 일치하는 공고만 남기는 filter 절을 생성합니다."""
+    if not company_names:
+        return None
+
+    return {
+        "bool": {
+            "should": [{"match_phrase": {"company_name": name}} for name in company_names],
+            "minimum_should_match": 1
+        }
+    }
+
+def compute_query_vector(user_profile: Dict) -> np.ndarray:
+    """kNN 검색에 사용할 쿼리 벡터를 계산합니다. (동일 쿼리는 캐시에서 재사용)"""
+    hyde_query = user_profile.get("hyde_query", "")
+    # HyDE 가상 공고가 있으면 kNN 쿼리로 사용: 색인 시 문서와 같은 "[document] ..." 형식이므로 "query: " 접두어 없이 인코딩
+    if hyde_query:
+        return get_query_embedder().encode(hyde_query, prefix="")
+    return get_query_embedder().encode(user_profile.get("candidate_question", ""))
+
+def resolve_query_vector(user_profile: Dict, encoded_vector: Optional[str] = None, dtype: str = "float16") -> np.ndarray:
+    """
+    호출자가 보낸 base64 쿼리 벡터를 복원합니다.
+    벡터가 없거나 복원/차원 검증에 실패하면 직접 인코딩합니다.
+
+    차원은 EMBEDDING_DIM과 비교합니다. (검증만을 위해 임베딩 모델을 로드하지 않도록,
+    모델 차원은 이미 로드된 경우에만 사용)
+    """
+    if encoded_vector:
+        try:
+            vector = decode_vector(encoded_vector, dtype)
+            expected_dim = EMBEDDING_DIM
+            if _embedding_model is not None:
+                expected_dim = _embedding_model.get_sentence_embedding_dimension() or EMBEDDING_DIM
+            if len(vector) == expected_dim:
+                return vector
+            logger.warning(f"전달된 쿼리 벡터 차원({len(vector)})이 모델 차원({expected_dim})과 달라 다시 인코딩합니다.")
+        except ValueError as e:
+            logger.warning(f"전달된 쿼리 벡터를 복원하지 못해 다시 인코딩합니다: {e}")
+    return compute_query_vector(user_profile)
+
+def _build_query_parts(user_profile: Dict, exclude_ids: list = None, query_vector: np.ndarray = None,
+                       boosts: Dict[str, float] = None, named_clauses: bool = False) -> Dict:
+    """검색 모드(bool / hybrid / rrf)가 공유하는 텍스트 절, kNN 벡터, 필터 절을 생성합니다."""
+    boosts = {**DEFAULT_BOOSTS, **(boosts or {})}
+    names = {name: {'_name': name} if named_clauses else {} for name in DEFAULT_BOOSTS}
 
     # 사용자 입력 파싱
     major = user_profile.get("candidate_major", "")
@@ -184,11 +379,12 @@ def build_search_query(user_profile: Dict, top_k: int = 5, exclude_ids: list = N
     career = user_profile.get("candidate_career", "")
     tech_stack = " ".join(user_profile.get("candidate_tech_stack", []))
     location = user_profile.get("candidate_location", "")
-    query_text = user_profile.get("candidate_question", "")
+    company_names = [name for name in user_profile.get("company_name_filter") or [] if name]
     
-    # 임베딩 벡터 생성
-    embedding_model = get_embedding_model()
-    query_vector = embedding_model.encode(f"query: {query_text}").tolist()
+    # 임베딩 벡터 (호출자가 미리 계산한 벡터가 없으면 인코딩)
+    if query_vector is None:
+        query_vector = compute_query_vector(user_profile)
+    query_vector = np.asarray(query_vector, dtype=np.float32).tolist()
     
     # 제외할 문서 ID 처리
     must_not_clauses = []
@@ -201,54 +397,215 @@ def build_search_query(user_profile: Dict, top_k: int = 5, exclude_ids: list = N
     if career_filter:
         filter_clauses.append(career_filter)
     
-    # 하이브리드 검색 쿼리
-    search_query = {
+    # 회사명 필터 (HyDE 단계에서 추출/확장된 회사명 중 하나와 일치)
+    company_filter = _build_company_filter(company_names)
+    if company_filter:
+        filter_clauses.append(company_filter)
+    
+    # 텍스트 매칭 절 (None 값 제거)
+    text_clauses = [
+        {"multi_match": {"query": interest, "fields": ["job_name^3", "title^2", "position_detail"], "boost": boosts['interest'], **names['interest']}},
+        {"multi_match": {"query": tech_stack, "fields": ["position_detail", "preferred_qualifications", "qualifications"], "boost": boosts['tech_stack'], **names['tech_stack']}},
+        {"multi_match": {"query": f"{major}", "fields": ["qualifications", "preferred_qualifications"], "boost": boosts['major'], **names['major']}},
+        _build_location_clause(location, boosts['location'], names['location']),
+    ]
+    
+    return {
+        'text_clauses': [q for q in text_clauses if q is not None],
+        'knn': {"vector": query_vector, "boost": boosts['knn'], **names['knn']},
+        'filter': filter_clauses,
+        'must_not': must_not_clauses
+    }
+
+def _source_spec(source_fields: List[str] = None) -> Dict:
+    """검색 요청의 _source 설정"""
+    return {"includes": source_fields} if source_fields else {"excludes": ["content_embedding"]}
+
+def _knn_filter(parts: Dict) -> Dict:
+    """필터/제외 ID를 kNN 내부 filter로 전달 (lucene 엔진이 조건을 만족하는 문서 안에서만 최근접 k개 탐색)"""
+    if not parts['filter'] and not parts['must_not']:
+        return {}
+    return {"filter": {"bool": {"filter": parts['filter'], "must_not": parts['must_not']}}}
+
+def _lexical_subquery(parts: Dict) -> Dict:
+    """필터가 적용된 텍스트(BM25) 하위 쿼리"""
+    return {"bool": {"should": parts['text_clauses'], "filter": parts['filter'],
+                     "must_not": parts['must_not'], "minimum_should_match": 1}}
+
+def _knn_subquery(parts: Dict, k: int) -> Dict:
+    """필터를 kNN 내부 filter로 넣은 벡터 하위 쿼리 (boost 없이 유사도 점수 그대로)"""
+    knn_spec = {key: value for key, value in parts['knn'].items() if key != 'boost'}
+    return {"knn": {"content_embedding": {**knn_spec, **_knn_filter(parts), "k": k}}}
+
+def build_search_query(user_profile: Dict, top_k: int = 5, exclude_ids: list = None, query_vector: np.ndarray = None,
+                       source_fields: List[str] = None, boosts: Dict[str, float] = None,
+                       named_clauses: bool = False) -> Dict:
+    """
+    업그레이드된 하이브리드 검색 쿼리 생성 (source_fields가 주어지면 해당 _source 필드만 조회)
+
+    boosts로 절별 가중치(DEFAULT_BOOSTS 키)를 덮어쓸 수 있고, named_clauses=True면 각 절에 _name을 붙여
+    include_named_queries_score 응답에서 절별 점수를 받을 수 있게 합니다.
+    """
+    parts = _build_query_parts(user_profile, exclude_ids, query_vector, boosts, named_clauses)
+    
+    # 하이브리드 검색 쿼리 (텍스트 BM25 점수와 벡터 점수를 합산)
+    return {
         "query": {
             "bool": {
-                "should": [
-                    # 텍스트 매칭
-                    {"multi_match": {"query": interest, "fields": ["job_name^3", "title^2", "position_detail"], "boost": 3.0}},
-                    {"multi_match": {"query": tech_stack, "fields": ["position_detail", "preferred_qualifications", "qualifications"], "boost": 2.5}},
-                    {"multi_match": {"query": f"{major}", "fields": ["qualifications", "preferred_qualifications"], "boost": 1.5}},
-                    {"match": {"location": {"query": location, "boost": 1.2}}} if location else None,
-                    # 벡터 검색
-                    {"knn": {"content_embedding": {"vector": query_vector, "k": top_k * 2, "boost": 2.0}}}
+                "should": parts['text_clauses'] + [
+                    # 벡터 검색 (필터를 kNN 내부에도 적용해 바깥 filter에 걸러질 이웃을 탐색하지 않음)
+                    {"knn": {"content_embedding": {**parts['knn'], **_knn_filter(parts), "k": top_k * 2}}}
                 ],
-                "filter": filter_clauses,
-                "must_not": must_not_clauses,
+                "filter": parts['filter'],
+                "must_not": parts['must_not'],
                 "minimum_should_match": 1
             }
         },
         "size": top_k,
-        "_source": {"excludes": ["content_embedding"]}
+        "_source": _source_spec(source_fields)
+    }
+
+def build_hybrid_query(user_profile: Dict, top_k: int = 5, exclude_ids: list = None, query_vector: np.ndarray = None,
+                       source_fields: List[str] = None, boosts: Dict[str, float] = None) -> Dict:
+    """
+    OpenSearch hybrid 쿼리 생성 (RETRIEVAL_MODE=hybrid)
+
+    텍스트 bool 쿼리와 kNN 쿼리를 각각 하위 쿼리로 실행하고, 검색 파이프라인(HYBRID_SEARCH_PIPELINE)의
+    normalization-processor가 두 점수를 정규화해 가중 결합합니다. 필터는 두 하위 쿼리에 모두 적용합니다.
+    (kNN 절 boost 대신 파이프라인 weights가 벡터 비중을 결정)
+    """
+    parts = _build_query_parts(user_profile, exclude_ids, query_vector, boosts)
+    return {
+        "query": {"hybrid": {"queries": [_lexical_subquery(parts), _knn_subquery(parts, top_k)]}},
+        "size": top_k,
+        "_source": _source_spec(source_fields)
     }
+
+def build_rrf_queries(user_profile: Dict, top_k: int = 5, exclude_ids: list = None, query_vector: np.ndarray = None,
+                      source_fields: List[str] = None, boosts: Dict[str, float] = None) -> List[Dict]:
+    """RRF용 텍스트 / kNN 검색 쿼리 쌍 생성 (RETRIEVAL_MODE=rrf, 각 top_k개, 같은 필터 적용)"""
+    parts = _build_query_parts(user_profile, exclude_ids, query_vector, boosts)
+    return [
+        {"query": subquery, "size": top_k, "_source": _source_spec(source_fields)}
+        for subquery in (_lexical_subquery(parts), _knn_subquery(parts, top_k))
+    ]
+
+def reciprocal_rank_fusion(hit_lists: List[List[Dict]], size: int, rank_constant: int = None) -> List[Dict]:
+    """
+    여러 검색 결과를 순위 기반으로 결합합니다. score(d) = Σ 1 / (rank_constant + rank)
+
+    점수 척도가 다른 BM25/kNN 결과를 정규화 없이 합칠 수 있습니다. 반환 hit의 _score는 RRF 점수입니다.
+    """
+    rank_constant = RRF_RANK_CONSTANT if rank_constant is None else rank_constant
+    fused_scores = {}
+    fused_hits = {}
+    for hits in hit_lists:
+        for rank, hit in enumerate(hits, start=1):
+            doc_id = hit.get('_id', '')
+            fused_scores[doc_id] = fused_scores.get(doc_id, 0.0) + 1.0 / (rank_constant + rank)
+            fused_hits.setdefault(doc_id, hit)
+    ranked = sorted(fused_scores.items(), key=lambda item: -item[1])[:size]
+    return [{**fused_hits[doc_id], '_score': score} for doc_id, score in ranked]
+
+def execute_search(user_profile: Dict, top_k: int, exclude_ids: list = None, query_vector: np.ndarray = None,
+                   source_fields: List[str] = None, boosts: Dict[str, float] = None,
+                   mode: str = None) -> List[Dict]:
+    """
+    검색 모드에 맞춰 쿼리를 생성/실행하고 hit 목록을 반환합니다. (모든 모드 1회 왕복)
+
+    - bool: BM25 절과 kNN 절 점수를 bool.should로 합산 (기존 방식)
+    - hybrid: hybrid 쿼리 + 정규화 검색 파이프라인 (OpenSearch 2.10+, neural-search 플러그인)
+    - rrf: 텍스트/kNN 쿼리를 msearch 한 번으로 보내고 클라이언트에서 RRF로 결합
+    """
+    mode = (mode or RETRIEVAL_MODE).lower()
+    client = get_opensearch_client()
+    
+    if mode == 'hybrid':
+        search_query = build_hybrid_query(user_profile, top_k, exclude_ids, query_vector=query_vector,
+                                          source_fields=source_fields, boosts=boosts)
+        response = client.search(index=OPENSEARCH_INDEX, body=search_query,
+                                 params={'search_pipeline': HYBRID_SEARCH_PIPELINE})
+        return response.get("hits", {}).get("hits", [])
     
-    # None 값 제거
-    search_query["query"]["bool"]["should"] = [q for q in search_query["query"]["bool"]["should"] if q is not None]
+    if mode == 'rrf':
+        queries = build_rrf_queries(user_profile, top_k, exclude_ids, query_vector=query_vector,
+                                    source_fields=source_fields, boosts=boosts)
+        msearch_body = []
+        for query in queries:
+            msearch_body.extend([{'index': OPENSEARCH_INDEX}, query])
+        responses = client.msearch(body=msearch_body).get('responses', [])
+        for response in responses:
+            if response.get('error'):
+                raise RuntimeError(f"msearch 하위 쿼리 실패: {response['error']}")
+        return reciprocal_rank_fusion([r.get("hits", {}).get("hits", []) for r in responses], top_k)
     
-    return search_query
+    if mode != 'bool':
+        raise ValueError(f"지원하지 않는 검색 모드입니다: {mode} (지원: {', '.join(RETRIEVAL_MODES)})")
+    search_query = build_search_query(user_profile, top_k, exclude_ids, query_vector=query_vector,
+                                      source_fields=source_fields, boosts=boosts)
+    response = client.search(index=OPENSEARCH_INDEX, body=search_query)
+    return response.get("hits", {}).get("hits", [])
+
+def _rerank_source_fields() -> List[str]:
+    """리랭킹 단계에서 조회할 _source 필드"""
+    return [RERANK_TEXT_FIELD] if RERANK_INDEXED_TEXT else RERANK_SOURCE_FIELDS + [RERANK_TEXT_FIELD]
 
-def hybrid_search(user_profile: Dict, top_k: int = 5, exclude_ids: list = None, use_reranker: bool = True) -> Tuple[List[float], List[str], List[Dict]]:
-    """하이브리드 검색 + 리랭킹 실행"""
+def _fill_missing_rerank_sources(hits: List[Dict]) -> List[Dict]:
+    """
+    rerank_text가 없는 후보(재마이그레이션 전 색인 문서)의 원본 필드를 mget으로 채웁니다.
+    RERANK_INDEXED_TEXT=true여도 이전 문서가 빈 텍스트로 리랭킹되지 않도록 get_rerank_text가 텍스트를 만들 수 있게 합니다.
+    """
+    if not RERANK_INDEXED_TEXT:
+        return hits
+    missing = [hit.get('_id', '') for hit in hits if not hit.get('_source', {}).get(RERANK_TEXT_FIELD)]
+    if not missing:
+        return hits
+
+    logger.info(f"rerank_text가 없는 후보 {len(missing)}개의 원본 필드 조회")
+    fetched = get_documents(missing, RERANK_SOURCE_FIELDS)
+    sources = dict(zip(fetched['doc_ids'], fetched['documents']))
+    for hit in hits:
+        if hit.get('_id') in sources:
+            hit['_source'] = {**hit.get('_source', {}), **sources[hit['_id']]}
+    return hits
+
+def _project_fields(document: Dict, fields: List[str] = None) -> Dict:
+    """문서에서 요청된 필드만 남깁니다. (전체 문서 요청 시에도 내부용 rerank_text는 제외)"""
+    if not fields:
+        return {key: value for key, value in document.items() if key != RERANK_TEXT_FIELD}
+    return {key: document[key] for key in fields if key in document}
+
+def _rerank_query(user_profile: Dict) -> str:
+    """리랭킹용 쿼리 텍스트"""
+    return f"{user_profile.get('candidate_interest', '')} {user_profile.get('candidate_question', '')}"
+
+def hybrid_search(user_profile: Dict, top_k: int = 5, exclude_ids: list = None, use_reranker: bool = True,
+                  query_vector: np.ndarray = None, fields: List[str] = None, boosts: Dict[str, float] = None,
+                  pool_size: int = None, retrieval_mode: str = None) -> Tuple[List[float], List[str], List[Dict]]:
+    """
+    하이브리드 검색 + 리랭킹 실행
+    (query_vector가 주어지면 쿼리 인코딩 생략, fields가 주어지면 반환 문서를 해당 필드로 프로젝션,
+     boosts/pool_size/retrieval_mode가 주어지면 절별 가중치/리랭킹 후보 수/검색 모드를 덮어씀)
+    """
     
     try:
         # 1단계: 더 많은 후보 검색 (리랭킹을 위해)
-        retrieval_k = top_k * 5 if use_reranker else top_k
+        retrieval_k = (pool_size or top_k * RETRIEVAL_POOL_MULTIPLIER) if use_reranker else top_k
         if exclude_ids is None:
             exclude_ids = []
-        search_query = build_search_query(user_profile, retrieval_k, exclude_ids)
+        # 2단계 조회면 후보 검색에서는 리랭킹 필드만 받고, 리랭킹을 통과한 top_k 문서만 mget으로 조회
+        two_phase = use_reranker and RETRIEVAL_TWO_PHASE
+        source_fields = None
+        if two_phase:
+            source_fields = _rerank_source_fields()
+        elif fields:
+            source_fields = sorted(set(fields) | set(_rerank_source_fields())) if use_reranker else list(fields)
         
-        logger.info(f"🔍 1단계: OpenSearch에서 {retrieval_k}개 후보 검색 중...")
+        logger.info(f"🔍 1단계: OpenSearch에서 {retrieval_k}개 후보 검색 중... (모드: {retrieval_mode or RETRIEVAL_MODE})")
         
-        # OpenSearch 검색 실행
-        client = get_opensearch_client()
-        response = client.search(
-            index=OPENSEARCH_INDEX,
-            body=search_query
-        )
-        
-        # 초기 검색 결과
-        initial_hits = response.get("hits", {}).get("hits", [])
+        # OpenSearch 검색 실행 (초기 검색 결과)
+        initial_hits = execute_search(user_profile, retrieval_k, exclude_ids, query_vector=query_vector,
+                                      source_fields=source_fields, boosts=boosts, mode=retrieval_mode)
         if not initial_hits:
             logger.info("검색 결과가 없습니다.")
             return [], [], []
@@ -259,36 +616,32 @@ def hybrid_search(user_profile: Dict, top_k: int = 5, exclude_ids: list = None,
             # 리랭킹 없이 바로 반환
             scores = [hit.get("_score", 0.0) for hit in initial_hits]
             doc_ids = [hit.get("_id", "") for hit in initial_hits]
-            documents = [hit.get("_source", {}) for hit in initial_hits]
+            documents = [_project_fields(hit.get("_source", {}), fields) for hit in initial_hits]
             return scores, doc_ids, documents
         
         # 2단계: 리랭킹
         logger.info("🔄 2단계: 리랭킹 진행 중...")
         
-        reranker = get_reranker_model()
-        
         # 리랭킹용 쿼리 생성
-        query_for_rerank = f"{user_profile.get('candidate_interest', '')} {user_profile.get('candidate_question', '')}"
-        
-        # [쿼리, 문서] 쌍 생성
-        sentence_pairs = []
-        for hit in initial_hits:
-            document_text = format_document_for_reranking(hit.get('_source', {}))
-            sentence_pairs.append([query_for_rerank, document_text])
+        query_for_rerank = _rerank_query(user_profile)
+        _fill_missing_rerank_sources(initial_hits)
         
-        # 리랭킹 점수 계산 (배치 크기 4로 메모리 절약)
-        rerank_scores = reranker.predict(sentence_pairs, show_progress_bar=False, batch_size=4)
-        
-        # 점수와 문서를 묶어서 정렬
-        scored_hits = list(zip(rerank_scores, initial_hits))
-        scored_hits.sort(key=lambda x: x[0], reverse=True)
+        # 리랭킹 점수 계산 (캐시된 점수는 재사용, 배치 크기는 후보 수에 맞춰 결정)
+        ranked = get_rerank_service().rerank(
+            query_for_rerank,
+            doc_ids=[hit.get("_id", "") for hit in initial_hits],
+            get_text=lambda idx: get_rerank_text(initial_hits[idx].get('_source', {})),
+            top_k=top_k
+        )
         
         # 최종 top_k개 선택
-        final_results = scored_hits[:top_k]
+        final_results = [(score, initial_hits[idx]) for idx, score in ranked]
         
         scores = [float(score) for score, hit in final_results]
         doc_ids = [hit.get("_id", "") for score, hit in final_results]
-        documents = [hit.get("_source", {}) for score, hit in final_results]
+        if two_phase:
+            return _fetch_final_documents(scores, doc_ids, fields)
+        documents = [_project_fields(hit.get("_source", {}), fields) for score, hit in final_results]
         
         logger.info(f"✅ 2단계 완료: 최종 {len(scores)}개 결과 반환")
         return scores, doc_ids, documents
@@ -297,46 +650,208 @@ def hybrid_search(user_profile: Dict, top_k: int = 5, exclude_ids: list = None,
         logger.error(f"❌ 하이브리드 검색 실패: {e}")
         return [], [], []
 
+def _fetch_final_documents(scores: List[float], doc_ids: List[str],
+                           fields: List[str] = None) -> Tuple[List[float], List[str], List[Dict]]:
+    """2단계 조회: 최종 top_k 문서만 mget으로 가져옵니다. (단계 사이에 삭제된 문서는 결과에서 제외)"""
+    fetched = get_documents(doc_ids, fields)
+    documents_by_id = dict(zip(fetched['doc_ids'], fetched['documents']))
+    results = [(score, doc_id) for score, doc_id in zip(scores, doc_ids) if doc_id in documents_by_id]
+    logger.info(f"✅ 3단계 완료: 최종 {len(results)}개 문서 조회")
+    return (
+        [score for score, _ in results],
+        [doc_id for _, doc_id in results],
+        [documents_by_id[doc_id] for _, doc_id in results]
+    )
+
+def get_candidate_pool(user_profile: Dict, pool_size: int = 50, exclude_ids: list = None,
+                       query_vector: np.ndarray = None) -> Dict:
+    """
+    가중치 스윕용 후보 풀을 조회합니다. (eval_retriever.py --sweep)
+
+    모든 절 가중치를 1.0으로 두고 pool_size개 후보를 검색한 뒤, 후보별 절 점수(named query 점수)와
+    리랭커 점수를 함께 반환합니다. 호출자는 이를 재사용해 가중치/후보 수 조합을 오프라인으로 다시 채점합니다.
+    (절별 점수는 OpenSearch 2.13+의 include_named_queries_score가 필요)
+    """
+    timings = {}
+    stage_start = time.perf_counter()
+    if query_vector is None:
+        query_vector = compute_query_vector(user_profile)
+    timings['encode_ms'] = (time.perf_counter() - stage_start) * 1000
+
+    unit_boosts = {name: 1.0 for name in DEFAULT_BOOSTS}
+    search_query = build_search_query(user_profile, pool_size, exclude_ids, query_vector=query_vector,
+                                      source_fields=_rerank_source_fields(), boosts=unit_boosts, named_clauses=True)
+    stage_start = time.perf_counter()
+    response = get_opensearch_client().search(
+        index=OPENSEARCH_INDEX,
+        body=search_query,
+        params={'include_named_queries_score': 'true'}
+    )
+    timings['search_ms'] = (time.perf_counter() - stage_start) * 1000
+    hits = _fill_missing_rerank_sources(response.get("hits", {}).get("hits", []))
+
+    # 풀 전체를 리랭킹 (캐시되지 않은 후보만 모델 추론)
+    stage_start = time.perf_counter()
+    ranked = get_rerank_service().rerank(
+        _rerank_query(user_profile),
+        doc_ids=[hit.get("_id", "") for hit in hits],
+        get_text=lambda idx: get_rerank_text(hits[idx].get('_source', {})),
+        top_k=len(hits)
+    ) if hits else []
+    timings['rerank_ms'] = (time.perf_counter() - stage_start) * 1000
+    rerank_scores = dict(ranked)
+
+    candidates = []
+    for idx, hit in enumerate(hits):
+        matched = hit.get('matched_queries') or {}
+        candidates.append({
+            'doc_id': hit.get('_id', ''),
+            'score': hit.get('_score', 0.0),
+            # include_named_queries_score를 지원하지 않는 클러스터는 이름 리스트만 반환 (점수는 일치 여부 1.0)
+            'clause_scores': matched if isinstance(matched, dict) else {name: 1.0 for name in matched},
+            'rerank_score': rerank_scores.get(idx)
+        })
+
+    return {
+        'candidates': candidates,
+        'default_boosts': DEFAULT_BOOSTS,
+        'pool_multiplier': RETRIEVAL_POOL_MULTIPLIER,
+        'timings': timings
+    }
+
+def get_documents(doc_ids: List[str], fields: List[str] = None) -> Dict:
+    """문서 ID로 전체 문서를 조회합니다. (후보 선택 시 전체 공고를 지연 조회)"""
+    if not doc_ids:
+        return {'doc_ids': [], 'documents': []}
+
+    client = get_opensearch_client()
+    params = {'_source_includes': ','.join(fields)} if fields else {'_source_excludes': f'content_embedding,{RERANK_TEXT_FIELD}'}
+    response = client.mget(index=OPENSEARCH_INDEX, body={'ids': doc_ids}, params=params)
+
+    found = {doc['_id']: doc.get('_source', {}) for doc in response.get('docs', []) if doc.get('found')}
+    return {
+        'doc_ids': [doc_id for doc_id in doc_ids if doc_id in found],
+        'documents': [found[doc_id] for doc_id in doc_ids if doc_id in found]
+    }
+
+def _parse_bool(value, default: bool = False) -> bool:
+    """요청 본문의 boolean 값 (HTTP 사이드카/쿼리스트링 클라이언트가 보낸 "false" 문자열 포함)"""
+    if value is None:
+        return default
+    return str(value).lower() in ('1', 'true', 'yes')
+
+def run_search(body: Dict) -> Dict:
+    """
+    검색 요청 본문을 처리해 응답 데이터를 반환합니다. (lambda_handler와 인프로세스 호출이 공유)
+
+    요청 본문 필드:
+        user_profile (dict): 사용자 프로필 (필수)
+        top_k (int): 반환할 결과 수
+        exclude_ids (list): 제외할 문서 ID
+        query_vector (str): 미리 계산한 쿼리 벡터 (base64, 있으면 쿼리 인코딩 생략)
+        query_vector_dtype (str): query_vector의 dtype (float16 | float32, 기본값 float16)
+        return_query_vector (bool): 사용한 쿼리 벡터를 응답에 포함할지 여부 (float16 base64)
+        fields (list): 반환할 _source 필드 (없으면 전체)
+        boosts (dict): 절별 가중치 덮어쓰기 (DEFAULT_BOOSTS 키, 실험용)
+        pool_size (int): 리랭킹 후보 수 덮어쓰기 (실험용)
+        retrieval_mode (str): 검색 모드 덮어쓰기 (bool | hybrid | rrf, 실험용)
+        use_reranker (bool): 리랭킹 사용 여부 (기본값 true)
+    """
+    user_profile = body.get('user_profile', {})
+    top_k = int(body.get('top_k', 5))
+    exclude_ids = body.get('exclude_ids', [])
+    vector_dtype = body.get('query_vector_dtype', 'float16')
+    # hybrid_search는 검색 오류를 빈 결과로 처리하므로, 잘못된 모드는 검색 전에 거부 (lambda_handler에서 400)
+    retrieval_mode = body.get('retrieval_mode')
+    if retrieval_mode is not None and str(retrieval_mode).lower() not in RETRIEVAL_MODES:
+        raise ValueError(f"지원하지 않는 검색 모드입니다: {retrieval_mode} (지원: {', '.join(RETRIEVAL_MODES)})")
+    
+    query_vector = resolve_query_vector(user_profile, body.get('query_vector'), vector_dtype)
+    scores, doc_ids, documents = hybrid_search(
+        user_profile=user_profile,
+        top_k=top_k,
+        exclude_ids=exclude_ids,
+        query_vector=query_vector,
+        fields=body.get('fields'),
+        use_reranker=_parse_bool(body.get('use_reranker'), default=True),
+        boosts=body.get('boosts'),
+        pool_size=int(body['pool_size']) if body.get('pool_size') else None,
+        retrieval_mode=retrieval_mode
+    )
+    
+    response_data = {
+        'scores': scores,
+        'doc_ids': doc_ids,
+        'documents': documents
+    }
+    if _parse_bool(body.get('return_query_vector')):
+        response_data['query_vector'] = encode_vector(query_vector, 'float16')
+        response_data['query_vector_dtype'] = 'float16'
+    return response_data
+
+def run_candidate_pool(body: Dict) -> Dict:
+    """후보 풀 요청 본문(operation: candidate_pool)을 처리합니다."""
+    user_profile = body.get('user_profile')
+    if not user_profile:
+        raise ValueError('user_profile이 필요합니다')
+    query_vector = resolve_query_vector(user_profile, body.get('query_vector'), body.get('query_vector_dtype', 'float16'))
+    return get_candidate_pool(user_profile, int(body.get('pool_size', 50)), body.get('exclude_ids', []), query_vector)
+
+def _build_response(status_code: int, data: Dict, response_format: str = 'json', compression: str = None) -> Dict:
+    """Lambda 응답 envelope를 생성합니다."""
+    body, headers, is_base64 = encode_body(data, response_format, compression)
+    return {
+        'statusCode': status_code,
+        'headers': headers,
+        'body': body,
+        'isBase64Encoded': is_base64
+    }
+
 def lambda_handler(event, context):
     """Lambda 핸들러"""
     try:
+        # 스케줄러 워밍업 요청: 검색 없이 모델 로드 상태만 보장
+        if event.get('type') == 'warmup':
+            if not INIT_TIMINGS:
+                initialize()
+            return _build_response(200, {'status': 'warm', 'init_timings': INIT_TIMINGS})
+        
         # 요청 데이터 파싱
         body = json.loads(event.get('body', '{}'))
-        user_profile = body.get('user_profile', {})
-        top_k = int(body.get('top_k', 5))
-        exclude_ids = body.get('exclude_ids', [])
         
-        if not user_profile:
-            return {
-                'statusCode': 400,
-                'headers': {'Content-Type': 'application/json'},
-                'body': json.dumps({'error': 'user_profile이 필요합니다'}, ensure_ascii=False)
-            }
+        # 응답 형식 협상 (msgpack / orjson / json, 선택적으로 zstd 압축)
+        response_format = negotiate_format(body.get('response_format'))
+        compression = body.get('compression')
         
-        # 하이브리드 검색 실행
-        scores, doc_ids, documents = hybrid_search(
-            user_profile=user_profile,
-            top_k=top_k,
-            exclude_ids=exclude_ids
-        )
+        # 선택된 공고의 전체 문서 지연 조회
+        if body.get('operation') == 'get_documents':
+            response_data = get_documents(body.get('doc_ids', []), body.get('fields'))
+            return _build_response(200, response_data, response_format, compression)
         
-        # 응답 반환
-        response_data = {
-            'scores': scores,
-            'doc_ids': doc_ids,
-            'documents': documents
-        }
+        # 가중치 스윕용 후보 풀 (절별 점수 + 리랭커 점수)
+        if body.get('operation') == 'candidate_pool':
+            response_data = run_candidate_pool(body)
+            return _build_response(200, response_data, response_format, compression)
         
-        return {
-            'statusCode': 200,
-            'headers': {'Content-Type': 'application/json'},
-            'body': json.dumps(response_data, ensure_ascii=False)
-        }
+        if not body.get('user_profile'):
+            return _build_response(400, {'error': 'user_profile이 필요합니다'})
         
+        # 하이브리드 검색 실행
+        response_data = run_search(body)
+        
+        return _build_response(200, response_data, response_format, compression)
+        
+    except ValueError as e:
+        logger.error(f"❌ 잘못된 요청: {e}")
+        return _build_response(400, {'error': str(e)})
     except Exception as e:
         logger.error(f"❌ Lambda 실행 오류: {e}")
-        return {
-            'statusCode': 500,
-            'headers': {'Content-Type': 'application/json'},
-            'body': json.dumps({'error': '서버 오류가 발생했습니다'}, ensure_ascii=False)
-        }
\ No newline at end of file
+        return _build_response(500, {'error': '서버 오류가 발생했습니다'})
+
+# Lambda init 단계에서 모델 로드 + 워밍업 (첫 요청 사용자가 모델 로딩을 기다리지 않도록)
+if RETRIEVER_PRELOAD:
+    try:
+        initialize()
+    except Exception as e:
+        # 실패해도 첫 요청에서 지연 로딩으로 다시 시도
+        logger.error(f"❌ Retriever 사전 초기화 실패: {e}")
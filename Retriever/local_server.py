@@ -0,0 +1,85 @@
+"""
+로컬 리트리버 HTTP 사이드카
+
+lambda_function.lambda_handler를 HTTP로 노출합니다. 모델은 서버 프로세스에 한 번만 로드되고
+워크플로우는 RETRIEVER_BACKEND=http로 이 서버를 호출합니다. (Lambda 호출 없이 로컬 개발/테스트)
+
+사용 예시:
+    OPENSEARCH_HOST=localhost OPENSEARCH_AUTH=none OPENSEARCH_USE_SSL=false python local_server.py --port 8080
+
+엔드포인트:
+    POST /search  {"user_profile": {...}, "top_k": 5, "exclude_ids": []}
+    GET  /health
+"""
+import argparse
+import base64
+import json
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import lambda_function
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class RetrieverRequestHandler(BaseHTTPRequestHandler):
+    """Lambda 이벤트 형식으로 변환해 lambda_handler를 호출하는 핸들러"""
+
+    def do_POST(self):
+        if self.path != '/search':
+            self._send_json(404, {'error': 'not found'})
+            return
+
+        length = int(self.headers.get('Content-Length', 0))
+        raw_body = self.rfile.read(length).decode('utf-8') if length else '{}'
+        self._send_lambda_response(lambda_function.lambda_handler({'body': raw_body}, None))
+
+    def do_GET(self):
+        if self.path != '/health':
+            self._send_json(404, {'error': 'not found'})
+            return
+
+        self._send_lambda_response(lambda_function.lambda_handler({'type': 'warmup'}, None))
+
+    def _send_lambda_response(self, response: dict):
+        """Lambda 응답 envelope를 HTTP 응답으로 변환합니다. (협상된 Content-Type/Content-Encoding 유지)"""
+        body = response['body']
+        payload = base64.b64decode(body) if response.get('isBase64Encoded') else body.encode('utf-8')
+        self._send(response['statusCode'], payload, response.get('headers', {}))
+
+    def _send_json(self, status: int, data: dict):
+        self._send(status, json.dumps(data, ensure_ascii=False).encode('utf-8'), {'Content-Type': 'application/json'})
+
+    def _send(self, status: int, payload: bytes, headers: dict):
+        self.send_response(status)
+        for key, value in headers.items():
+            if key == 'Content-Type' and value == 'application/json':
+                value = 'application/json; charset=utf-8'
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        logger.info(format % args)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="로컬 리트리버 HTTP 사이드카")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+
+    # 첫 요청 전에 모델 로드 + 워밍업
+    if not lambda_function.INIT_TIMINGS:
+        lambda_function.initialize()
+
+    server = ThreadingHTTPServer((args.host, args.port), RetrieverRequestHandler)
+    logger.info(f"✅ 리트리버 사이드카 실행: http://{args.host}:{args.port}/search")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,440 @@
+"""
+인메모리 검색 엔진 (벤치마크/오프라인 평가용 OpenSearch 대체)
+
+lambda_function.build_search_query가 생성하는 쿼리 DSL의 부분집합을 해석합니다.
+- bool (must / should / filter / must_not / minimum_should_match)
+- multi_match (best_fields, "field^boost"), match, match_phrase, ids, range, term, terms, constant_score
+- knn (content_embedding, 코사인 유사도 전수 탐색 후 상위 k개, filter 사전 필터링)
+- hybrid (put_search_pipeline으로 등록한 normalization-processor의 min_max / l2 정규화 + 가중 산술 평균)
+- _name 절 점수 (matched_queries, include_named_queries_score)
+
+텍스트 점수는 필드별 BM25, kNN 점수는 OpenSearch lucene 엔진과 같은 (1 + cos) / 2 입니다.
+OpenSearch 클라이언트의 search / msearch / mget 시그니처를 따르므로 lambda_function._opensearch_client에
+그대로 주입할 수 있습니다.
+
+사용 예시:
+    engine = InMemorySearchEngine()
+    engine.add_documents(documents)   # 각 문서는 '_id'와 'content_embedding'을 포함
+    response = engine.search(index='opensearch_job', body=search_query)
+"""
+import math
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+VECTOR_FIELD = 'content_embedding'
+
+# BM25 파라미터 (OpenSearch 기본값)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def tokenize(text: Any) -> List[str]:
+    """standard 분석기와 비슷하게 소문자 단어 토큰으로 분리합니다. (리스트 필드는 이어 붙임)"""
+    if text is None:
+        return []
+    if isinstance(text, (list, tuple)):
+        text = ' '.join(str(item) for item in text)
+    return _TOKEN_PATTERN.findall(str(text).lower())
+
+
+class _FieldIndex:
+    """한 필드의 역색인 (term -> {문서 번호: tf})"""
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self.lengths: Dict[int, int] = {}
+        self.tokens: Dict[int, List[str]] = {}
+        self.total_length = 0
+
+    def add(self, doc_idx: int, value: Any) -> None:
+        tokens = tokenize(value)
+        if not tokens:
+            return
+        for term, tf in Counter(tokens).items():
+            self.postings[term][doc_idx] = tf
+        self.lengths[doc_idx] = len(tokens)
+        self.tokens[doc_idx] = tokens
+        self.total_length += len(tokens)
+
+    def bm25(self, terms: List[str], num_docs: int) -> Dict[int, float]:
+        scores: Dict[int, float] = defaultdict(float)
+        if not self.lengths:
+            return scores
+        avg_length = self.total_length / len(self.lengths)
+        for term in terms:
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (num_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_idx, tf in postings.items():
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.lengths[doc_idx] / avg_length)
+                scores[doc_idx] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+        return scores
+
+    def phrase_match(self, terms: List[str]) -> Set[int]:
+        if not terms:
+            return set()
+        candidates = set(self.postings.get(terms[0], {}))
+        for term in terms[1:]:
+            candidates &= set(self.postings.get(term, {}))
+        if len(terms) == 1:
+            return candidates
+        matched = set()
+        width = len(terms)
+        for doc_idx in candidates:
+            tokens = self.tokens[doc_idx]
+            if any(tokens[i:i + width] == terms for i in range(len(tokens) - width + 1)):
+                matched.add(doc_idx)
+        return matched
+
+
+class InMemorySearchEngine:
+    """OpenSearch search/mget 호환 인메모리 검색 엔진"""
+
+    def __init__(self, vector_field: str = VECTOR_FIELD):
+        self.vector_field = vector_field
+        self._ids: List[str] = []
+        self._id_to_idx: Dict[str, int] = {}
+        self._sources: List[Dict] = []
+        self._fields: Dict[str, _FieldIndex] = defaultdict(_FieldIndex)
+        self._vectors: Optional[np.ndarray] = None
+        self._pending_vectors: List[Optional[np.ndarray]] = []
+        # 검색 중 _name이 붙은 절의 점수, 요청의 검색 파이프라인 (검색 스레드별)
+        self._local = threading.local()
+        self._search_pipelines: Dict[str, Dict] = {}
+
+        self.search_calls = 0
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add_documents(self, documents: Iterable[Dict]) -> int:
+        """문서를 색인합니다. '_id'가 없으면 'url'을 ID로 사용합니다."""
+        added = 0
+        for document in documents:
+            source = dict(document)
+            doc_id = str(source.pop('_id', None) or source.get('url') or len(self._ids))
+            doc_idx = len(self._ids)
+            self._ids.append(doc_id)
+            self._id_to_idx[doc_id] = doc_idx
+            vector = source.get(self.vector_field)
+            self._pending_vectors.append(np.asarray(vector, dtype=np.float32) if vector is not None else None)
+            self._sources.append(source)
+            for field, value in source.items():
+                if field != self.vector_field and isinstance(value, (str, list, tuple)):
+                    self._fields[field].add(doc_idx, value)
+            added += 1
+        self._vectors = None
+        return added
+
+    def _vector_matrix(self) -> np.ndarray:
+        """정규화된 문서 벡터 행렬 (벡터가 없는 문서는 0 벡터)"""
+        if self._vectors is None:
+            dims = {len(v) for v in self._pending_vectors if v is not None}
+            dim = dims.pop() if dims else 0
+            matrix = np.zeros((len(self._pending_vectors), dim), dtype=np.float32)
+            for doc_idx, vector in enumerate(self._pending_vectors):
+                if vector is not None and len(vector) == dim:
+                    norm = np.linalg.norm(vector)
+                    matrix[doc_idx] = vector / norm if norm else vector
+            self._vectors = matrix
+        return self._vectors
+
+    # --- 쿼리 해석 ---
+
+    def _all(self) -> Set[int]:
+        return set(range(len(self._ids)))
+
+    def _score_query(self, query: Dict) -> Dict[int, float]:
+        """쿼리를 평가해 {문서 번호: 점수}를 반환합니다. (일치하지 않는 문서는 포함하지 않음)"""
+        if not query:
+            return {doc_idx: 1.0 for doc_idx in self._all()}
+        query_type, params = next(iter(query.items()))
+        handler = getattr(self, f'_q_{query_type}', None)
+        if handler is None:
+            raise ValueError(f"지원하지 않는 쿼리 타입입니다: {query_type}")
+        scores = handler(params)
+        name = _query_name(params)
+        named = getattr(self._local, 'named', None)
+        if name and named is not None:
+            named[name] = scores
+        return scores
+
+    def _q_match_all(self, params: Dict) -> Dict[int, float]:
+        return {doc_idx: float(params.get('boost', 1.0)) for doc_idx in self._all()}
+
+    def _q_bool(self, params: Dict) -> Dict[int, float]:
+        must = [self._score_query(q) for q in _as_list(params.get('must')) if q]
+        should = [self._score_query(q) for q in _as_list(params.get('should')) if q]
+        filters = [self._score_query(q) for q in _as_list(params.get('filter')) if q]
+        must_not = [self._score_query(q) for q in _as_list(params.get('must_not')) if q]
+
+        candidates = self._all()
+        for clause in must + filters:
+            candidates &= set(clause)
+        for clause in must_not:
+            candidates -= set(clause)
+
+        default_minimum = 0 if (must or filters) else 1
+        minimum_should_match = int(params.get('minimum_should_match', default_minimum)) if should else 0
+        boost = float(params.get('boost', 1.0))
+
+        scores = {}
+        for doc_idx in candidates:
+            matched_should = [clause[doc_idx] for clause in should if doc_idx in clause]
+            if len(matched_should) < minimum_should_match:
+                continue
+            score = sum(clause[doc_idx] for clause in must) + sum(matched_should)
+            # filter 전용 bool 쿼리는 점수 없이 일치 여부만 전달
+            scores[doc_idx] = (score or 0.0) * boost if (must or should) else 0.0
+        return scores
+
+    def _q_constant_score(self, params: Dict) -> Dict[int, float]:
+        boost = float(params.get('boost', 1.0))
+        return {doc_idx: boost for doc_idx in self._score_query(params.get('filter', {}))}
+
+    def _q_multi_match(self, params: Dict) -> Dict[int, float]:
+        terms = tokenize(params.get('query', ''))
+        boost = float(params.get('boost', 1.0))
+        scores: Dict[int, float] = {}
+        if not terms:
+            return scores
+        for field_spec in params.get('fields', []):
+            field, _, field_boost = field_spec.partition('^')
+            field_boost = float(field_boost) if field_boost else 1.0
+            for doc_idx, score in self._fields[field].bm25(terms, len(self._ids)).items():
+                # best_fields: 가장 점수가 높은 필드를 사용
+                scores[doc_idx] = max(scores.get(doc_idx, 0.0), score * field_boost * boost)
+        return scores
+
+    def _q_match(self, params: Dict) -> Dict[int, float]:
+        field, spec = next(iter(params.items()))
+        if isinstance(spec, dict):
+            text, boost = spec.get('query', ''), float(spec.get('boost', 1.0))
+        else:
+            text, boost = spec, 1.0
+        terms = tokenize(text)
+        return {doc_idx: score * boost for doc_idx, score in self._fields[field].bm25(terms, len(self._ids)).items()}
+
+    def _q_match_phrase(self, params: Dict) -> Dict[int, float]:
+        field, spec = next(iter(params.items()))
+        text = spec.get('query', '') if isinstance(spec, dict) else spec
+        return {doc_idx: 1.0 for doc_idx in self._fields[field].phrase_match(tokenize(text))}
+
+    def _q_ids(self, params: Dict) -> Dict[int, float]:
+        return {self._id_to_idx[doc_id]: 1.0 for doc_id in params.get('values', []) if doc_id in self._id_to_idx}
+
+    def _q_term(self, params: Dict) -> Dict[int, float]:
+        field, spec = next(iter(params.items()))
+        value = spec.get('value') if isinstance(spec, dict) else spec
+        return {doc_idx: 1.0 for doc_idx, source in enumerate(self._sources) if _field_values(source, field) & {value}}
+
+    def _q_terms(self, params: Dict) -> Dict[int, float]:
+        field, values = next((k, v) for k, v in params.items() if k != 'boost')
+        values = set(values)
+        return {doc_idx: 1.0 for doc_idx, source in enumerate(self._sources) if _field_values(source, field) & values}
+
+    def _q_range(self, params: Dict) -> Dict[int, float]:
+        field, bounds = next(iter(params.items()))
+        checks = {
+            'gte': lambda v, b: v >= b, 'gt': lambda v, b: v > b,
+            'lte': lambda v, b: v <= b, 'lt': lambda v, b: v < b,
+        }
+        scores = {}
+        for doc_idx, source in enumerate(self._sources):
+            value = source.get(field)
+            if value is None:
+                continue
+            if all(check(value, bounds[op]) for op, check in checks.items() if op in bounds):
+                scores[doc_idx] = 1.0
+        return scores
+
+    def _q_exists(self, params: Dict) -> Dict[int, float]:
+        field = params.get('field')
+        return {doc_idx: 1.0 for doc_idx, source in enumerate(self._sources) if source.get(field) not in (None, '', [])}
+
+    def _q_knn(self, params: Dict) -> Dict[int, float]:
+        field, spec = next(iter(params.items()))
+        if field != self.vector_field:
+            raise ValueError(f"벡터 필드가 아닙니다: {field}")
+        matrix = self._vector_matrix()
+        if not len(matrix):
+            return {}
+        query_vector = np.asarray(spec['vector'], dtype=np.float32)
+        norm = np.linalg.norm(query_vector)
+        if norm:
+            query_vector = query_vector / norm
+
+        # knn 내부 filter는 후보를 먼저 거른 뒤 상위 k개를 고름 (lucene 엔진의 사전 필터링)
+        allowed = None
+        if spec.get('filter'):
+            allowed = np.zeros(len(matrix), dtype=bool)
+            allowed[list(self._score_query(spec['filter']))] = True
+
+        similarities = (1.0 + matrix @ query_vector) / 2.0
+        if allowed is not None:
+            similarities = np.where(allowed, similarities, -np.inf)
+        k = min(int(spec.get('k', 10)), len(similarities))
+        top = np.argpartition(-similarities, k - 1)[:k] if k else []
+        boost = float(spec.get('boost', 1.0))
+        return {int(doc_idx): float(similarities[doc_idx]) * boost for doc_idx in top if np.isfinite(similarities[doc_idx])}
+
+    def _q_hybrid(self, params: Dict) -> Dict[int, float]:
+        subquery_scores = [self._score_query(q) for q in params.get('queries', [])]
+        technique, weights = 'min_max', None
+        processor = _normalization_processor(getattr(self._local, 'pipeline', None))
+        if processor:
+            technique = processor.get('normalization', {}).get('technique', technique)
+            weights = processor.get('combination', {}).get('parameters', {}).get('weights')
+        weights = weights or [1.0] * len(subquery_scores)
+        if len(weights) != len(subquery_scores):
+            raise ValueError("파이프라인 weights 수와 hybrid 하위 쿼리 수가 다릅니다")
+
+        combined: Dict[int, float] = defaultdict(float)
+        for scores, weight in zip(subquery_scores, weights):
+            for doc_idx, score in _normalize_scores(scores, technique).items():
+                combined[doc_idx] += weight * score
+        total_weight = sum(weights)
+        return {doc_idx: score / total_weight for doc_idx, score in combined.items()}
+
+    # --- OpenSearch 클라이언트 호환 API ---
+
+    def put_search_pipeline(self, name: str, body: Dict) -> None:
+        """검색 파이프라인을 등록합니다. (PUT /_search/pipeline/{name})"""
+        self._search_pipelines[name] = body
+
+    def _source(self, doc_idx: int, includes: Optional[List[str]] = None,
+                excludes: Optional[List[str]] = None) -> Dict:
+        source = self._sources[doc_idx]
+        if includes:
+            return {key: source[key] for key in includes if key in source}
+        excludes = set(excludes or [])
+        return {key: value for key, value in source.items() if key not in excludes}
+
+    def search(self, index: str = None, body: Dict = None, params: Dict = None, **kwargs) -> Dict:
+        """OpenSearch search 응답 형식으로 검색 결과를 반환합니다."""
+        start = time.perf_counter()
+        self.search_calls += 1
+        body = body or {}
+        params = params or {}
+        pipeline_name = params.get('search_pipeline')
+        if pipeline_name and pipeline_name not in self._search_pipelines:
+            raise ValueError(f"검색 파이프라인이 없습니다: {pipeline_name}")
+        self._local.pipeline = self._search_pipelines.get(pipeline_name)
+        self._local.named = {}
+        scores = self._score_query(body.get('query', {}))
+        named, self._local.named = self._local.named, None
+        with_named_scores = str(params.get('include_named_queries_score', '')).lower() == 'true'
+
+        offset = int(body.get('from', 0))
+        size = int(body.get('size', 10))
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[offset:offset + size]
+
+        source_spec = body.get('_source', {})
+        includes = excludes = None
+        if isinstance(source_spec, dict):
+            includes, excludes = source_spec.get('includes'), source_spec.get('excludes')
+        elif isinstance(source_spec, list):
+            includes = source_spec
+
+        hits = []
+        for doc_idx, score in ranked:
+            hit = {'_index': index, '_id': self._ids[doc_idx], '_score': score}
+            if source_spec is not False:
+                hit['_source'] = self._source(doc_idx, includes, excludes)
+            matched = {name: clause[doc_idx] for name, clause in named.items() if doc_idx in clause}
+            if matched:
+                hit['matched_queries'] = matched if with_named_scores else list(matched)
+            hits.append(hit)
+
+        return {
+            'took': int((time.perf_counter() - start) * 1000),
+            'hits': {
+                'total': {'value': len(scores), 'relation': 'eq'},
+                'max_score': ranked[0][1] if ranked else None,
+                'hits': hits
+            }
+        }
+
+    def msearch(self, body: List[Dict] = None, index: str = None, params: Dict = None, **kwargs) -> Dict:
+        """헤더/본문 쌍 목록을 순서대로 검색해 OpenSearch msearch 응답 형식으로 반환합니다."""
+        body = body or []
+        responses = []
+        for header, query in zip(body[0::2], body[1::2]):
+            # 인스턴스 속성으로 감싼 search(벤치마크 계측)를 거치지 않도록 클래스 메서드를 직접 호출
+            responses.append(InMemorySearchEngine.search(self, index=header.get('index', index), body=query, params=params))
+        return {'took': sum(response['took'] for response in responses), 'responses': responses}
+
+    def mget(self, index: str = None, body: Dict = None, params: Dict = None, **kwargs) -> Dict:
+        """OpenSearch mget 응답 형식으로 문서를 반환합니다."""
+        params = params or {}
+        includes = params.get('_source_includes')
+        excludes = params.get('_source_excludes')
+        includes = includes.split(',') if includes else None
+        excludes = excludes.split(',') if excludes else None
+
+        docs = []
+        for doc_id in (body or {}).get('ids', []):
+            doc_idx = self._id_to_idx.get(doc_id)
+            if doc_idx is None:
+                docs.append({'_index': index, '_id': doc_id, 'found': False})
+            else:
+                docs.append({'_index': index, '_id': doc_id, 'found': True,
+                             '_source': self._source(doc_idx, includes, excludes)})
+        return {'docs': docs}
+
+
+def _query_name(params: Any) -> Optional[str]:
+    """절의 _name (match/knn은 필드 스펙 안에 위치)"""
+    if not isinstance(params, dict):
+        return None
+    if params.get('_name'):
+        return params['_name']
+    for spec in params.values():
+        if isinstance(spec, dict) and spec.get('_name'):
+            return spec['_name']
+    return None
+
+
+def _normalization_processor(pipeline: Optional[Dict]) -> Optional[Dict]:
+    """검색 파이프라인의 normalization-processor 설정"""
+    for processor in (pipeline or {}).get('phase_results_processors', []):
+        if 'normalization-processor' in processor:
+            return processor['normalization-processor']
+    return None
+
+
+def _normalize_scores(scores: Dict[int, float], technique: str) -> Dict[int, float]:
+    """하위 쿼리 점수 정규화 (min_max: (s - min) / (max - min), l2: s / ||s||)"""
+    if not scores:
+        return {}
+    values = np.fromiter(scores.values(), dtype=np.float64, count=len(scores))
+    if technique == 'l2':
+        norm = np.linalg.norm(values)
+        normalized = values / norm if norm else values
+    elif technique == 'min_max':
+        spread = values.max() - values.min()
+        normalized = (values - values.min()) / spread if spread else np.ones_like(values)
+    else:
+        raise ValueError(f"지원하지 않는 정규화 방식입니다: {technique}")
+    return dict(zip(scores, normalized.tolist()))
+
+
+def _as_list(value: Any) -> List:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _field_values(source: Dict, field: str) -> Set:
+    value = source.get(field)
+    if isinstance(value, (list, tuple)):
+        return set(value)
+    return {value} if value is not None else set()
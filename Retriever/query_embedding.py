@@ -0,0 +1,139 @@
+import logging
+import threading
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+from ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query_text(text: str) -> str:
+    """쿼리 텍스트를 정규화합니다. (NFC 정규화 + 연속 공백 정리)"""
+    if not text:
+        return ""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class QueryEmbeddingService:
+    """
+    쿼리 임베딩 서비스
+
+    - 정규화된 쿼리 텍스트를 키로 하는 LRU + TTL 캐시로 동일 질문의 재인코딩을 막습니다.
+    - 동시에 들어온 인코딩 요청을 모아 한 번의 `SentenceTransformer.encode` 호출로 처리합니다.
+      먼저 도착한 요청이 리더가 되어 max_wait_ms 동안(또는 배치가 찰 때까지) 기다린 뒤,
+      대기 중인 요청을 최대 max_batch_size개씩 묶어 인코딩합니다.
+    """
+
+    def __init__(
+        self,
+        model_provider: Callable[[], object],
+        prefix: str = "query: ",
+        cache_size: int = 2048,
+        cache_ttl: float = 3600.0,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 0.0,
+    ):
+        self._model_provider = model_provider
+        self.prefix = prefix
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+
+        # 인코딩 대기 중인 요청: key -> (정규화된 텍스트, Future)
+        self._pending: "OrderedDict[str, Tuple[str, Future]]" = OrderedDict()
+        self._cond = threading.Condition()
+        self._leader_active = False
+
+        self.encode_calls = 0
+        self.encoded_texts = 0
+
+    def encode(self, text: str, prefix: str = None) -> np.ndarray:
+        """단일 쿼리를 임베딩합니다. 캐시에 있으면 인코딩 없이 반환합니다."""
+        prefix = self.prefix if prefix is None else prefix
+        normalized = normalize_query_text(text)
+        # e5(XLM-R) 토크나이저는 대소문자를 구분하므로 인코딩하는 텍스트 그대로를 키로 사용
+        key = f"{prefix}{normalized}"
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        with self._cond:
+            pending = self._pending.get(key)
+            if pending is None:
+                future = Future()
+                self._pending[key] = (key, future)
+                if len(self._pending) >= self.max_batch_size:
+                    self._cond.notify_all()
+            else:
+                future = pending[1]
+
+            is_leader = not self._leader_active
+            if is_leader:
+                self._leader_active = True
+
+        if is_leader:
+            self._drain()
+
+        return future.result()
+
+    def encode_many(self, texts: List[str]) -> List[np.ndarray]:
+        """여러 쿼리를 임베딩합니다."""
+        return [self.encode(text) for text in texts]
+
+    def _drain(self) -> None:
+        """리더 스레드가 대기열이 빌 때까지 배치 단위로 인코딩합니다."""
+        if self.max_wait > 0:
+            with self._cond:
+                self._cond.wait_for(lambda: len(self._pending) >= self.max_batch_size, timeout=self.max_wait)
+
+        while True:
+            with self._cond:
+                if not self._pending:
+                    self._leader_active = False
+                    return
+                batch = []
+                while self._pending and len(batch) < self.max_batch_size:
+                    key, (text, future) = self._pending.popitem(last=False)
+                    batch.append((key, text, future))
+
+            self._encode_batch(batch)
+
+    def _encode_batch(self, batch: List[Tuple[str, str, Future]]) -> None:
+        texts = [text for _, text, _ in batch]
+        try:
+            model = self._model_provider()
+            vectors = model.encode(texts, batch_size=len(texts), show_progress_bar=False, convert_to_numpy=True)
+        except Exception as e:
+            logger.error(f"❌ 쿼리 임베딩 배치 인코딩 실패 ({len(texts)}건): {e}")
+            for _, _, future in batch:
+                future.set_exception(e)
+            return
+
+        self.encode_calls += 1
+        self.encoded_texts += len(texts)
+        if len(texts) > 1:
+            logger.info(f"쿼리 임베딩 {len(texts)}건을 한 번에 인코딩했습니다.")
+
+        for (key, _, future), vector in zip(batch, vectors):
+            vector = np.asarray(vector)
+            vector.setflags(write=False)  # 캐시된 벡터가 호출자에 의해 변경되지 않도록 보호
+            self._cache.set(key, vector)
+            future.set_result(vector)
+
+    def clear_cache(self) -> None:
+        """쿼리 임베딩 캐시를 비웁니다. (벤치마크에서 콜드 인코딩 측정용)"""
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        """캐시 및 배치 통계를 반환합니다."""
+        return {
+            "cache": self._cache.stats(),
+            "encode_calls": self.encode_calls,
+            "encoded_texts": self.encoded_texts,
+        }
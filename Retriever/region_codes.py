@@ -0,0 +1,124 @@
+"""
+지역 코드 정규화 (시/도, 시/군/구)
+
+마이그레이션(DataCollection/DynamoToOpensearch/job_normalizer.py)이 공고 location을 region_sido /
+region_sigungu keyword 필드로 색인하고, 리트리버는 사용자 희망 근무지역을 같은 규칙으로 정규화해
+텍스트 match 대신 term 필터로 비교합니다.
+
+예: "서울특별시 강남구 테헤란로 142" → [("서울", "서울 강남구")], "서울, 경기" → [("서울", None), ("경기", None)],
+    "판교" → [("경기", "경기 성남시")], "원격근무" → [("원격", None)]
+"""
+import re
+from typing import List, Optional, Tuple
+
+# 시/도 표준 약칭 -> 표기 변형
+SIDO_ALIASES = {
+    '서울': ['서울특별시', '서울시', '서울'],
+    '부산': ['부산광역시', '부산시', '부산'],
+    '대구': ['대구광역시', '대구시', '대구'],
+    '인천': ['인천광역시', '인천시', '인천'],
+    '광주': ['광주광역시', '광주시', '광주'],
+    '대전': ['대전광역시', '대전시', '대전'],
+    '울산': ['울산광역시', '울산시', '울산'],
+    '세종': ['세종특별자치시', '세종시', '세종'],
+    '경기': ['경기도', '경기'],
+    '강원': ['강원특별자치도', '강원도', '강원'],
+    '충북': ['충청북도', '충북'],
+    '충남': ['충청남도', '충남'],
+    '전북': ['전북특별자치도', '전라북도', '전북'],
+    '전남': ['전라남도', '전남'],
+    '경북': ['경상북도', '경북'],
+    '경남': ['경상남도', '경남'],
+    '제주': ['제주특별자치도', '제주도', '제주'],
+}
+
+# 시/도 없이 자주 쓰는 지명(업무 지구, 역 이름) -> (시/도, 시/군/구). "판교역", "판교테크노밸리"처럼 접두어로 매칭
+PLACE_ALIASES = {
+    '판교': ('경기', '경기 성남시'),
+    '분당': ('경기', '경기 성남시'),
+    '광교': ('경기', '경기 수원시'),
+    '동탄': ('경기', '경기 화성시'),
+    '송도': ('인천', '인천 연수구'),
+    '강남': ('서울', '서울 강남구'),
+    '역삼': ('서울', '서울 강남구'),
+    '삼성동': ('서울', '서울 강남구'),
+    '선릉': ('서울', '서울 강남구'),
+    '여의도': ('서울', '서울 영등포구'),
+    '성수': ('서울', '서울 성동구'),
+    '상암': ('서울', '서울 마포구'),
+    '마곡': ('서울', '서울 강서구'),
+    '가산': ('서울', '서울 금천구'),
+    '구로디지털': ('서울', '서울 구로구'),
+    '광화문': ('서울', '서울 종로구'),
+    '을지로': ('서울', '서울 중구'),
+}
+
+# 원격/재택 근무 공고는 지역 대신 region_sido의 '원격' 코드로 색인
+REMOTE_REGION = '원격'
+REMOTE_KEYWORDS = ['원격', '재택', '리모트', 'remote', 'wfh']
+
+_ALIAS_TO_SIDO = {alias: sido for sido, aliases in SIDO_ALIASES.items() for alias in aliases}
+_SEGMENT_PATTERN = re.compile(r'[,/·|]+')
+_TOKEN_PATTERN = re.compile(r'[\s()\[\]]+')
+_SIGUNGU_PATTERN = re.compile(r'^[가-힣]{1,6}[시군구]$')
+
+Region = Tuple[str, Optional[str]]
+
+
+def _match_place(token: str) -> Optional[Region]:
+    """PLACE_ALIASES의 지명으로 시작하는 토큰이면 (시/도, 시/군/구)"""
+    for place, region in PLACE_ALIASES.items():
+        if token.startswith(place):
+            return region
+    return None
+
+
+def parse_regions(text: str) -> List[Region]:
+    """
+    텍스트에서 (시/도, "시/도 시/군/구") 목록을 추출합니다. (시/군/구가 없으면 None, 중복 제거)
+
+    쉼표/슬래시로 구분된 구간마다 시/도 뒤의 시/군/구를 찾습니다. ("경기 광주시"의 광주시는 광주광역시가 아님)
+    "판교", "여의도" 같은 지명은 PLACE_ALIASES로, "원격근무"/"재택"은 REMOTE_REGION으로 변환합니다.
+    시/도 없이 시/군/구만 있는 경우("중구")는 지역을 특정할 수 없어 무시합니다.
+    """
+    if not text:
+        return []
+
+    regions: List[Region] = []
+
+    def add(region: Region) -> None:
+        if region not in regions:
+            regions.append(region)
+
+    for segment in _SEGMENT_PATTERN.split(str(text)):
+        if any(keyword in segment.lower() for keyword in REMOTE_KEYWORDS):
+            add((REMOTE_REGION, None))
+        tokens = [token for token in _TOKEN_PATTERN.split(segment) if token]
+        idx = 0
+        while idx < len(tokens):
+            sido = _ALIAS_TO_SIDO.get(tokens[idx])
+            idx += 1
+            if sido is None:
+                place = _match_place(tokens[idx - 1])
+                if place is not None:
+                    add(place)
+                continue
+            sigungu = None
+            place = _match_place(tokens[idx]) if idx < len(tokens) else None
+            if idx < len(tokens) and _SIGUNGU_PATTERN.match(tokens[idx]):
+                sigungu = f"{sido} {tokens[idx]}"
+                idx += 1
+            elif place is not None and place[0] == sido:
+                # "경기 판교"처럼 시/도 뒤의 지명은 해당 시/군/구로 사용
+                sigungu = place[1]
+                idx += 1
+            add((sido, sigungu))
+    return regions
+
+
+def region_terms(text: str) -> Tuple[List[str], List[str]]:
+    """term 필터용 (시/도 코드 목록, 시/군/구 코드 목록)"""
+    regions = parse_regions(text)
+    sido_codes = [sido for sido, sigungu in regions if sigungu is None]
+    sigungu_codes = [sigungu for _, sigungu in regions if sigungu]
+    return sido_codes, sigungu_codes
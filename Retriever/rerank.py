@@ -0,0 +1,105 @@
+import logging
+import math
+from typing import Callable, Dict, List, Tuple
+
+from query_embedding import normalize_query_text
+from ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+def choose_batch_size(num_candidates: int, max_batch_size: int) -> int:
+    """
+    후보 수에 맞춰 배치 크기를 결정합니다.
+    max_batch_size 이하이면 한 번에 처리하고, 넘으면 배치 크기가 고르게 나뉘도록 조정합니다.
+    (예: 25개, 최대 16 -> 13 + 12)
+    """
+    if num_candidates <= 0:
+        return 1
+    max_batch_size = max(1, max_batch_size)
+    num_batches = math.ceil(num_candidates / max_batch_size)
+    return math.ceil(num_candidates / num_batches)
+
+
+class RerankService:
+    """
+    Cross-Encoder 리랭킹 서비스
+
+    - (쿼리, 문서 ID) -> 점수 캐시: 같은 질문으로 같은 공고를 다시 리랭킹할 때 재계산하지 않습니다.
+    - 후보 수에 따라 배치 크기를 결정합니다.
+    """
+
+    def __init__(
+        self,
+        model_provider: Callable[[], object],
+        cache_size: int = 4096,
+        cache_ttl: float = 1800.0,
+        max_batch_size: int = 16,
+    ):
+        self._model_provider = model_provider
+        self._cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self.max_batch_size = max(1, max_batch_size)
+
+        self.predicted_pairs = 0
+
+    def rerank(
+        self,
+        query: str,
+        doc_ids: List[str],
+        get_text: Callable[[int], str],
+        top_k: int,
+    ) -> List[Tuple[int, float]]:
+        """
+        후보 문서를 리랭킹합니다.
+
+        Args:
+            query (str): 리랭킹용 쿼리
+            doc_ids (List[str]): 1단계 검색 순서대로 정렬된 후보 문서 ID
+            get_text (Callable[[int], str]): 후보 인덱스를 받아 리랭킹용 문서 텍스트를 반환하는 함수
+                (캐시 적중 시에는 호출되지 않습니다)
+            top_k (int): 최종 반환할 문서 수
+
+        Returns:
+            List[Tuple[int, float]]: 점수 내림차순으로 정렬된 (후보 인덱스, 점수) 리스트 (최대 top_k개)
+        """
+        # 리랭커(ms-marco-MiniLM)는 uncased 모델이라 대소문자만 다른 쿼리의 점수가 같으므로 캐시 키를 공유
+        query_key = normalize_query_text(query).casefold()
+        scores: Dict[int, float] = {}
+        uncached: List[int] = []
+
+        for idx, doc_id in enumerate(doc_ids):
+            cached = self._cache.get((query_key, doc_id)) if doc_id else None
+            if cached is None:
+                uncached.append(idx)
+            else:
+                scores[idx] = cached
+
+        if uncached:
+            batch_size = choose_batch_size(len(uncached), self.max_batch_size)
+            for start in range(0, len(uncached), batch_size):
+                batch = uncached[start:start + batch_size]
+                sentence_pairs = [[query, get_text(idx)] for idx in batch]
+                batch_scores = self._model_provider().predict(
+                    sentence_pairs, show_progress_bar=False, batch_size=len(sentence_pairs)
+                )
+                self.predicted_pairs += len(batch)
+
+                for idx, score in zip(batch, batch_scores):
+                    score = float(score)
+                    scores[idx] = score
+                    if doc_ids[idx]:
+                        self._cache.set((query_key, doc_ids[idx]), score)
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:top_k]
+
+    def clear_cache(self) -> None:
+        """리랭킹 점수 캐시를 비웁니다. (벤치마크에서 콜드 리랭킹 측정용)"""
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        """캐시 및 리랭킹 통계를 반환합니다."""
+        return {
+            "cache": self._cache.stats(),
+            "predicted_pairs": self.predicted_pairs,
+        }
@@ -0,0 +1,86 @@
+"""
+리랭킹용 문서 텍스트
+
+마이그레이션(DataCollection/DynamoToOpensearch/migrate.py)이 색인 시점에 리랭커 최대 토큰 길이로 자른
+텍스트를 rerank_text 필드에 저장하고, 리트리버는 검색 결과의 rerank_text를 그대로 리랭커에 넣습니다.
+rerank_text가 없는 문서(이전 색인)는 요청 시점에 같은 형식으로 만듭니다.
+"""
+import logging
+import os
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+RERANK_TEXT_FIELD = 'rerank_text'
+
+# 리랭커(CrossEncoder) 최대 입력 토큰 수
+RERANK_MAX_LENGTH = int(os.environ.get('RERANK_MAX_LENGTH', '256'))
+# 토크나이저를 사용할 수 없을 때의 글자 수 상한
+RERANK_TEXT_MAX_CHARS = int(os.environ.get('RERANK_TEXT_MAX_CHARS', '1024'))
+
+# rerank_text가 없는 문서에서 리랭킹 텍스트를 만드는 데 필요한 _source 필드
+RERANK_SOURCE_FIELDS = ['title', 'company_name', 'position_detail', 'main_tasks', 'qualifications', 'location']
+
+
+def format_document_for_reranking(document: Dict) -> str:
+    """문서를 리랭킹용 텍스트로 포맷팅"""
+    if not document:
+        return ""
+
+    parts = []
+
+    # 주요 필드들을 텍스트로 변환
+    if document.get('title'):
+        parts.append(f"직무: {document['title']}")
+    if document.get('company_name'):
+        parts.append(f"회사: {document['company_name']}")
+    if document.get('position_detail'):
+        parts.append(f"포지션 상세: {document['position_detail']}")
+    if document.get('main_tasks') and isinstance(document['main_tasks'], list):
+        parts.append(f"주요 업무: {', '.join(document['main_tasks'])}")
+    if document.get('qualifications') and isinstance(document['qualifications'], list):
+        parts.append(f"자격 요건: {', '.join(document['qualifications'])}")
+    if document.get('location'):
+        parts.append(f"위치: {document['location']}")
+
+    return " | ".join(parts)
+
+
+def truncate_to_tokens(text: str, tokenizer=None, max_tokens: int = RERANK_MAX_LENGTH) -> str:
+    """
+    텍스트를 리랭커 토큰 기준 max_tokens 이내로 자릅니다.
+
+    토큰을 디코딩하면 원문이 바뀔 수 있으므로(소문자화, [UNK] 등) offset으로 원문을 자릅니다.
+    토크나이저가 없으면 RERANK_TEXT_MAX_CHARS 글자로 자릅니다.
+    """
+    if not text:
+        return ""
+    if tokenizer is None:
+        return text[:RERANK_TEXT_MAX_CHARS]
+
+    encoding = tokenizer(text, add_special_tokens=False, truncation=True, max_length=max_tokens,
+                         return_offsets_mapping=True)
+    offsets = encoding['offset_mapping']
+    if len(offsets) < max_tokens:
+        return text
+    return text[:offsets[-1][1]]
+
+
+def build_rerank_text(document: Dict, tokenizer=None, max_tokens: int = RERANK_MAX_LENGTH) -> str:
+    """색인 시점에 저장할 rerank_text를 생성합니다."""
+    return truncate_to_tokens(format_document_for_reranking(document), tokenizer, max_tokens)
+
+
+def get_rerank_text(source: Dict) -> str:
+    """검색 결과 _source의 리랭킹 텍스트 (rerank_text가 없으면 요청 시점에 생성)"""
+    return source.get(RERANK_TEXT_FIELD) or format_document_for_reranking(source)
+
+
+def load_reranker_tokenizer(model_name: str) -> Optional[object]:
+    """리랭커 fast 토크나이저를 로드합니다. (offset 매핑 필요, 실패 시 None → 글자 수 기준으로 자름)"""
+    try:
+        from transformers import AutoTokenizer
+        return AutoTokenizer.from_pretrained(model_name, use_fast=True)
+    except Exception as e:
+        logger.warning(f"리랭커 토크나이저를 로드하지 못해 글자 수 기준으로 자릅니다: {e}")
+        return None
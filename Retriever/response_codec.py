@@ -0,0 +1,113 @@
+"""
+리트리버 응답 직렬화
+
+호출자가 요청 본문의 response_format(선호 순서 리스트)과 compression으로 응답 형식을 요청하면,
+서버는 설치된 라이브러리 중 먼저 지원하는 형식을 골라 응답하고 Content-Type/Content-Encoding 헤더로 알립니다.
+
+- json: 표준 json (기본값, 추가 의존성 없음)
+- orjson: orjson으로 직렬화한 JSON (형식은 json과 동일, 직렬화/파싱이 빠름)
+- msgpack: 바이너리 MessagePack (base64로 Lambda 응답 envelope에 담김)
+- compression=zstd: 본문을 zstd로 압축 (base64로 전달)
+"""
+import base64
+import json
+from typing import Dict, List, Optional, Tuple, Union
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+CONTENT_TYPES = {
+    "json": "application/json",
+    "orjson": "application/json",
+    "msgpack": "application/msgpack",
+}
+
+
+def available_formats() -> List[str]:
+    """이 프로세스에서 사용할 수 있는 응답 형식을 선호 순서대로 반환합니다."""
+    formats = []
+    if msgpack is not None:
+        formats.append("msgpack")
+    if orjson is not None:
+        formats.append("orjson")
+    formats.append("json")
+    return formats
+
+
+def compression_available() -> bool:
+    return zstandard is not None
+
+
+def negotiate_format(requested: Union[str, List[str], None]) -> str:
+    """요청된 형식(선호 순서) 중 지원하는 첫 번째 형식을 반환합니다. 없으면 json."""
+    if not requested:
+        return "json"
+    if isinstance(requested, str):
+        requested = [requested]
+    supported = available_formats()
+    for fmt in requested:
+        if fmt in supported:
+            return fmt
+    return "json"
+
+
+def encode_body(data: Dict, fmt: str = "json", compression: Optional[str] = None) -> Tuple[str, Dict[str, str], bool]:
+    """
+    응답 데이터를 직렬화합니다.
+
+    Returns:
+        Tuple[str, Dict[str, str], bool]: (본문, 헤더, base64 인코딩 여부)
+    """
+    if fmt == "msgpack":
+        raw = msgpack.packb(data, use_bin_type=True)
+    elif fmt == "orjson":
+        raw = orjson.dumps(data)
+    else:
+        fmt = "json"
+        raw = None
+
+    headers = {"Content-Type": CONTENT_TYPES[fmt]}
+
+    if compression == "zstd" and zstandard is not None:
+        if raw is None:
+            raw = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        raw = zstandard.ZstdCompressor(level=3).compress(raw)
+        headers["Content-Encoding"] = "zstd"
+
+    if raw is None:
+        return json.dumps(data, ensure_ascii=False), headers, False
+    if headers["Content-Type"] == "application/json" and "Content-Encoding" not in headers:
+        return raw.decode("utf-8"), headers, False
+    return base64.b64encode(raw).decode("ascii"), headers, True
+
+
+def decode_body(body: Union[str, bytes], headers: Optional[Dict[str, str]] = None, is_base64: bool = False) -> Dict:
+    """encode_body로 직렬화한 본문을 복원합니다."""
+    headers = {key.lower(): value for key, value in (headers or {}).items()}
+    raw = base64.b64decode(body) if is_base64 else body
+
+    if headers.get("content-encoding") == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd 압축 응답을 해제하려면 zstandard가 필요합니다.")
+        raw = zstandard.ZstdDecompressor().decompress(raw)
+
+    if headers.get("content-type", "application/json").startswith("application/msgpack"):
+        if msgpack is None:
+            raise ValueError("msgpack 응답을 해석하려면 msgpack이 필요합니다.")
+        return msgpack.unpackb(raw, raw=False)
+
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# 리트리버 모듈은 Lambda 패키지 구조에 맞춰 서로를 최상위 모듈로 임포트하므로 Retriever 디렉토리를 경로에 추가
+RETRIEVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RETRIEVER_DIR not in sys.path:
+    sys.path.insert(0, RETRIEVER_DIR)
@@ -0,0 +1,65 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import hybrid_retriever
+
+RESPONSE_BODY = json.dumps({"scores": [1.0], "doc_ids": ["job-1"], "documents": [{}]}).encode()
+
+
+class FakeAsyncClient:
+    """생성된 이벤트 루프를 기록하고, 다른 루프에서 사용되면 실패하는 httpx.AsyncClient 대역"""
+
+    instances = []
+
+    def __init__(self, timeout=None):
+        self.loop = asyncio.get_running_loop()
+        self.closed = False
+        FakeAsyncClient.instances.append(self)
+
+    async def post(self, url, json=None):
+        assert asyncio.get_running_loop() is self.loop, "client used from a different event loop"
+        return SimpleNamespace(status_code=200, text="", content=RESPONSE_BODY, headers={"content-type": "application/json"})
+
+    async def aclose(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_httpx(monkeypatch):
+    FakeAsyncClient.instances = []
+    monkeypatch.setattr(hybrid_retriever, "httpx", SimpleNamespace(AsyncClient=FakeAsyncClient))
+    return FakeAsyncClient
+
+
+class TestHttpRetrieverBackend:
+    def test_clients_are_per_event_loop(self, fake_httpx):
+        """asyncio.run마다 새 루프의 클라이언트를 사용"""
+        backend = hybrid_retriever.HttpRetrieverBackend(url="http://sidecar/search", timeout=1)
+
+        async def search_twice():
+            first = await backend.invoke_async({"query": "백엔드"})
+            second = await backend.invoke_async({"query": "백엔드"})
+            return first, second
+
+        for _ in range(2):
+            first, second = asyncio.run(search_twice())
+            assert first["doc_ids"] == second["doc_ids"] == ["job-1"]
+
+        assert len(fake_httpx.instances) == 2
+        assert fake_httpx.instances[0].loop is not fake_httpx.instances[1].loop
+
+    def test_aclose_closes_current_loop_client(self, fake_httpx):
+        backend = hybrid_retriever.HttpRetrieverBackend(url="http://sidecar/search", timeout=1)
+
+        async def search_and_close():
+            await backend.invoke_async({"query": "백엔드"})
+            await backend.aclose()
+
+        asyncio.run(search_and_close())
+
+        assert fake_httpx.instances[0].closed
+        assert len(backend._async_clients) == 0
+
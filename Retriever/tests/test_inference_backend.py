@@ -0,0 +1,36 @@
+import numpy as np
+
+from inference_backend import count_rank_changes
+
+PAIRS = [["q1", "a"], ["q1", "b"], ["q1", "c"], ["q2", "d"], ["q2", "e"]]
+
+
+def test_identical_order_has_no_changes():
+    scores = np.array([3.0, 2.0, 1.0, 5.0, 4.0])
+    # 점수 크기가 달라도 쿼리 안의 순서가 같으면 변화 없음
+    shifted = np.array([0.3, 0.2, 0.1, 9.0, 8.0])
+
+    assert count_rank_changes(PAIRS, scores, shifted) == {"rank_changes": 0, "queries_changed": 0}
+
+
+def test_scores_are_not_compared_across_queries():
+    # q2의 점수가 q1보다 전부 낮아져도, 쿼리별 순서가 같으면 변화 없음 (전체를 한 번에 정렬하면 변화로 잡힘)
+    reference = np.array([3.0, 2.0, 1.0, 5.0, 4.0])
+    candidate = np.array([3.0, 2.0, 1.0, -5.0, -6.0])
+
+    assert count_rank_changes(PAIRS, reference, candidate)["rank_changes"] == 0
+
+
+def test_swap_within_query_is_counted():
+    reference = np.array([3.0, 2.0, 1.0, 5.0, 4.0])
+    candidate = np.array([2.0, 3.0, 1.0, 5.0, 4.0])
+
+    assert count_rank_changes(PAIRS, reference, candidate) == {"rank_changes": 2, "queries_changed": 1}
+
+
+def test_top_k_ignores_lower_ranks():
+    reference = np.array([3.0, 2.0, 1.0, 5.0, 4.0])
+    candidate = np.array([3.0, 1.0, 2.0, 5.0, 4.0])
+
+    assert count_rank_changes(PAIRS, reference, candidate, top_k=1)["rank_changes"] == 0
+    assert count_rank_changes(PAIRS, reference, candidate, top_k=3)["rank_changes"] == 2
@@ -0,0 +1,18 @@
+import pytest
+
+import lambda_function
+
+
+@pytest.mark.parametrize("environ, expected", [
+    ({}, False),                                                    # 백엔드/테스트 프로세스
+    ({"AWS_LAMBDA_FUNCTION_NAME": "MangMangDae-Retriever"}, True),  # Lambda
+    ({"AWS_LAMBDA_FUNCTION_NAME": "MangMangDae-Retriever", "RETRIEVER_PRELOAD": "false"}, False),
+    ({"RETRIEVER_PRELOAD": "true"}, True),
+])
+def test_preload_enabled(environ, expected):
+    assert lambda_function.preload_enabled(environ) is expected
+
+
+def test_import_outside_lambda_does_not_load_models():
+    assert lambda_function.INIT_TIMINGS == {}
+    assert lambda_function._embedding_model is None
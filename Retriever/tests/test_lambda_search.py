@@ -0,0 +1,180 @@
+import json
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import lambda_function
+from vector_codec import encode_vector
+
+LEGACY_SOURCE = {"title": "백엔드 개발자", "company_name": "토스", "main_tasks": ["API 개발"]}
+
+
+class FakeOpenSearch:
+    """search는 고정된 후보를, mget은 요청된 _source 필드만 돌려주는 OpenSearch 클라이언트 대역"""
+
+    def __init__(self, hits, documents):
+        self.hits = hits
+        self.documents = documents
+        self.mget_calls = []
+
+    def search(self, index, body, params=None):
+        return {"hits": {"hits": [dict(hit) for hit in self.hits]}}
+
+    def mget(self, index, body, params=None):
+        includes = (params or {}).get("_source_includes")
+        self.mget_calls.append((list(body["ids"]), includes))
+        docs = []
+        for doc_id in body["ids"]:
+            source = self.documents[doc_id]
+            if includes:
+                source = {key: value for key, value in source.items() if key in includes.split(",")}
+            docs.append({"_id": doc_id, "found": True, "_source": source})
+        return {"docs": docs}
+
+
+class FakeRerankService:
+    """리랭킹 텍스트를 기록하고 텍스트 길이 순으로 정렬"""
+
+    def __init__(self):
+        self.texts = {}
+
+    def rerank(self, query, doc_ids, get_text, top_k):
+        self.texts = {doc_id: get_text(idx) for idx, doc_id in enumerate(doc_ids)}
+        ranked = sorted(range(len(doc_ids)), key=lambda idx: -len(self.texts[doc_ids[idx]]))
+        return [(idx, float(len(self.texts[doc_ids[idx]]))) for idx in ranked[:top_k]]
+
+
+@pytest.fixture
+def search_env(monkeypatch):
+    client = FakeOpenSearch(
+        hits=[
+            {"_id": "new", "_score": 2.0, "_source": {"rerank_text": "직무: 서버 개발자"}},
+            {"_id": "legacy", "_score": 1.0, "_source": {}},
+        ],
+        documents={
+            "new": {"title": "서버 개발자", "rerank_text": "직무: 서버 개발자"},
+            "legacy": LEGACY_SOURCE,
+        },
+    )
+    reranker = FakeRerankService()
+    monkeypatch.setattr(lambda_function, "get_opensearch_client", lambda: client)
+    monkeypatch.setattr(lambda_function, "get_rerank_service", lambda: reranker)
+    monkeypatch.setattr(lambda_function, "RERANK_INDEXED_TEXT", True)
+    monkeypatch.setattr(lambda_function, "RETRIEVAL_MODE", "bool")
+    return client, reranker
+
+
+def test_rerank_text_falls_back_to_source_fields(search_env):
+    """rerank_text가 없는 이전 색인 문서는 원본 필드를 추가 조회해 리랭킹 텍스트를 만듦"""
+    client, reranker = search_env
+
+    scores, doc_ids, _ = lambda_function.hybrid_search({"candidate_interest": "백엔드"}, top_k=2,
+                                                       query_vector=np.zeros(4, dtype=np.float32))
+
+    assert reranker.texts["legacy"] == lambda_function.get_rerank_text(LEGACY_SOURCE)
+    assert reranker.texts["new"] == "직무: 서버 개발자"
+    # 원본 필드는 rerank_text가 없는 후보에 대해서만 조회
+    assert client.mget_calls[0] == (["legacy"], ",".join(lambda_function.RERANK_SOURCE_FIELDS))
+    assert doc_ids == ["legacy", "new"]
+
+
+def test_indexed_text_skips_fallback_when_present(search_env):
+    client, _ = search_env
+    client.hits = client.hits[:1]
+
+    lambda_function.hybrid_search({"candidate_interest": "백엔드"}, top_k=1, query_vector=np.zeros(4, dtype=np.float32))
+
+    # 최종 문서 조회(2단계 조회)만 수행
+    assert [ids for ids, _ in client.mget_calls] == [["new"]]
+
+
+def test_invalid_retrieval_mode_returns_400(search_env):
+    """잘못된 retrieval_mode는 빈 200 응답 대신 400"""
+    body = {"user_profile": {"candidate_interest": "백엔드"}, "retrieval_mode": "semantic"}
+
+    response = lambda_function.lambda_handler({"body": json.dumps(body)}, None)
+
+    assert response["statusCode"] == 400
+    assert "semantic" in json.loads(response["body"])["error"]
+
+
+def _hit(doc_id):
+    return {"_id": doc_id, "_score": 100.0, "_source": {"title": doc_id}}
+
+
+class TestReciprocalRankFusion:
+    def test_documents_in_both_lists_rank_first(self):
+        fused = lambda_function.reciprocal_rank_fusion(
+            [[_hit("a"), _hit("b"), _hit("c")], [_hit("c"), _hit("d")]], size=4, rank_constant=60)
+
+        # b와 d는 같은 순위(2위) 점수이므로 먼저 나온 순서를 유지
+        assert [hit["_id"] for hit in fused] == ["c", "a", "b", "d"]
+        assert fused[0]["_score"] == pytest.approx(1 / 63 + 1 / 61)
+        assert fused[1]["_score"] == pytest.approx(1 / 61)
+
+    def test_size_and_source_preserved(self):
+        fused = lambda_function.reciprocal_rank_fusion([[_hit("a"), _hit("b")], [_hit("b")]], size=1, rank_constant=1)
+
+        assert fused == [{"_id": "b", "_score": pytest.approx(1 / 3 + 1 / 2), "_source": {"title": "b"}}]
+
+    def test_empty_lists(self):
+        assert lambda_function.reciprocal_rank_fusion([[], []], size=5) == []
+
+
+@pytest.mark.parametrize("career, expected_clause", [
+    ("신입", {"term": {"career_new_grad": True}}),
+    ("3년", {"bool": {"filter": [{"range": {"career_min_years": {"lte": 3}}},
+                                 {"range": {"career_max_years": {"gte": 3}}}]}}),
+])
+def test_career_range_filter_passes_unnormalized_postings(monkeypatch, career, expected_clause):
+    """경력 필드가 없는 공고(이전 색인, 해석 불가)는 범위 조건과 관계없이 통과"""
+    monkeypatch.setattr(lambda_function, "CAREER_RANGE_FILTER", True)
+
+    should = lambda_function._build_career_filter(career)["bool"]["should"]
+
+    assert should == [expected_clause, {"bool": {"must_not": {"exists": {"field": "career_min_years"}}}}]
+
+
+class TestResolveQueryVector:
+    @pytest.fixture(autouse=True)
+    def no_model(self, monkeypatch):
+        """모델 로드나 인코딩이 일어나면 실패"""
+        def fail(*args, **kwargs):
+            raise AssertionError("embedding model should not be loaded")
+
+        monkeypatch.setattr(lambda_function, "_embedding_model", None)
+        monkeypatch.setattr(lambda_function, "get_embedding_model", fail)
+        monkeypatch.setattr(lambda_function, "compute_query_vector", lambda profile: "encoded")
+
+    def test_precomputed_vector_skips_model_load(self):
+        vector = np.linspace(-1, 1, lambda_function.EMBEDDING_DIM, dtype=np.float32)
+
+        resolved = lambda_function.resolve_query_vector({}, encode_vector(vector))
+
+        np.testing.assert_allclose(resolved, vector, atol=1e-3)
+
+    def test_wrong_dimension_is_reencoded(self):
+        assert lambda_function.resolve_query_vector({}, encode_vector(np.zeros(8))) == "encoded"
+
+    def test_loaded_model_dimension_is_used(self, monkeypatch):
+        monkeypatch.setattr(lambda_function, "_embedding_model", SimpleNamespace(get_sentence_embedding_dimension=lambda: 8))
+        assert lambda_function.resolve_query_vector({}, encode_vector(np.zeros(8))).shape == (8,)
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, True), (True, True), ("true", True), ("1", True), ("yes", True),
+    (False, False), ("false", False), ("False", False), ("0", False), (0, False),
+])
+def test_use_reranker_parsing(monkeypatch, value, expected):
+    """문자열 "false"도 리랭킹 비활성화로 해석"""
+    calls = []
+    monkeypatch.setattr(lambda_function, "resolve_query_vector", lambda profile, vector, dtype: np.zeros(4))
+    monkeypatch.setattr(lambda_function, "hybrid_search", lambda **kwargs: calls.append(kwargs) or ([], [], []))
+    body = {"user_profile": {"candidate_interest": "백엔드"}}
+    if value is not None:
+        body["use_reranker"] = value
+
+    lambda_function.run_search(body)
+
+    assert calls[0]["use_reranker"] is expected
@@ -0,0 +1,98 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from query_embedding import QueryEmbeddingService, normalize_query_text
+from ttl_cache import TTLCache
+
+
+class FakeModel:
+    """호출 횟수와 배치 크기를 기록하는 SentenceTransformer 대역"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.batches = []
+
+    def encode(self, texts, **kwargs):
+        time.sleep(self.delay)
+        self.batches.append(list(texts))
+        return np.array([[float(len(text)), 1.0] for text in texts])
+
+
+class TestTTLCache:
+    def test_lru_eviction(self):
+        cache = TTLCache(maxsize=2, ttl=0)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)  # 가장 오래 사용되지 않은 b 제거
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1 and cache.get("c") == 3
+
+    def test_expiry(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(time, "monotonic", lambda: now[0])
+        cache = TTLCache(maxsize=4, ttl=10)
+        cache.set("a", 1)
+        now[0] += 11
+
+        assert cache.get("a") is None
+        assert cache.stats()["misses"] == 1
+
+    def test_invalid_maxsize(self):
+        with pytest.raises(ValueError):
+            TTLCache(maxsize=0)
+
+
+class TestQueryEmbeddingService:
+    def test_normalized_queries_share_cache(self):
+        model = FakeModel()
+        service = QueryEmbeddingService(lambda: model)
+
+        first = service.encode("백엔드   개발자")
+        second = service.encode("백엔드 개발자")
+
+        assert normalize_query_text(" 백엔드\n개발자 ") == "백엔드 개발자"
+        assert len(model.batches) == 1 and model.batches[0] == ["query: 백엔드 개발자"]
+        assert first is second
+        assert not first.flags.writeable
+
+    def test_case_variants_are_encoded_separately(self):
+        """e5 토크나이저는 대소문자를 구분하므로 캐시 상태와 관계없이 각 텍스트 그대로 인코딩"""
+        model = FakeModel()
+        service = QueryEmbeddingService(lambda: model)
+
+        service.encode("Python 백엔드")
+        service.encode("python 백엔드")
+
+        assert model.batches == [["query: Python 백엔드"], ["query: python 백엔드"]]
+
+    def test_concurrent_requests_are_batched(self):
+        model = FakeModel(delay=0.01)
+        service = QueryEmbeddingService(lambda: model, max_batch_size=8, max_wait_ms=50)
+        queries = [f"질문 {i}" for i in range(8)]
+        results = {}
+
+        def worker(query):
+            results[query] = service.encode(query)
+
+        threads = [threading.Thread(target=worker, args=(q,)) for q in queries]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(results) == 8
+        assert sum(len(batch) for batch in model.batches) == 8
+        assert len(model.batches) < 8  # 동시 요청이 묶여 인코딩 호출 수가 줄어듦
+
+    def test_encode_error_propagates(self):
+        def failing_provider():
+            raise RuntimeError("model unavailable")
+
+        service = QueryEmbeddingService(failing_provider)
+        with pytest.raises(RuntimeError):
+            service.encode("질문")
@@ -0,0 +1,35 @@
+import pytest
+
+from region_codes import REMOTE_REGION, parse_regions, region_terms
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("서울특별시 강남구 테헤란로 142", [("서울", "서울 강남구")]),
+    ("서울, 경기", [("서울", None), ("경기", None)]),
+    ("경기 광주시 오포읍", [("경기", "경기 광주시")]),
+    # 시/도 없이 쓰는 지명
+    ("판교", [("경기", "경기 성남시")]),
+    ("판교역 인근", [("경기", "경기 성남시")]),
+    ("경기 판교", [("경기", "경기 성남시")]),
+    ("경기도 성남시 분당구 판교역로 166", [("경기", "경기 성남시")]),
+    ("여의도 / 송도", [("서울", "서울 영등포구"), ("인천", "인천 연수구")]),
+    # 원격 근무
+    ("원격근무", [(REMOTE_REGION, None)]),
+    ("재택", [(REMOTE_REGION, None)]),
+    ("Remote", [(REMOTE_REGION, None)]),
+    ("서울 강남구 (재택 병행)", [(REMOTE_REGION, None), ("서울", "서울 강남구")]),
+    # 특정할 수 없는 지역
+    ("중구", []),
+    ("", []),
+])
+def test_parse_regions(text, expected):
+    assert parse_regions(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("판교", ([], ["경기 성남시"])),
+    ("원격근무", ([REMOTE_REGION], [])),
+    ("판교, 재택", ([REMOTE_REGION], ["경기 성남시"])),
+])
+def test_region_terms(text, expected):
+    assert region_terms(text) == expected
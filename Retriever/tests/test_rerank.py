@@ -0,0 +1,53 @@
+import pytest
+
+from rerank import RerankService, choose_batch_size
+
+
+class FakeCrossEncoder:
+    """문서 텍스트 길이를 점수로 돌려주는 CrossEncoder 대역"""
+
+    def __init__(self):
+        self.batches = []
+
+    def predict(self, pairs, **kwargs):
+        self.batches.append(len(pairs))
+        return [float(len(text)) for _, text in pairs]
+
+
+@pytest.mark.parametrize("num_candidates, max_batch, expected", [(0, 16, 1), (10, 16, 10), (25, 16, 13), (32, 16, 16)])
+def test_choose_batch_size(num_candidates, max_batch, expected):
+    assert choose_batch_size(num_candidates, max_batch) == expected
+
+
+class TestRerankService:
+    def setup_method(self):
+        self.model = FakeCrossEncoder()
+        self.texts = ["a", "aaaa", "aa", "aaa"]
+        self.service = RerankService(lambda: self.model, max_batch_size=16)
+
+    def test_ranks_by_score(self):
+        ranked = self.service.rerank("백엔드", ["d0", "d1", "d2", "d3"], self.texts.__getitem__, top_k=2)
+
+        assert ranked == [(1, 4.0), (3, 3.0)]
+
+    def test_cached_scores_skip_prediction(self):
+        doc_ids = ["d0", "d1", "d2", "d3"]
+        self.service.rerank("백엔드", doc_ids, self.texts.__getitem__, top_k=2)
+        requested = []
+
+        def get_text(idx):
+            requested.append(idx)
+            return self.texts[idx]
+
+        # 공백/대소문자만 다른 같은 쿼리는 캐시된 점수 사용
+        ranked = self.service.rerank("  백엔드 ", doc_ids, get_text, top_k=2)
+
+        assert ranked == [(1, 4.0), (3, 3.0)]
+        assert requested == []
+        assert self.service.stats()["predicted_pairs"] == 4
+
+    def test_batches_split_evenly(self):
+        service = RerankService(lambda: self.model, max_batch_size=16)
+        service.rerank("q", [f"d{i}" for i in range(25)], lambda idx: "x" * idx, top_k=5)
+
+        assert self.model.batches == [13, 12]
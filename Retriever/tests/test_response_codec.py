@@ -0,0 +1,51 @@
+import pytest
+
+import response_codec
+from response_codec import decode_body, encode_body, negotiate_format
+
+DATA = {"scores": [0.5, 0.25], "doc_ids": ["job-1", "job-2"], "documents": [{"title": "백엔드 개발자"}, {}]}
+
+
+@pytest.mark.parametrize("requested, expected", [
+    (None, "json"),
+    ("msgpack", "msgpack"),
+    (["avro", "orjson", "msgpack"], "orjson"),
+    (["avro"], "json"),
+])
+def test_negotiate_format(requested, expected):
+    assert negotiate_format(requested) == expected
+
+
+def test_negotiate_format_skips_missing_library(monkeypatch):
+    monkeypatch.setattr(response_codec, "msgpack", None)
+    assert negotiate_format(["msgpack", "orjson"]) == "orjson"
+
+
+@pytest.mark.parametrize("fmt", ["json", "orjson", "msgpack"])
+@pytest.mark.parametrize("compression", [None, "zstd"])
+def test_round_trip(fmt, compression):
+    body, headers, is_base64 = encode_body(DATA, fmt, compression)
+
+    assert decode_body(body, headers, is_base64) == DATA
+    assert ("Content-Encoding" in headers) == (compression == "zstd")
+    # 바이너리 본문(msgpack, zstd)만 base64로 감싸고, JSON은 Lambda envelope에 그대로 담김
+    assert is_base64 == (fmt == "msgpack" or compression == "zstd")
+
+
+def test_unknown_format_falls_back_to_json():
+    body, headers, is_base64 = encode_body(DATA, "avro")
+    assert headers == {"Content-Type": "application/json"}
+    assert not is_base64 and decode_body(body) == DATA
+
+
+def test_decode_bytes_from_http_response():
+    """HTTP 사이드카 응답처럼 bytes 본문과 소문자 헤더도 복원"""
+    body, headers, _ = encode_body(DATA, "orjson")
+    assert decode_body(body.encode("utf-8"), {"content-type": "application/json"}) == DATA
+
+
+def test_decode_zstd_without_library_raises(monkeypatch):
+    body, headers, is_base64 = encode_body(DATA, "json", "zstd")
+    monkeypatch.setattr(response_codec, "zstandard", None)
+    with pytest.raises(ValueError):
+        decode_body(body, headers, is_base64)
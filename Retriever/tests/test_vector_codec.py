@@ -0,0 +1,40 @@
+import base64
+
+import numpy as np
+import pytest
+
+from vector_codec import decode_vector, encode_vector
+
+
+@pytest.mark.parametrize("dtype, itemsize", [("float16", 2), ("float32", 4)])
+def test_round_trip(dtype, itemsize):
+    vector = np.random.default_rng(0).standard_normal(1024).astype(np.float32)
+    vector /= np.linalg.norm(vector)
+
+    encoded = encode_vector(vector, dtype)
+    decoded = decode_vector(encoded, dtype)
+
+    assert len(base64.b64decode(encoded)) == 1024 * itemsize
+    assert decoded.dtype == np.float32
+    # float16 정밀도 안에서 복원되고, 코사인 유사도는 사실상 그대로 유지
+    np.testing.assert_allclose(decoded, vector, atol=1e-3 if dtype == "float16" else 0)
+    assert float(decoded @ vector) == pytest.approx(1.0, abs=1e-4)
+
+
+def test_float16_is_smaller_than_json_floats():
+    vector = np.full(1024, 0.0123456, dtype=np.float32)
+    assert len(encode_vector(vector)) < len(str(vector.tolist())) / 5
+
+
+def test_accepts_lists():
+    np.testing.assert_array_equal(decode_vector(encode_vector([0.5, -1.0, 2.0])), [0.5, -1.0, 2.0])
+
+
+@pytest.mark.parametrize("data, dtype", [
+    (encode_vector([1.0, 2.0]), "bfloat16"),
+    (base64.b64encode(b"\x00\x01\x02").decode("ascii"), "float16"),
+    ("not base64!", "float16"),
+])
+def test_invalid_input_raises(data, dtype):
+    with pytest.raises(ValueError):
+        decode_vector(data, dtype)
@@ -0,0 +1,72 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable
+
+
+class TTLCache:
+    """
+    스레드 안전한 LRU + TTL 캐시
+
+    - 용량(maxsize)을 넘으면 가장 오래 사용되지 않은 항목부터 제거합니다.
+    - 저장 후 ttl초가 지난 항목은 조회 시점에 만료 처리합니다.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600.0):
+        if maxsize <= 0:
+            raise ValueError("maxsize는 0보다 커야 합니다.")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """키에 해당하는 값을 반환합니다. 없거나 만료되었으면 default를 반환합니다."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, expires_at = entry
+            if self.ttl and expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """값을 저장하고, 용량을 넘으면 LRU 항목을 제거합니다."""
+        expires_at = time.monotonic() + self.ttl if self.ttl else float("inf")
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 적중 통계를 반환합니다."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
@@ -0,0 +1,34 @@
+import base64
+from typing import Sequence, Union
+
+import numpy as np
+
+# 지원하는 직렬화 dtype (리틀 엔디언 고정)
+SUPPORTED_DTYPES = {
+    "float16": np.dtype("<f2"),
+    "float32": np.dtype("<f4"),
+}
+
+
+def _resolve_dtype(dtype: str) -> np.dtype:
+    if dtype not in SUPPORTED_DTYPES:
+        raise ValueError(f"지원하지 않는 벡터 dtype입니다: {dtype} (지원: {', '.join(SUPPORTED_DTYPES)})")
+    return SUPPORTED_DTYPES[dtype]
+
+
+def encode_vector(vector: Union[np.ndarray, Sequence[float]], dtype: str = "float16") -> str:
+    """
+    임베딩 벡터를 base64 문자열로 직렬화합니다.
+    float16이면 JSON float 리스트(1024차원 기준 약 20KB) 대비 약 2.7KB로 줄어듭니다.
+    """
+    array = np.asarray(vector, dtype=_resolve_dtype(dtype)).ravel()
+    return base64.b64encode(array.tobytes()).decode("ascii")
+
+
+def decode_vector(data: str, dtype: str = "float16") -> np.ndarray:
+    """base64 문자열을 float32 임베딩 벡터로 복원합니다."""
+    raw = base64.b64decode(data, validate=True)
+    np_dtype = _resolve_dtype(dtype)
+    if len(raw) % np_dtype.itemsize:
+        raise ValueError(f"벡터 바이트 길이({len(raw)})가 {dtype} 크기와 맞지 않습니다.")
+    return np.frombuffer(raw, dtype=np_dtype).astype(np.float32)
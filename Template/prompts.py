@@ -329,4 +329,58 @@ web_search_planner_prompt = PromptTemplate(
 
 판단:
 """
-)
\ No newline at end of file
+)
+# 의도 분석 + 회사 컨텍스트 판단 + 웹 검색 필요 여부를 한 번의 구조화 출력 호출로 처리하는 프롬프트 (ROUTER_MODE=combined)
+# intent_analysis_prompt, company_context_planner_prompt, web_search_planner_prompt의 판단 기준을 합친 것
+combined_router_prompt = PromptTemplate(
+    input_variables=["chat_history", "question", "current_company", "available_companies", "company_context"],
+    template="""당신은 취업 상담 대화의 라우터입니다. 대화 기록과 현재 질문을 바탕으로 아래 세 가지를 한 번에 판단하세요.
+
+[대화 기록]
+{chat_history}
+
+[현재 포커스된 회사]
+{current_company}
+
+[사용 가능한 다른 회사]
+{available_companies}
+
+[제공된 정보 (선택된 채용 공고)]
+{company_context}
+
+[현재 사용자 질문]
+{question}
+
+---
+1. intent: 사용자 의도를 다음 중 하나로 분류합니다.
+   - initial_search: 대화의 가장 처음에서, 구체적인 조건(전공, 경력 등)을 제시하며 직무 추천을 '처음으로' 요청하는 경우.
+   - new_search: 이미 직무 목록을 추천받은 후에, "다른 회사 추천해줘", "이거 말고 다른거" 와 같이 '새로운 목록'을 요구하는 경우.
+   - select_job: 바로 직전의 AI 응답이 '추천 공고 목록'이었고, 사용자가 그 목록에서 특정 항목을 선택하는 경우. (예: "1번 알려줘", "두 번째 회사 정보 좀")
+   - follow_up_qa: 특정 회사에 대한 '심층 분석이 완료된 후', 그 회사에 대해 추가적인 질문을 하는 경우.
+   - chit_chat: "고마워", "안녕" 등 직무 추천과 직접적인 관련이 없는 일상적인 대화.
+
+2. needs_other_company_context: 질문에 답하려면 [사용 가능한 다른 회사]의 정보가 필요한가?
+   - 비교를 요청하거나("A회사와 B회사 중 어느 쪽이"), "다른 회사는?", "B회사도 비슷한가?" 같은 연관 질문이면 true, 아니면 false.
+   - 사용 가능한 다른 회사가 없으면 false.
+
+3. needs_web_search: 질문에 답하기 위해 [제공된 정보]만으로 부족해 외부 웹 검색이 필요한가?
+   - 필요하면 true, 제공된 정보만으로 충분하거나 follow_up_qa가 아니면 false.
+"""
+)
+
+# combined_router_prompt의 출력 JSON 스키마 (structured output)
+combined_router_schema = {
+    "title": "route_plan",
+    "description": "한 턴의 의도 및 후속 단계 판단",
+    "type": "object",
+    "properties": {
+        "intent": {
+            "type": "string",
+            "enum": ["initial_search", "new_search", "select_job", "follow_up_qa", "chit_chat"],
+        },
+        "needs_other_company_context": {"type": "boolean"},
+        "needs_web_search": {"type": "boolean"},
+    },
+    "required": ["intent", "needs_other_company_context", "needs_web_search"],
+    "additionalProperties": False,
+}
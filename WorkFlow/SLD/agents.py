@@ -1,14 +1,16 @@
-from typing import Dict, Any, Union, List, Annotated, TypedDict
+from typing import Dict, Any, Union, List, Annotated, TypedDict, Callable
+import asyncio
 import logging
 import os
 from dotenv import load_dotenv
 from langgraph.graph import StateGraph, END
+from langchain_core.runnables import RunnableLambda
 from datetime import datetime
 from langsmith import Client, traceable
 from WorkFlow.SLD.tools import (
     search_company_info_tool, get_preparation_advice_tool, 
     record_history_tool, generate_final_answer_tool, analyze_intent_tool, contextual_qa_tool,
-    present_candidates_tool, load_selected_job_tool, recommend_jobs_tool, reformulate_query_tool,
+    present_candidates_tool, load_selected_job_tool, recommend_jobs_tool, recommend_jobs_async_tool, reformulate_query_tool,
     research_for_advice_tool, formulate_retrieval_query_tool, request_selection_tool, reset_selection_tool,
     resolve_company_context_tool, show_full_posting_and_confirm_tool, expert_research_tool, confirmation_router_tool, request_further_action_tool
 )
@@ -37,9 +39,11 @@ class GraphState(TypedDict, total=False):
     user_input: Annotated[Dict[str, Any], last_write_reducer]
     user_id: Annotated[int, last_write_reducer]
     company_name_filter: Annotated[List[str], last_write_reducer]
+    retrieval_query_cache: Annotated[Dict[str, Any], last_write_reducer]
 
     # --- 대화 흐름 및 맥락 관리 ---
     intent: Annotated[str, last_write_reducer]
+    route_plan: Annotated[Dict[str, Any], last_write_reducer]  # ROUTER_MODE=combined의 회사 컨텍스트/웹 검색 판단
     chat_history: Annotated[list, last_write_reducer]
     conversation_turn: Annotated[int, last_write_reducer]
     summary: Annotated[str, last_write_reducer]
@@ -216,6 +220,12 @@ def recommend_jobs(state: GraphState) -> GraphState:
     result = recommend_jobs_tool.func(state)  # .func를 사용하여 원본 함수에 직접 접근
     return {**state, **result}
 
+@traceable(name="recommend_jobs_node")
+async def arecommend_jobs(state: GraphState) -> GraphState:
+    """직무 추천 노드 (비동기, ainvoke 시 사용)"""
+    result = await recommend_jobs_async_tool.coroutine(state)
+    return {**state, **result}
+
 
 @traceable(name="show_and_confirm_node")
 def show_and_confirm(state: GraphState) -> GraphState:
@@ -242,18 +252,22 @@ def expert_research(state: GraphState) -> GraphState:
     result = expert_research_tool.func(state)
     return {**state, **result}
 
+@traceable(name="start_deep_analysis_node")
+def start_deep_analysis(state: GraphState) -> GraphState:
+    """심층 분석 시작 노드 (회사 정보/면접·문화 검색 브랜치로 분기)"""
+    return {"awaiting_analysis_confirmation": False} # 심층 분석이 시작되므로 플래그를 초기화
+
+# get_company_info / research_for_advice는 병렬 브랜치로 실행되므로, 서로의 결과를 이전 상태로
+# 덮어쓰지 않도록 전체 state가 아닌 변경된 키만 반환합니다.
 @traceable(name="get_company_info_node")
 def get_company_info(state: GraphState) -> GraphState:
     """회사 정보 검색 노드 (웹 검색)"""
-    state["awaiting_analysis_confirmation"] = False # 심층 분석이 시작되므로 플래그를 초기화
-    result = search_company_info_tool.func(state)
-    return {**state, **result}
+    return search_company_info_tool.func(state)
 
 @traceable(name="research_for_advice_node")
 def research_for_advice(state: GraphState) -> GraphState:
     """면접 조언 생성을 위해, 선택된 회사/직무에 대한 웹 검색"""
-    result = research_for_advice_tool.func(state)
-    return {**state, **result}
+    return research_for_advice_tool.func(state)
 
 @traceable(name="get_preparation_advice_node")
 def get_preparation_advice(state: GraphState) -> GraphState:
@@ -273,6 +287,17 @@ def record_history(state: GraphState) -> GraphState:
     # 이 도구는 state 전체를 수정하고 반환하므로, 병합 없이 그대로 반환
     return record_history_tool.func(state)
 
+def _node(func: Callable, afunc: Callable = None) -> RunnableLambda:
+    """
+    동기/비동기 실행을 모두 지원하는 노드를 만듭니다.
+    invoke 시에는 func를, ainvoke 시에는 afunc(없으면 func를 스레드에서 실행)를 사용해
+    LLM/웹 검색 같은 블로킹 호출이 이벤트 루프를 막지 않도록 합니다.
+    """
+    if afunc is None:
+        async def afunc(state):
+            return await asyncio.to_thread(func, state)
+    return RunnableLambda(func, afunc=afunc, name=func.__name__)
+
 # 워크플로우 그래프 빌드
 @traceable(name="build_workflow_graph")
 def build_workflow_graph() -> StateGraph:
@@ -281,26 +306,27 @@ def build_workflow_graph() -> StateGraph:
     workflow = StateGraph(GraphState)
     
     # 노드 추가
-    workflow.add_node("parse_input", parse_input)
-    workflow.add_node("analyze_intent", analyze_intent)
-    workflow.add_node("present_candidates", present_candidates) 
-    workflow.add_node("load_selected_job", load_selected_job) 
-    workflow.add_node("recommend_jobs", recommend_jobs)
-    workflow.add_node("show_and_confirm", show_and_confirm)
-    workflow.add_node("confirmation_router", confirmation_router)  
-    workflow.add_node("expert_research", expert_research) # Perplexity 에이전트 노드
-    workflow.add_node("request_further_action", request_further_action)
-    workflow.add_node("reformulate_query", reformulate_query)
-    workflow.add_node("formulate_retrieval_query", formulate_retrieval_query)
-    workflow.add_node("request_selection", request_selection)
-    workflow.add_node("reset_selection", reset_selection)
-    workflow.add_node("resolve_company_context", resolve_company_context)
-    workflow.add_node("get_company_info", get_company_info)
-    workflow.add_node("research_for_advice", research_for_advice)
-    workflow.add_node("get_preparation_advice", get_preparation_advice)
-    workflow.add_node("contextual_qa", contextual_qa)
-    workflow.add_node("generate_final_answer", generate_final_answer) 
-    workflow.add_node("record_history", record_history) 
+    workflow.add_node("parse_input", _node(parse_input))
+    workflow.add_node("analyze_intent", _node(analyze_intent))
+    workflow.add_node("present_candidates", _node(present_candidates)) 
+    workflow.add_node("load_selected_job", _node(load_selected_job)) 
+    workflow.add_node("recommend_jobs", _node(recommend_jobs, arecommend_jobs))
+    workflow.add_node("show_and_confirm", _node(show_and_confirm))
+    workflow.add_node("confirmation_router", _node(confirmation_router))  
+    workflow.add_node("expert_research", _node(expert_research)) # Perplexity 에이전트 노드
+    workflow.add_node("request_further_action", _node(request_further_action))
+    workflow.add_node("reformulate_query", _node(reformulate_query))
+    workflow.add_node("formulate_retrieval_query", _node(formulate_retrieval_query))
+    workflow.add_node("request_selection", _node(request_selection))
+    workflow.add_node("reset_selection", _node(reset_selection))
+    workflow.add_node("resolve_company_context", _node(resolve_company_context))
+    workflow.add_node("start_deep_analysis", _node(start_deep_analysis))
+    workflow.add_node("get_company_info", _node(get_company_info))
+    workflow.add_node("research_for_advice", _node(research_for_advice))
+    workflow.add_node("get_preparation_advice", _node(get_preparation_advice))
+    workflow.add_node("contextual_qa", _node(contextual_qa))
+    workflow.add_node("generate_final_answer", _node(generate_final_answer)) 
+    workflow.add_node("record_history", _node(record_history)) 
     
     # 시작 노드 설정
     workflow.set_entry_point("parse_input")
@@ -333,7 +359,7 @@ def build_workflow_graph() -> StateGraph:
     workflow.add_edge("recommend_jobs", "present_candidates")
     workflow.add_edge("present_candidates", "generate_final_answer")
     
-    # 2. 선택 후 심층 분석 경로: load -> get_company_info -> ... -> generate_final_answer 
+    # 2. 선택 후 심층 분석 경로: load -> start_deep_analysis -> (get_company_info | research_for_advice) -> ... -> generate_final_answer 
     workflow.add_edge("load_selected_job", "show_and_confirm")
     workflow.add_edge("show_and_confirm", "generate_final_answer")
     
@@ -342,7 +368,7 @@ def build_workflow_graph() -> StateGraph:
         "confirmation_router",
         route_after_confirmation,
         {
-            "start_deep_analysis": "get_company_info",      # 동의 -> 심층 분석 시작
+            "start_deep_analysis": "start_deep_analysis",   # 동의 -> 심층 분석 시작
             "reset_and_reformulate": "reset_selection",     # 다른 회사 -> 새 검색 시작
             "expert_research": "expert_research",           # 추가 질문 -> 전문가 검색
             "request_further_action": "request_further_action" # 잡담 -> 재요청
@@ -351,8 +377,11 @@ def build_workflow_graph() -> StateGraph:
 
     workflow.add_edge("request_further_action", "generate_final_answer")
 
-    workflow.add_edge("get_company_info", "research_for_advice") # get_company_info 다음에 research 추가
-    workflow.add_edge("research_for_advice", "get_preparation_advice") # research 결과를 advice 생성에 사용
+    # 회사 정보 검색과 면접/문화 검색은 서로 독립적이므로 병렬 브랜치로 실행
+    workflow.add_edge("start_deep_analysis", "get_company_info")
+    workflow.add_edge("start_deep_analysis", "research_for_advice")
+    # 두 브랜치가 모두 끝나면 advice 생성 (research 결과를 advice 생성에 사용)
+    workflow.add_edge(["get_company_info", "research_for_advice"], "get_preparation_advice")
     workflow.add_edge("get_preparation_advice", "generate_final_answer") # 최종적으로 종합
 
     # 2.1 다른 회사를 찾고 심층분석
@@ -407,4 +436,32 @@ def run_job_advisor_workflow(current_input: Dict[str, Any], previous_state: Dict
         import traceback
         logger.error(traceback.format_exc())
         # 오류 발생 시, 다음 턴에 영향을 주지 않도록 이전 상태를 그대로 반환할 수 있습니다.
-        return {**previous_state, "error": str(e), "final_answer": "오류가 발생했습니다. 다시 시도해주세요."}
\ No newline at end of file
+        return {**previous_state, "error": str(e), "final_answer": "오류가 발생했습니다. 다시 시도해주세요."}
+
+@traceable(name="job_advisor_workflow_async")
+async def run_job_advisor_workflow_async(current_input: Dict[str, Any], previous_state: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    워크플로우 실행 함수의 비동기 버전 (FastAPI 등 이벤트 루프 환경용).
+    리트리버 호출은 비동기 클라이언트로, 나머지 노드는 스레드에서 실행됩니다.
+    """
+    try:
+        if previous_state is None:
+            previous_state = {}
+
+        state_to_run = {**previous_state, "user_input": current_input}
+
+        logger.info(f"Starting async workflow with combined state: {state_to_run}")
+
+        os.environ["LANGCHAIN_TRACING_V2"] = "true"
+        os.environ["LANGCHAIN_PROJECT"] = langsmith_project
+
+        final_state = await workflow_graph.ainvoke(state_to_run)
+        logger.info("Workflow completed successfully")
+
+        return final_state
+
+    except Exception as e:
+        logger.error(f"워크플로우 실행 오류: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return {**previous_state, "error": str(e), "final_answer": "오류가 발생했습니다. 다시 시도해주세요."}
@@ -0,0 +1,248 @@
+"""
+로컬 의도 분류기 (LLM 라우터 대체 옵션)
+
+리트리버가 이미 로드하는 e5 쿼리 임베딩(+ 대화 상태 플래그) 위에 단계별 LogisticRegression 헤드를 학습해
+analyze_intent_tool / confirmation_router_tool의 분류를 CPU에서 수 ms 안에 처리합니다.
+확률이 INTENT_CLASSIFIER_THRESHOLD 미만이거나 모델이 없으면 None을 반환하고, 이 경우 LLM이 분류합니다.
+
+- INTENT_BACKEND=classifier 일 때만 사용 (기본값: llm)
+- 학습 데이터: INTENT_TRAINING_LOG를 지정하면 LLM이 분류한 (질문, 상태 플래그, 의도)를 JSONL로 기록
+- 학습: python -m WorkFlow.SLD.intent_classifier --data intent_log.jsonl --output intent_classifier.joblib
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 의도 분류 백엔드: llm (기본값) | classifier (로컬 분류기, 확신이 낮으면 LLM으로 폴백)
+INTENT_BACKEND = os.getenv("INTENT_BACKEND", "llm")
+INTENT_CLASSIFIER_PATH = os.getenv(
+    "INTENT_CLASSIFIER_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "intent_classifier.joblib")
+)
+# 이 확률 이상일 때만 분류기 결과를 사용
+INTENT_CLASSIFIER_THRESHOLD = float(os.getenv("INTENT_CLASSIFIER_THRESHOLD", "0.85"))
+# LLM 분류 결과를 학습 데이터로 기록할 JSONL 경로 (비어 있으면 기록하지 않음)
+INTENT_TRAINING_LOG = os.getenv("INTENT_TRAINING_LOG", "")
+
+# 단계별 유효한 레이블
+STAGE_LABELS = {
+    "intent": ["initial_search", "new_search", "select_job", "follow_up_qa", "chit_chat"],
+    "confirmation": ["start_deep_analysis", "reset_and_reformulate", "expert_research", "request_further_action"],
+}
+
+RETRIEVER_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "Retriever")
+
+
+def state_features(state: Dict[str, Any]) -> List[float]:
+    """질문만으로 구분할 수 없는 의도(select_job vs follow_up_qa 등)를 위한 대화 상태 플래그"""
+    return [
+        float(bool(state.get("job_list"))),
+        float(bool(state.get("awaiting_selection"))),
+        float(bool(state.get("selected_job"))),
+        float(bool(state.get("awaiting_analysis_confirmation"))),
+    ]
+
+
+def _default_encoder() -> Callable[[str], np.ndarray]:
+    """
+    e5 쿼리 임베딩 함수 (LRU 캐시 + 마이크로 배칭)
+
+    인프로세스 리트리버(lambda_function)가 이미 로드되어 있으면 그 임베딩 서비스를 공유하고,
+    아니면 임베딩 모델만 따로 로드합니다. (lambda_function을 임포트하지 않으므로 OpenSearch 클라이언트/리랭커는 로드하지 않음)
+    """
+    if RETRIEVER_DIR not in sys.path:
+        sys.path.append(RETRIEVER_DIR)
+    if "lambda_function" in sys.modules:
+        return sys.modules["lambda_function"].get_query_embedder().encode
+
+    from inference_backend import load_embedding_model
+    from query_embedding import QueryEmbeddingService
+
+    model = None
+    model_lock = threading.Lock()
+
+    def model_provider():
+        nonlocal model
+        with model_lock:
+            if model is None:
+                model = load_embedding_model()
+        return model
+
+    return QueryEmbeddingService(model_provider=model_provider, prefix="query: ").encode
+
+
+def build_features(encode: Callable[[str], np.ndarray], question: str, flags: List[float]) -> np.ndarray:
+    return np.concatenate([np.asarray(encode(question), dtype=np.float32), np.asarray(flags, dtype=np.float32)])
+
+
+class IntentClassifier:
+    """단계별(intent / confirmation) LogisticRegression 분류기"""
+
+    def __init__(self, models: Dict[str, Any], encode: Optional[Callable[[str], np.ndarray]] = None,
+                 threshold: float = INTENT_CLASSIFIER_THRESHOLD):
+        self.models = models
+        self._encode = encode
+        self.threshold = threshold
+
+    @property
+    def encode(self) -> Callable[[str], np.ndarray]:
+        if self._encode is None:
+            self._encode = _default_encoder()
+        return self._encode
+
+    def predict(self, stage: str, question: str, state: Optional[Dict[str, Any]] = None) -> Optional[Tuple[str, float]]:
+        """(레이블, 확률)을 반환합니다. 학습되지 않은 단계이거나 확률이 임계값 미만이면 None."""
+        return self.predict_with_flags(stage, question, state_features(state or {}))
+
+    def predict_with_flags(self, stage: str, question: str, flags: List[float]) -> Optional[Tuple[str, float]]:
+        model = self.models.get(stage)
+        if model is None or not question:
+            return None
+        features = build_features(self.encode, question, flags)
+        probabilities = model.predict_proba(features.reshape(1, -1))[0]
+        best = int(np.argmax(probabilities))
+        if probabilities[best] < self.threshold:
+            return None
+        return str(model.classes_[best]), float(probabilities[best])
+
+
+def train_intent_classifier(examples: List[Dict[str, Any]], encode: Callable[[str], np.ndarray],
+                            min_examples: int = 20) -> Dict[str, Any]:
+    """
+    기록된 (질문, 상태 플래그, LLM 의도) 예시로 단계별 분류기를 학습합니다.
+
+    Args:
+        examples (List[Dict]): {"stage", "question", "features", "label"} 목록 (INTENT_TRAINING_LOG 형식)
+        encode (Callable): 질문 -> 임베딩 벡터
+        min_examples (int): 단계별 최소 예시 수 (부족하거나 레이블이 하나뿐인 단계는 학습하지 않음)
+    """
+    from sklearn.linear_model import LogisticRegression
+
+    by_stage = defaultdict(list)
+    for example in examples:
+        if example.get("label") in STAGE_LABELS.get(example.get("stage"), []):
+            by_stage[example["stage"]].append(example)
+
+    models = {}
+    for stage, stage_examples in by_stage.items():
+        labels = [example["label"] for example in stage_examples]
+        if len(stage_examples) < min_examples or len(set(labels)) < 2:
+            logger.warning(f"Skipping '{stage}' classifier: {len(stage_examples)} examples, labels {dict(Counter(labels))}")
+            continue
+        features = np.stack([build_features(encode, example["question"], example.get("features", [0.0] * 4))
+                             for example in stage_examples])
+        model = LogisticRegression(max_iter=1000, class_weight="balanced")
+        model.fit(features, labels)
+        models[stage] = model
+        logger.info(f"Trained '{stage}' classifier on {len(stage_examples)} examples: {dict(Counter(labels))}")
+    return models
+
+
+def save_intent_classifier(models: Dict[str, Any], path: str = INTENT_CLASSIFIER_PATH) -> None:
+    import joblib
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    joblib.dump({"models": models}, path)
+
+
+def load_intent_classifier(path: str = INTENT_CLASSIFIER_PATH, **kwargs) -> IntentClassifier:
+    import joblib
+    return IntentClassifier(joblib.load(path)["models"], **kwargs)
+
+
+_intent_classifier = None
+_intent_classifier_failed = False
+_intent_classifier_lock = threading.Lock()
+
+def get_intent_classifier() -> Optional[IntentClassifier]:
+    """
+    INTENT_BACKEND=classifier일 때 학습된 분류기를 반환합니다.
+    모델 파일을 불러올 수 없으면 None을 반환하고, 이후에는 재시도하지 않습니다. (LLM으로 분류)
+    """
+    global _intent_classifier, _intent_classifier_failed
+    if INTENT_BACKEND != "classifier":
+        return None
+    with _intent_classifier_lock:
+        if _intent_classifier is None and not _intent_classifier_failed:
+            try:
+                _intent_classifier = load_intent_classifier()
+                logger.info(f"Intent classifier loaded: stages {sorted(_intent_classifier.models)}")
+            except Exception as e:
+                _intent_classifier_failed = True
+                logger.warning(f"Intent classifier unavailable, falling back to LLM: {e}")
+    return _intent_classifier
+
+
+def predict_with_classifier(stage: str, question: str, state: Optional[Dict[str, Any]] = None) -> Optional[Tuple[str, float]]:
+    """로컬 분류기로 예측합니다. 비활성화되었거나 확신이 낮거나 오류가 나면 None. (LLM 폴백)"""
+    classifier = get_intent_classifier()
+    if classifier is None:
+        return None
+    try:
+        return classifier.predict(stage, question, state)
+    except Exception as e:
+        logger.warning(f"Intent classifier prediction failed ({stage}): {e}")
+        return None
+
+
+_training_log_lock = threading.Lock()
+
+def log_training_example(stage: str, question: str, state: Dict[str, Any], label: str) -> None:
+    """LLM 분류 결과를 학습 데이터로 기록합니다. (INTENT_TRAINING_LOG가 설정된 경우)"""
+    if not INTENT_TRAINING_LOG or not question or label not in STAGE_LABELS.get(stage, []):
+        return
+    record = {"stage": stage, "question": question, "features": state_features(state or {}), "label": label}
+    try:
+        with _training_log_lock, open(INTENT_TRAINING_LOG, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    except OSError as e:
+        logger.warning(f"Failed to write intent training example: {e}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="로컬 의도 분류기 학습 (LLM 분류 로그 기반)")
+    parser.add_argument("--data", required=True, help="INTENT_TRAINING_LOG 형식의 JSONL 파일")
+    parser.add_argument("--output", default=INTENT_CLASSIFIER_PATH, help="저장할 모델 경로")
+    parser.add_argument("--min-examples", type=int, default=20, help="단계별 최소 학습 예시 수")
+    parser.add_argument("--holdout", type=float, default=0.2, help="정확도 평가용 홀드아웃 비율 (0이면 평가 생략)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    with open(args.data, encoding="utf-8") as f:
+        examples = [json.loads(line) for line in f if line.strip()]
+
+    encode = _default_encoder()
+    if args.holdout > 0:
+        # 홀드아웃으로 단계별 정확도와 임계값 이상 커버리지(LLM 호출을 대체하는 비율) 확인
+        rng = np.random.default_rng(0)
+        mask = rng.random(len(examples)) < args.holdout
+        train = [e for e, held in zip(examples, mask) if not held]
+        test = [e for e, held in zip(examples, mask) if held]
+        classifier = IntentClassifier(train_intent_classifier(train, encode, args.min_examples), encode=encode)
+        for stage in classifier.models:
+            stage_test = [e for e in test if e.get("stage") == stage]
+            predictions = [classifier.predict_with_flags(stage, e["question"], e.get("features", [0.0] * 4)) for e in stage_test]
+            covered = [(p, e) for p, e in zip(predictions, stage_test) if p is not None]
+            correct = sum(p[0] == e["label"] for p, e in covered)
+            print(f"{stage}: {len(stage_test)} held out, coverage {len(covered) / max(len(stage_test), 1):.0%}, "
+                  f"accuracy on covered {correct / max(len(covered), 1):.1%}")
+
+    models = train_intent_classifier(examples, encode, args.min_examples)
+    if not models:
+        print("학습할 수 있는 단계가 없습니다.")
+        return 1
+    save_intent_classifier(models, args.output)
+    print(f"저장 완료: {args.output} (단계: {', '.join(sorted(models))})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+"""
+규칙 기반 의도 사전 분류기 (LLM 호출 전 fast path)
+
+"2번", "네", "다른 회사", "고마워"처럼 형태가 정해진 짧은 입력은 키워드/정규식만으로 확실하게 분류해
+intent_analysis_chain / confirmation_router_chain / company_context_planner_chain 호출을 건너뜁니다.
+규칙이 확신할 수 없는 입력은 None을 반환하며, 이 경우 기존처럼 LLM이 분류합니다.
+
+record_path()는 단계별로 어떤 경로(rule / classifier / llm)를 탔는지 집계하고 로그로 남겨,
+모델 호출을 피한 턴의 비율을 확인할 수 있게 합니다.
+"""
+import logging
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (분류 결과, 매칭된 규칙 이름)
+RuleMatch = Tuple[str, str]
+
+# 동의 ("네", "좋아요", "네 그렇게 해주세요")
+AFFIRM_TOKENS = {
+    "네", "넵", "넹", "예", "응", "웅", "ㅇㅇ", "ㅇㅋ", "오케이", "ok", "okay", "yes", "y", "ㄱㄱ", "고고",
+    "좋아", "좋아요", "좋습니다", "그래", "그래요", "해줘", "해주세요", "해", "주세요", "부탁해", "부탁해요",
+    "부탁드려요", "부탁드립니다", "분석해줘", "분석해주세요", "진행해줘", "진행해주세요", "시작해줘", "시작해주세요",
+}
+# 감사/인사 ("고마워", "감사합니다", "수고하세요")
+THANKS_TOKENS = {
+    "고마워", "고마워요", "고맙습니다", "감사", "감사해요", "감사합니다", "땡큐", "thanks", "thx", "ㄳ", "ㄱㅅ",
+    "수고", "수고해", "수고하세요", "수고하셨습니다", "안녕", "안녕하세요", "잘가", "바이", "bye",
+}
+# 거절 ("아니", "됐어")
+DECLINE_TOKENS = {"아니", "아니요", "아뇨", "됐어", "됐어요", "괜찮아", "괜찮아요", "no", "ㄴㄴ"}
+# 단독으로는 의미가 없는 수식어 ("정말 고마워요", "네 그렇게 해주세요")
+FILLER_TOKENS = {"정말", "진짜", "너무", "많이", "그렇게", "그럼", "바로", "ㅎㅎ", "ㅋㅋ", "you", "thank", "분석", "좀"}
+
+_PUNCTUATION_PATTERN = re.compile(r"[.,!?~^…\"'()]+")
+_NUMBER_PATTERN = re.compile(r"\d+")
+_ORDINAL_PATTERN = re.compile(r"(첫|두|세|네|다섯|여섯|일곱|여덟|아홉|열)\s*번\s*째")
+_NEW_SEARCH_PATTERN = re.compile(r"(다른|새로운|새)\s*(회사|공고|기업|곳|거|것|직무|목록|추천)|이거\s*말고|목록\s*다시|다시\s*추천")
+# 비교/참조 표현: 다른 회사 정보가 필요할 수 있는 질문 (company_context_planner 판단 기준)
+_COMPARISON_PATTERN = re.compile(r"비교|vs|어느\s*(쪽|곳|회사)|어디가\s*더|둘\s*중|중에\s*(어디|어느|뭐)|도\s*비슷|차이")
+_REFERENCE_PATTERN = re.compile(r"다른\s*(회사|곳|기업)|그\s*(회사|곳)|거기|저기|두\s*회사|둘")
+
+# 새 검색 규칙을 적용할 최대 길이: 긴 문장은 비교/후속 질문일 수 있어 LLM에 맡김
+NEW_SEARCH_MAX_LENGTH = 20
+# 다른 회사 정보가 필요 없다고 규칙으로 판단할 최대 길이 ("연봉은?", "복지 알려줘")
+NO_CONTEXT_MAX_LENGTH = 10
+
+
+def normalize_question(question: Any) -> str:
+    """문장부호를 제거하고 공백을 정리한 소문자 문자열"""
+    return " ".join(_PUNCTUATION_PATTERN.sub(" ", str(question or "")).split()).lower()
+
+
+def _matches_only(text: str, core: Iterable[str], filler: Iterable[str] = FILLER_TOKENS) -> bool:
+    """모든 토큰이 core/filler에 속하고, core 토큰이 하나 이상인지"""
+    tokens = text.split()
+    core = set(core)
+    return bool(tokens) and all(t in core or t in filler for t in tokens) and any(t in core for t in tokens)
+
+
+def is_affirmation(text: str) -> bool:
+    return _matches_only(text, AFFIRM_TOKENS)
+
+
+def is_thanks(text: str) -> bool:
+    return _matches_only(text, THANKS_TOKENS)
+
+
+def is_decline(text: str) -> bool:
+    return _matches_only(text, DECLINE_TOKENS)
+
+
+def is_new_search_request(text: str) -> bool:
+    """짧은 "다른 회사", "이거 말고" 요청 (비교 질문 제외)"""
+    return (len(text) <= NEW_SEARCH_MAX_LENGTH and bool(_NEW_SEARCH_PATTERN.search(text))
+            and not _COMPARISON_PATTERN.search(text))
+
+
+def is_job_selection(text: str, job_list: list) -> bool:
+    """추천 목록 선택 ("2번", "두 번째", 목록에 있는 회사명). should_route의 강제 선택 규칙과 동일"""
+    if _NUMBER_PATTERN.search(text) or _ORDINAL_PATTERN.search(text):
+        return True
+    return any(
+        job.get("source_data", {}).get("company_name")
+        and job["source_data"]["company_name"].lower() in text
+        for job in job_list or []
+    )
+
+
+def classify_intent(question: str, state: Dict[str, Any]) -> Optional[RuleMatch]:
+    """
+    analyze_intent_tool의 의도(initial_search, new_search, select_job, follow_up_qa, chit_chat)를 규칙으로 분류합니다.
+    확신할 수 없으면 None.
+    """
+    text = normalize_question(question)
+    if not text:
+        return None
+
+    job_list = state.get("job_list") or []
+    awaiting_selection = job_list and state.get("awaiting_selection") and not state.get("selected_job")
+
+    # 추천 목록 선택 대기 중에는 번호/순서/회사명이 곧 선택
+    if awaiting_selection and not state.get("awaiting_analysis_confirmation") and is_job_selection(text, job_list):
+        return "select_job", "selection"
+    # 이미 목록을 받은 뒤의 짧은 새 목록 요청
+    if job_list and is_new_search_request(text):
+        return "new_search", "new_search"
+    if is_thanks(text):
+        return "chit_chat", "thanks"
+    # 심층 분석 확인 단계의 단순 동의/거절은 confirmation_router가 경로를 정하므로 잡담으로 분류
+    if state.get("awaiting_analysis_confirmation") and (is_affirmation(text) or is_decline(text)):
+        return "chit_chat", "confirmation_reply"
+    return None
+
+
+def classify_confirmation(question: str) -> Optional[RuleMatch]:
+    """
+    confirmation_router_tool의 경로(start_deep_analysis, reset_and_reformulate, expert_research,
+    request_further_action)를 규칙으로 분류합니다. 확신할 수 없으면 None.
+    """
+    text = normalize_question(question)
+    if not text:
+        return None
+    if is_affirmation(text):
+        return "start_deep_analysis", "affirmation"
+    if is_new_search_request(text):
+        return "reset_and_reformulate", "new_search"
+    if is_thanks(text) or is_decline(text):
+        return "request_further_action", "thanks_or_decline"
+    return None
+
+
+def needs_other_company_context(question: str, available_companies: Iterable[str]) -> Optional[RuleMatch]:
+    """
+    company_context_planner_chain의 판단("1": 다른 회사 정보 필요 / "0": 불필요)을 규칙으로 내립니다.
+    "0"은 감사/동의처럼 자명한 입력이나 아주 짧은 질문에만 내리고, 다른 회사를 지칭할 수 있는
+    질문("그 회사는 어때?", "이전에 본 곳보다 연봉이 높아?")은 None으로 LLM에 맡깁니다.
+    """
+    text = normalize_question(question)
+    if not text:
+        return None
+    if any(company and company.lower() in text for company in available_companies):
+        return "1", "company_mentioned"
+    if _COMPARISON_PATTERN.search(text):
+        return "1", "comparison"
+    if _REFERENCE_PATTERN.search(text):
+        return None
+    if is_thanks(text) or is_affirmation(text) or is_decline(text):
+        return "0", "trivial_reply"
+    if len(text) <= NO_CONTEXT_MAX_LENGTH:
+        return "0", "short_question"
+    return None
+
+
+_path_counts: Counter = Counter()
+_path_lock = threading.Lock()
+
+def record_path(stage: str, path: str, detail: str = "") -> None:
+    """
+    단계(stage)별로 분류 경로(rule / classifier / llm)를 집계하고 로그로 남깁니다.
+
+    Args:
+        stage (str): 'intent' | 'confirmation' | 'company_context' | 'web_search'
+        path (str): 'rule' | 'classifier' | 'combined' (의도 분석 호출에서 함께 판단) | 'llm'
+        detail (str): 매칭된 규칙 이름 등
+    """
+    with _path_lock:
+        _path_counts[(stage, path)] += 1
+        total = sum(count for (s, _), count in _path_counts.items() if s == stage)
+        llm_share = _path_counts[(stage, "llm")] / total
+    logger.info(f"[{stage}] classified via {path}{f' ({detail})' if detail else ''} - "
+                f"{1 - llm_share:.0%} of {total} turns skipped the LLM")
+
+
+def path_stats() -> Dict[str, Dict[str, int]]:
+    """단계별 {경로: 횟수}"""
+    with _path_lock:
+        stats: Dict[str, Dict[str, int]] = {}
+        for (stage, path), count in _path_counts.items():
+            stats.setdefault(stage, {})[path] = count
+        return stats
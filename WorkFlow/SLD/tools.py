@@ -1,14 +1,23 @@
 from typing import Dict, Any, Union
+from concurrent.futures import ThreadPoolExecutor
 import logging
 import json
 import os
 from langchain_core.tools import tool
 from langsmith import traceable
-from WorkFlow.Util.utils import advice_chain, summary_memory_chain, final_answer_chain, intent_analysis_chain, contextual_qa_prompt_chain, reformulate_query_chain, web_search_planner_chain, hyde_reformulation_chain, company_context_planner_chain, confirmation_router_chain
-from Retriever.hybrid_retriever import hybrid_search, _format_hit_to_text
+from WorkFlow.Util.utils import advice_chain, summary_memory_chain, final_answer_chain, intent_analysis_chain, contextual_qa_prompt_chain, reformulate_query_chain, web_search_planner_chain, hyde_reformulation_chain, company_context_planner_chain, confirmation_router_chain, combined_router_chain
+from Retriever.hybrid_retriever import hybrid_search, hybrid_search_async, fetch_documents, _format_hit_to_text
 from WorkFlow.config import get_tavily_tool, get_perplexity_tool
+from WorkFlow.SLD.intent_rules import classify_intent, classify_confirmation, needs_other_company_context, record_path
+from WorkFlow.SLD.intent_classifier import predict_with_classifier, log_training_example
 import re
 
+# 웹 검색 결과 Redis 캐시 (프로젝트 루트에서 임포트된 경우에만 사용 가능)
+try:
+    from DB.web_search_cache import get_web_search_cache
+except ImportError:
+    get_web_search_cache = None
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -20,33 +29,132 @@ os.environ["LANGCHAIN_PROJECT"] = os.getenv("LANGSMITH_PROJECT", "job_advisor")
 tavily_tool = get_tavily_tool()
 perplexity_tool = get_perplexity_tool()
 
+# 추천 목록 제시에 필요한 공고 필드 (전체 공고는 선택 시 fetch_documents로 지연 조회)
+CANDIDATE_FIELDS = ["title", "company_name", "location", "main_tasks", "qualifications"]
 
-@tool
-@traceable(name="analyze_intent_tool")
-def analyze_intent_tool(state: Dict[str, Any]) -> Dict[str, str]:
-    """대화 기록과 현재 질문을 바탕으로 사용자 의도 분석"""
+# 세션별로 보관할 HyDE 검색 쿼리 캐시 항목 수 (프로필 단위)
+RETRIEVAL_QUERY_CACHE_SIZE = int(os.getenv("RETRIEVAL_QUERY_CACHE_SIZE", "4"))
+
+# 독립적인 웹 검색(Tavily)을 동시에 실행할 스레드 풀 (프로세스 전체 공유)
+WEB_SEARCH_MAX_WORKERS = int(os.getenv("WEB_SEARCH_MAX_WORKERS", "8"))
+_web_search_executor = ThreadPoolExecutor(max_workers=WEB_SEARCH_MAX_WORKERS, thread_name_prefix="web-search")
+
+# 라우터 모드: separate (기본값, 단계별 LLM 호출) | combined (의도/회사 컨텍스트/웹 검색 판단을 한 번의 구조화 출력 호출로)
+ROUTER_MODE = os.getenv("ROUTER_MODE", "separate")
+
+# 웹 검색 결과 캐시: redis (기본값) | none
+WEB_SEARCH_CACHE = os.getenv("WEB_SEARCH_CACHE", "redis")
+
+
+def _get_web_search_cache():
+    """웹 검색 캐시를 반환합니다. 비활성화되었거나 사용할 수 없으면 None."""
+    if WEB_SEARCH_CACHE != "redis" or get_web_search_cache is None:
+        return None
+    return get_web_search_cache()
+
+
+def _tavily_search(query: str) -> Any:
+    """Tavily 검색 (캐시 우선). 오류 문자열 등 리스트가 아닌 결과는 캐시하지 않습니다."""
+    fetch = lambda: tavily_tool.invoke({"query": query})
+    cache = _get_web_search_cache()
+    if cache is None:
+        return fetch()
+    return cache.get_or_fetch("tavily", query, fetch,
+                              should_cache=lambda value: isinstance(value, list) and len(value) > 0,
+                              executor=_web_search_executor)
+
+
+def _perplexity_answer(question: str) -> str:
+    """Perplexity 답변 텍스트 (캐시 우선)"""
+    fetch = lambda: perplexity_tool.invoke(question).content
+    cache = _get_web_search_cache()
+    if cache is None:
+        return fetch()
+    return cache.get_or_fetch("perplexity", question, fetch, executor=_web_search_executor)
+
+
+def _search_web_parallel(queries: Dict[str, str]) -> Dict[str, Any]:
+    """
+    여러 Tavily 검색을 동시에 실행하고 {키: 결과 리스트}를 반환합니다.
+    (전체 지연시간 ≈ 가장 느린 검색 1회, 실패한 검색은 결과에서 제외하고 나머지는 그대로 사용)
+    """
+    futures = {key: _web_search_executor.submit(_tavily_search, query) for key, query in queries.items()}
+    results = {}
+    for key, future in futures.items():
+        try:
+            search_results = future.result()
+        except Exception as e:
+            logger.error(f"Web search failed for '{key}': {e}")
+            continue
+        results[key] = search_results if isinstance(search_results, list) else [search_results]
+    return results
+
+
+def _conversation_context(state: Dict[str, Any]) -> str:
+    """의도 분석용 대화 맥락 (요약본이 있으면 요약본, 없으면 전체 대화 기록)"""
     summary = state.get("summary")
-    chat_history = state.get("chat_history", [])
-    question = state.get("user_input", {}).get("candidate_question", "")
-    
-    context_for_llm = ""
     # 요약본이 존재하면, 요약본을 컨텍스트로 사용
     if summary:
-        context_for_llm = f"이전 대화 요약:\n{summary}"
         logger.info("Using conversation summary for intent analysis.")
-    
+        return f"이전 대화 요약:\n{summary}"
+
     # 요약본이 없으면 (초기 대화), 전체 대화 기록을 사용
+    logger.info("Using full chat history for intent analysis (no summary yet).")
+    return "\n".join([f"User: {turn['user']}\nAssistant: {turn['assistant']}" for turn in state.get("chat_history", [])])
+
+
+def _combined_route(state: Dict[str, Any], question: str) -> Dict[str, Any]:
+    """의도 + 다른 회사 컨텍스트 필요 여부 + 웹 검색 필요 여부를 한 번의 구조화 출력 호출로 판단합니다."""
+    current_company = state.get("current_company") or ""
+    available_companies = [name for name in (state.get("company_contexts") or {}) if name != current_company]
+    return combined_router_chain.invoke({
+        "chat_history": _conversation_context(state),
+        "question": question,
+        "current_company": current_company or "없음",
+        "available_companies": ", ".join(available_companies) or "없음",
+        "company_context": state.get("selected_job") or "선택된 채용 공고가 없습니다.",
+    })
+
+
+@tool
+@traceable(name="analyze_intent_tool")
+def analyze_intent_tool(state: Dict[str, Any]) -> Dict[str, str]:
+    """대화 기록과 현재 질문을 바탕으로 사용자 의도 분석"""
+    question = state.get("user_input", {}).get("candidate_question", "")
+    # ROUTER_MODE=combined에서 LLM이 함께 판단한 후속 단계 결정 (이번 턴에만 유효)
+    route_plan = None
+
+    # 형태가 정해진 짧은 입력("2번", "다른 회사", "고마워")은 규칙으로 분류하고 LLM 호출을 건너뜀
+    rule_match = classify_intent(question, state)
+    # 규칙이 없으면 로컬 분류기(INTENT_BACKEND=classifier)가 확신하는 경우에만 사용
+    prediction = None if rule_match else predict_with_classifier("intent", question, state)
+    if rule_match:
+        intent_result, rule_name = rule_match
+        record_path("intent", "rule", rule_name)
+    elif prediction:
+        intent_result, probability = prediction
+        record_path("intent", "classifier", f"p={probability:.2f}")
     else:
-        context_for_llm = "\n".join([f"User: {turn['user']}\nAssistant: {turn['assistant']}" for turn in chat_history])
-        logger.info("Using full chat history for intent analysis (no summary yet).")
-    
-    # 의도 분석 체인 실행
-    intent_result = intent_analysis_chain.invoke({
-        "chat_history": context_for_llm,
-        "question": question
-    }).content.strip()
+        if ROUTER_MODE == "combined":
+            try:
+                route_plan = _combined_route(state, question)
+                logger.info(f"Combined router decision: {route_plan}")
+            except Exception as e:
+                logger.warning(f"Combined router failed, falling back to separate intent analysis: {e}")
+
+        if route_plan:
+            intent_result = route_plan["intent"]
+            record_path("intent", "llm", "combined")
+        else:
+            # 의도 분석 체인 실행
+            intent_result = intent_analysis_chain.invoke({
+                "chat_history": _conversation_context(state),
+                "question": question
+            }).content.strip()
+            record_path("intent", "llm")
+        log_training_example("intent", question, state, intent_result)
 
-    updates = {"intent": intent_result}
+    updates = {"intent": intent_result, "route_plan": route_plan}
 
     # 사용자가 불만족을 표하며 새로운 검색을 원할 경우, 이전 추천을 제외 목록에 추가
     if intent_result == 'new_search' and state.get('job_list'):
@@ -85,31 +193,95 @@ def recommend_jobs_tool(state: Union[Dict[str, Any], str]) -> Dict[str, Any]:
 
     user_profile = state.get("user_input", {})
 
+    # 같은 검색 쿼리의 벡터가 캐시되어 있으면 전달해 리트리버의 쿼리 인코딩을 생략
+    cached_vector = _get_cached_query_vector(state)
+
     try:
-        doc_scores, doc_ids, doc_texts = hybrid_search(
+        doc_scores, doc_ids, doc_texts, query_vector = hybrid_search(
             user_profile=user_profile,
-            exclude_ids=state.get("excluded_ids", [])
+            exclude_ids=state.get("excluded_ids", []),
+            query_vector=cached_vector,
+            # 캐시 적중 여부와 관계없이 항상 4개 값을 받도록 요청 (캐시된 벡터는 그대로 되돌아옴)
+            return_query_vector=True,
+            fields=CANDIDATE_FIELDS
         )
+        return {"job_list": _build_job_list(doc_ids, doc_texts), **_cache_query_vector(state, query_vector)}
 
-        if not doc_texts:
-            return {"job_list": []}
-        candidate_jobs = []
-        for i, doc_source in enumerate(doc_texts):
-            full_text_document = _format_hit_to_text(doc_source)
-            candidate_jobs.append({
-                "index": i + 1,
-                "id": doc_ids[i],
-                "source_data": doc_source,
-                "document": full_text_document
-            })
+    except Exception as e:
+        logger.error("Job recommendation (retrieval) error: %s", str(e))
         
-        return {"job_list": candidate_jobs}
+    return {"job_list": []}
+
+@tool
+@traceable(name="recommend_jobs_async_tool")
+async def recommend_jobs_async_tool(state: Dict[str, Any]) -> Dict[str, Any]:
+    """직무 추천의 비동기 버전 (리트리버 호출 동안 이벤트 루프를 막지 않음)."""
+    if not isinstance(state, dict) or "user_input" not in state:
+        logger.warning("Invalid state provided to recommend_jobs_async_tool: %s", state)
+        return {"error": "직무 추천을 위한 유효한 상태가 제공되지 않았습니다."}
+
+    user_profile = state.get("user_input", {})
+
+    cached_vector = _get_cached_query_vector(state)
+
+    try:
+        doc_scores, doc_ids, doc_texts, query_vector = await hybrid_search_async(
+            user_profile=user_profile,
+            exclude_ids=state.get("excluded_ids", []),
+            query_vector=cached_vector,
+            # 캐시 적중 여부와 관계없이 항상 4개 값을 받도록 요청 (캐시된 벡터는 그대로 되돌아옴)
+            return_query_vector=True,
+            fields=CANDIDATE_FIELDS
+        )
+        return {"job_list": _build_job_list(doc_ids, doc_texts), **_cache_query_vector(state, query_vector)}
 
     except Exception as e:
         logger.error("Job recommendation (retrieval) error: %s", str(e))
-        
+
     return {"job_list": []}
 
+def _get_cached_query_vector(state: Dict[str, Any]) -> Union[str, None]:
+    """현재 HyDE 쿼리에 대해 캐시된 쿼리 벡터(base64)를 반환합니다."""
+    user_input = state.get("user_input", {})
+    cached = (state.get("retrieval_query_cache") or {}).get(_retrieval_profile_key(user_input))
+    if cached and cached.get("query_vector") and cached.get("hyde_query") == user_input.get("hyde_query", ""):
+        return cached["query_vector"]
+    return None
+
+def _cache_query_vector(state: Dict[str, Any], query_vector: Union[str, None]) -> Dict[str, Any]:
+    """리트리버가 반환한 쿼리 벡터를 검색 쿼리 캐시에 저장하는 상태 업데이트를 만듭니다."""
+    user_input = state.get("user_input", {})
+    profile_key = _retrieval_profile_key(user_input)
+    retrieval_query_cache = dict(state.get("retrieval_query_cache") or {})
+    cached = retrieval_query_cache.get(profile_key)
+    if not query_vector or not cached or cached.get("hyde_query") != user_input.get("hyde_query", ""):
+        return {}
+    retrieval_query_cache[profile_key] = {**cached, "query_vector": query_vector}
+    return {"retrieval_query_cache": retrieval_query_cache}
+
+def _fetch_full_document(doc_id: str) -> Dict[str, Any]:
+    """선택된 공고의 전체 문서를 조회합니다. 실패하면 빈 dict를 반환합니다."""
+    if not doc_id:
+        return {}
+    try:
+        return fetch_documents([doc_id]).get(doc_id, {})
+    except Exception as e:
+        logger.error("Full document fetch error: %s", str(e))
+        return {}
+
+def _build_job_list(doc_ids: list, doc_texts: list) -> list:
+    """검색 결과를 후보 공고 목록으로 변환합니다."""
+    candidate_jobs = []
+    for i, doc_source in enumerate(doc_texts):
+        full_text_document = _format_hit_to_text(doc_source)
+        candidate_jobs.append({
+            "index": i + 1,
+            "id": doc_ids[i],
+            "source_data": doc_source,
+            "document": full_text_document
+        })
+    return candidate_jobs
+
 @tool
 @traceable(name="present_candidates_tool")
 def present_candidates_tool(state: Dict[str, Any]) -> Dict[str, str]:
@@ -185,6 +357,14 @@ def load_selected_job_tool(state: Dict[str, Any]) -> Dict[str, Any]:
     # 선택된 직무의 텍스트와 구조화된 데이터를 모두 반환 (문서 형태 확인 필요)
     if selected_job_info:
         logger.info(f"Selected job: {selected_job_info.get('source_data', {}).get('title')}")
+        # 추천 목록에는 일부 필드만 있으므로 선택된 공고의 전체 문서를 조회 (실패 시 목록의 데이터 사용)
+        full_document = _fetch_full_document(selected_job_info.get('id'))
+        if full_document:
+            selected_job_info = {
+                **selected_job_info,
+                "source_data": full_document,
+                "document": _format_hit_to_text(full_document)
+            }
         # 회사 컨텍스트 저장/업데이트
         tmp_state = {
             **state,
@@ -234,11 +414,24 @@ def request_selection_tool(state: Dict[str, Any]) -> Dict[str, str]:
 @traceable(name="confirmation_router_tool")
 def confirmation_router_tool(state: Dict[str, Any]) -> Dict[str, str]:
     """LLM을 사용하여 심층 분석 확인 단계에서 사용자의 의도를 분류합니다."""
-    logger.info("Routing user's confirmation response using LLM.")
-    
     company_name = state.get("current_company", "해당 회사")
     user_question = state.get("user_input", {}).get("candidate_question", "")
 
+    # "네", "다른 회사", "고마워" 같은 단순 응답은 규칙으로 바로 라우팅
+    rule_match = classify_confirmation(user_question)
+    if rule_match:
+        next_action, rule_name = rule_match
+        record_path("confirmation", "rule", rule_name)
+        return {"next_action": next_action}
+
+    prediction = predict_with_classifier("confirmation", user_question, state)
+    if prediction:
+        next_action, probability = prediction
+        record_path("confirmation", "classifier", f"p={probability:.2f}")
+        return {"next_action": next_action}
+
+    logger.info("Routing user's confirmation response using LLM.")
+    record_path("confirmation", "llm")
     try:
         # LLM을 호출하여 의도 분류
         intent_result = confirmation_router_chain.invoke({
@@ -254,6 +447,7 @@ def confirmation_router_tool(state: Dict[str, Any]) -> Dict[str, str]:
             logger.warning(f"Router returned an invalid route: '{intent_result}'. Defaulting to request_further_action.")
             return {"next_action": "request_further_action"}
 
+        log_training_example("confirmation", user_question, state, intent_result)
         return {"next_action": intent_result}
 
     except Exception as e:
@@ -338,6 +532,16 @@ def reformulate_query_tool(state: Dict[str, Any]) -> Dict[str, str]:
         return {"user_input": state.get("user_input")}
 
 
+def _retrieval_profile_key(user_input: Dict[str, Any]) -> str:
+    """검색 쿼리 캐시 키로 사용할 사용자 프로필 문자열을 만듭니다."""
+    return "|".join([
+        str(user_input.get("candidate_major", "")),
+        str(user_input.get("candidate_career", "")),
+        str(user_input.get("candidate_interest", "")),
+        ",".join(user_input.get("candidate_tech_stack", []) or []),
+        str(user_input.get("candidate_location", "")),
+    ])
+
 @tool
 @traceable(name="formulate_retrieval_query_tool")
 def formulate_retrieval_query_tool(state: Dict[str, Any]) -> Dict[str, Any]:
@@ -362,6 +566,23 @@ def formulate_retrieval_query_tool(state: Dict[str, Any]) -> Dict[str, Any]:
 
     natural_question = user_input.get("candidate_question", "")
 
+    # 같은 프로필로 같은 질문을 다시 한 경우에만 이전 HyDE 결과를 재사용 (LLM 호출 생략)
+    # new_search라도 질문이 다르면 다른 직무/회사를 찾는 것일 수 있으므로 새로 생성
+    retrieval_query_cache = dict(state.get("retrieval_query_cache") or {})
+    profile_key = _retrieval_profile_key(user_input)
+    question_key = " ".join(natural_question.split())
+    cached = retrieval_query_cache.get(profile_key)
+    if cached and cached.get("question") == question_key:
+        logger.info("Reusing cached HyDE document for the same profile (skipping LLM call).")
+        return {
+            "user_input": {
+                **user_input,
+                "hyde_query": cached.get("hyde_query", ""),
+                "company_name_filter": cached.get("company_names", [])
+            },
+            "company_name_filter": cached.get("company_names", [])
+        }
+
     try:
         response_content = hyde_reformulation_chain.invoke({
             "user_profile": user_profile_str,
@@ -372,18 +593,30 @@ def formulate_retrieval_query_tool(state: Dict[str, Any]) -> Dict[str, Any]:
         hypothetical_document = result_json.get("hypothetical_document", "")
         company_names = result_json.get("company_names", [])
 
-        # HyDE 가짜문서만 hyde_query에 저장
+        # HyDE 가짜문서와 회사명 필터를 리트리버 입력에 저장
         updated_user_input = {
             **user_input, 
-            "hyde_query": hypothetical_document   # HyDE 가짜문서 (리트리버용)
+            "hyde_query": hypothetical_document,   # HyDE 가짜문서 (리트리버 kNN 쿼리용)
+            "company_name_filter": company_names   # 회사명 필터 (리트리버 filter 절)
         }
         logger.info(f"Formulated HyDE document: '{hypothetical_document[:100]}...'")
         if company_names:
             logger.info(f"Extracted company filter: {company_names}")
 
+        retrieval_query_cache.pop(profile_key, None)
+        retrieval_query_cache[profile_key] = {
+            "question": question_key,
+            "hyde_query": hypothetical_document,
+            "company_names": company_names
+        }
+        # 세션 상태가 커지지 않도록 최근 항목만 유지
+        while len(retrieval_query_cache) > RETRIEVAL_QUERY_CACHE_SIZE:
+            retrieval_query_cache.pop(next(iter(retrieval_query_cache)))
+
         return {
             "user_input": updated_user_input,
-            "company_name_filter": company_names
+            "company_name_filter": company_names,
+            "retrieval_query_cache": retrieval_query_cache
         }
     except Exception as e:
         logger.error(f"Hiring query formulation error: {e}", exc_info=True)
@@ -425,7 +658,7 @@ def search_company_info_tool(state: Dict[str, Any]) -> Dict[str, str]:
         search_query = f"{company_name} {contextual_question}"
         logger.info(f"Executing web search with query: '{search_query}'")
         
-        search_results = tavily_tool.invoke({"query": search_query})
+        search_results = _tavily_search(search_query)
         
         if not isinstance(search_results, list):
             search_results = [search_results]
@@ -474,14 +707,9 @@ def research_for_advice_tool(state: Dict[str, Any]) -> Dict[str, str]:
     company_culture_context = "해당 회사의 기술 문화에 대한 정보를 찾지 못했습니다."
     
     try:
-        for key, query in queries.items():
-            logger.info(f"Executing research query for '{key}': {query}")
-            # 각 쿼리에 대해 tavily_tool을 한 번씩 호출
-            search_results = tavily_tool.invoke({"query": query})
-            
-            if not isinstance(search_results, list):
-                search_results = [search_results]
-            
+        logger.info(f"Executing research queries concurrently: {queries}")
+        # 두 쿼리는 서로 독립적이므로 동시에 호출
+        for key, search_results in _search_web_parallel(queries).items():
             # content들을 하나의 문자열로 합침
             content = "\n".join([str(res.get('content', '')) for res in search_results if res])
             
@@ -583,10 +811,17 @@ def contextual_qa_tool(state: Dict[str, Any]) -> Dict[str, Any]:
 
     try:
         logger.info("Planning step: Checking if web search is necessary.")
-        planner_decision = web_search_planner_chain.invoke({
-            "company_context": company_context,
-            "question": question
-        }).content.strip()
+        route_plan = state.get("route_plan") or {}
+        if "needs_web_search" in route_plan:
+            # 의도 분석과 함께 판단한 결과 사용 (ROUTER_MODE=combined)
+            planner_decision = "필요함" if route_plan["needs_web_search"] else "필요 없음"
+            record_path("web_search", "combined")
+        else:
+            planner_decision = web_search_planner_chain.invoke({
+                "company_context": company_context,
+                "question": question
+            }).content.strip()
+            record_path("web_search", "llm")
 
         logger.info(f"Planner decision: '{planner_decision}'")
 
@@ -731,12 +966,23 @@ def resolve_company_context_tool(state: Dict[str, Any]) -> Dict[str, Any]:
             available_companies.remove(target_company) if target_company in available_companies else None
             
             if available_companies:
-                planner_result = company_context_planner_chain.invoke({
-                    "current_question": user_question,
-                    "current_company": target_company,
-                    "available_companies": ", ".join(available_companies),
-                    "company_contexts": str(company_contexts)
-                }).content.strip()
+                route_plan = state.get("route_plan") or {}
+                rule_match = needs_other_company_context(user_question, available_companies)
+                if "needs_other_company_context" in route_plan:
+                    # 의도 분석과 함께 판단한 결과 사용 (ROUTER_MODE=combined)
+                    planner_result = "1" if route_plan["needs_other_company_context"] else "0"
+                    record_path("company_context", "combined")
+                elif rule_match:
+                    planner_result, rule_name = rule_match
+                    record_path("company_context", "rule", rule_name)
+                else:
+                    planner_result = company_context_planner_chain.invoke({
+                        "current_question": user_question,
+                        "current_company": target_company,
+                        "available_companies": ", ".join(available_companies),
+                        "company_contexts": str(company_contexts)
+                    }).content.strip()
+                    record_path("company_context", "llm")
                 
                 # LLM 응답에서 0 또는 1 추출
                 if "1" in planner_result:
@@ -781,7 +1027,7 @@ def expert_research_tool(state: Dict[str, Any]) -> Dict[str, str]:
             return {"search_result": "공고에서 회사 이름을 찾지 못했습니다."}
         
         question = f"{company_name} 기업 {question}"
-        result = perplexity_tool.invoke(question)
+        result = _perplexity_answer(question)
         
         # Perplexity의 답변을 최종 답변으로 설정
         return {"final_answer": result}
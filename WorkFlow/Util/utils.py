@@ -1,6 +1,6 @@
 from typing import Dict, List, Any, Callable
 from WorkFlow.config import get_llm
-from Template.prompts import actionable_advice_prompt, summary_memory_prompt, final_answer_prompt, intent_analysis_prompt, contextual_qa_prompt, reformulate_query_prompt, web_search_planner_prompt, hyde_reformulation_prompt, company_context_planner_prompt, confirmation_router_prompt
+from Template.prompts import actionable_advice_prompt, summary_memory_prompt, final_answer_prompt, intent_analysis_prompt, contextual_qa_prompt, reformulate_query_prompt, web_search_planner_prompt, hyde_reformulation_prompt, company_context_planner_prompt, confirmation_router_prompt, combined_router_prompt, combined_router_schema
 
 # llm 객체를 함수로 받아옴
 llm = get_llm()
@@ -32,6 +32,10 @@ web_search_planner_chain = RunInvokeAdapter(web_search_planner_prompt | llm)
 hyde_reformulation_chain = RunInvokeAdapter(hyde_reformulation_prompt | llm)
 company_context_planner_chain = RunInvokeAdapter(company_context_planner_prompt | llm)
 confirmation_router_chain = RunInvokeAdapter(confirmation_router_prompt | llm)
+# 의도/회사 컨텍스트/웹 검색 판단을 한 번에 반환하는 구조화 출력 체인 (결과는 dict)
+combined_router_chain = RunInvokeAdapter(
+    combined_router_prompt | llm.with_structured_output(combined_router_schema, method="json_schema", strict=True)
+)
 
 
 
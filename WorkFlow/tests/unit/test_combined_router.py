@@ -0,0 +1,68 @@
+from types import SimpleNamespace
+
+import pytest
+from WorkFlow.SLD import tools
+
+QUESTION = "이 회사 면접은 어떻게 준비하나요?"
+ROUTE_PLAN = {"intent": "follow_up_qa", "needs_other_company_context": False, "needs_web_search": True}
+
+class RecordingChain:
+    """호출 입력을 기록하고 고정 결과를 반환(또는 예외 발생)하는 체인 스텁"""
+
+    def __init__(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.calls = []
+
+    def invoke(self, inputs):
+        self.calls.append(inputs)
+        if self.error:
+            raise self.error
+        return self.result
+
+@pytest.fixture
+def chains(monkeypatch):
+    monkeypatch.setattr(tools, "ROUTER_MODE", "combined")
+    intent_chain = RecordingChain(SimpleNamespace(content="follow_up_qa\n"))
+    monkeypatch.setattr(tools, "intent_analysis_chain", intent_chain)
+    return intent_chain
+
+def _state(question=QUESTION):
+    return {"user_input": {"candidate_question": question}, "selected_job": "카카오 백엔드 개발자", "job_list": [{"id": "1"}]}
+
+class TestCombinedRouter:
+    def test_combined_decision_skips_intent_chain(self, monkeypatch, chains):
+        router = RecordingChain(ROUTE_PLAN)
+        monkeypatch.setattr(tools, "combined_router_chain", router)
+
+        result = tools.analyze_intent_tool.func(_state())
+
+        assert result == {"intent": "follow_up_qa", "route_plan": ROUTE_PLAN}
+        assert len(router.calls) == 1 and router.calls[0]["question"] == QUESTION
+        assert chains.calls == []
+
+    def test_router_failure_falls_back_to_intent_chain(self, monkeypatch, chains):
+        """구조화 출력 호출이 실패하면 기존 의도 분석 체인으로 분류하고, 후속 단계는 각자 판단"""
+        monkeypatch.setattr(tools, "combined_router_chain", RecordingChain(error=ValueError("schema mismatch")))
+
+        result = tools.analyze_intent_tool.func(_state())
+
+        assert result == {"intent": "follow_up_qa", "route_plan": None}
+        assert len(chains.calls) == 1
+
+    def test_rule_match_skips_router(self, monkeypatch, chains):
+        router = RecordingChain(ROUTE_PLAN)
+        monkeypatch.setattr(tools, "combined_router_chain", router)
+
+        result = tools.analyze_intent_tool.func(_state("고마워"))
+
+        assert result == {"intent": "chit_chat", "route_plan": None}
+        assert router.calls == [] and chains.calls == []
+
+    def test_separate_mode_does_not_call_router(self, monkeypatch, chains):
+        monkeypatch.setattr(tools, "ROUTER_MODE", "separate")
+        router = RecordingChain(ROUTE_PLAN)
+        monkeypatch.setattr(tools, "combined_router_chain", router)
+
+        assert tools.analyze_intent_tool.func(_state())["route_plan"] is None
+        assert router.calls == [] and len(chains.calls) == 1
@@ -0,0 +1,45 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from WorkFlow.SLD import tools
+
+@pytest.fixture
+def hyde_chain(monkeypatch):
+    """HyDE 체인 스텁: 호출된 질문을 기록하고 질문별 가상 공고를 반환"""
+    calls = []
+
+    class Chain:
+        def invoke(self, inputs):
+            calls.append(inputs["question"])
+            content = {"hypothetical_document": f"가상 공고: {inputs['question']}", "company_names": ["토스"]}
+            return SimpleNamespace(content=json.dumps(content, ensure_ascii=False))
+
+    monkeypatch.setattr(tools, "hyde_reformulation_chain", Chain())
+    return calls
+
+def _state(question, cache=None, intent="initial_search"):
+    return {
+        "user_input": {"candidate_interest": "백엔드", "candidate_question": question},
+        "retrieval_query_cache": cache or {},
+        "intent": intent,
+    }
+
+class TestFormulateRetrievalQuery:
+    def test_same_question_reuses_cache(self, hyde_chain):
+        """같은 프로필, 같은 질문(공백 차이 무시)이면 LLM을 다시 호출하지 않음"""
+        first = tools.formulate_retrieval_query_tool.func(_state("토스 백엔드 공고"))
+        second = tools.formulate_retrieval_query_tool.func(
+            _state("토스  백엔드 공고 ", first["retrieval_query_cache"], intent="new_search"))
+
+        assert hyde_chain == ["토스 백엔드 공고"]
+        assert second["user_input"]["hyde_query"] == "가상 공고: 토스 백엔드 공고"
+
+    def test_new_search_with_different_question_regenerates(self, hyde_chain):
+        """new_search라도 질문이 바뀌면 이전 HyDE 쿼리와 회사 필터를 재사용하지 않음"""
+        first = tools.formulate_retrieval_query_tool.func(_state("토스 백엔드 공고"))
+        second = tools.formulate_retrieval_query_tool.func(
+            _state("다른 회사 공고 보여줘", first["retrieval_query_cache"], intent="new_search"))
+
+        assert hyde_chain == ["토스 백엔드 공고", "다른 회사 공고 보여줘"]
+        assert second["user_input"]["hyde_query"] == "가상 공고: 다른 회사 공고 보여줘"
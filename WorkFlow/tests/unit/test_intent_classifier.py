@@ -0,0 +1,78 @@
+import sys
+
+import numpy as np
+import pytest
+from WorkFlow.SLD import intent_classifier
+from WorkFlow.SLD.intent_classifier import IntentClassifier, train_intent_classifier
+
+KEYWORDS = ["추천", "공고", "연봉", "면접", "안녕"]
+
+def fake_encode(question):
+    """키워드 포함 여부를 임베딩으로 사용하는 인코더 대역"""
+    return np.array([float(keyword in question) for keyword in KEYWORDS], dtype=np.float32)
+
+def _examples():
+    examples = []
+    for i in range(10):
+        examples.append({"stage": "intent", "question": f"백엔드 공고 추천해줘 {i}", "features": [0, 0, 0, 0], "label": "initial_search"})
+        examples.append({"stage": "intent", "question": f"이 회사 연봉이랑 면접은? {i}", "features": [1, 0, 1, 0], "label": "follow_up_qa"})
+        examples.append({"stage": "intent", "question": f"안녕 {i}", "features": [0, 0, 0, 0], "label": "chit_chat"})
+    return examples
+
+@pytest.fixture(scope="module")
+def models():
+    pytest.importorskip("sklearn")
+    return train_intent_classifier(_examples(), fake_encode, min_examples=20)
+
+class TestIntentClassifier:
+    def test_train_and_predict(self, models):
+        classifier = IntentClassifier(models, encode=fake_encode, threshold=0.5)
+
+        label, probability = classifier.predict("intent", "프론트엔드 공고 추천", {})
+        assert label == "initial_search" and probability >= 0.5
+        assert classifier.predict("intent", "연봉 알려줘", {"job_list": [{}], "selected_job": {}})[0] == "follow_up_qa"
+
+    def test_low_confidence_falls_back_to_llm(self, models):
+        """임계값 미만 확률이면 None (LLM 분류)"""
+        classifier = IntentClassifier(models, encode=fake_encode, threshold=0.99)
+        assert classifier.predict("intent", "공고 추천이랑 연봉 면접", {}) is None
+
+    def test_untrained_stage_returns_none(self, models):
+        classifier = IntentClassifier(models, encode=fake_encode, threshold=0.5)
+        assert classifier.predict("confirmation", "네", {}) is None
+
+    def test_skips_stage_with_too_few_examples(self):
+        pytest.importorskip("sklearn")
+        examples = [e for e in _examples() if e["label"] != "chit_chat"][:6]
+        assert train_intent_classifier(examples, fake_encode, min_examples=20) == {}
+
+    def test_save_and_load(self, models, tmp_path):
+        path = str(tmp_path / "intent_classifier.joblib")
+        intent_classifier.save_intent_classifier(models, path)
+
+        loaded = intent_classifier.load_intent_classifier(path, encode=fake_encode, threshold=0.5)
+        assert loaded.predict("intent", "안녕", {})[0] == "chit_chat"
+
+def test_disabled_backend_returns_none(monkeypatch):
+    monkeypatch.setattr(intent_classifier, "INTENT_BACKEND", "llm")
+    assert intent_classifier.predict_with_classifier("intent", "안녕", {}) is None
+
+def test_default_encoder_loads_only_the_embedding_model(monkeypatch):
+    """lambda_function(OpenSearch 클라이언트, 리랭커)을 임포트하지 않고 임베딩 모델만 로드"""
+    monkeypatch.delitem(sys.modules, "lambda_function", raising=False)
+    loads = []
+
+    class FakeModel:
+        def encode(self, texts, **kwargs):
+            return np.stack([fake_encode(text) for text in texts])
+
+    monkeypatch.syspath_prepend(intent_classifier.RETRIEVER_DIR)
+    import inference_backend
+    monkeypatch.setattr(inference_backend, "load_embedding_model", lambda: loads.append(1) or FakeModel())
+
+    encode = intent_classifier._default_encoder()
+
+    assert encode("공고 추천").tolist() == [1.0, 1.0, 0.0, 0.0, 0.0]
+    assert encode("안녕").tolist() == [0.0, 0.0, 0.0, 0.0, 1.0]
+    assert loads == [1]
+    assert "lambda_function" not in sys.modules
@@ -0,0 +1,89 @@
+import pytest
+from WorkFlow.SLD.intent_rules import (
+    classify_intent, classify_confirmation, needs_other_company_context, record_path, path_stats
+)
+
+@pytest.fixture
+def selection_state():
+    """추천 목록을 제시하고 선택을 기다리는 상태"""
+    return {
+        "job_list": [
+            {"id": "1", "source_data": {"company_name": "카카오"}},
+            {"id": "2", "source_data": {"company_name": "넥써쓰"}},
+        ],
+        "awaiting_selection": True,
+        "selected_job": None,
+    }
+
+class TestClassifyIntent:
+    @pytest.mark.parametrize("question", ["2번", "2번 알려줘", "두 번째 회사", "넥써쓰 회사에 대해 더 궁금해요"])
+    def test_selection(self, selection_state, question):
+        """목록 선택 입력은 select_job"""
+        assert classify_intent(question, selection_state)[0] == "select_job"
+
+    @pytest.mark.parametrize("question", ["다른 회사", "이거 말고 다른거", "새로운 공고 추천해줘"])
+    def test_new_search(self, question):
+        """목록을 받은 뒤의 짧은 새 목록 요청은 new_search"""
+        state = {"job_list": [{"id": "1"}], "selected_job": {"id": "1"}}
+        assert classify_intent(question, state) == ("new_search", "new_search")
+
+    @pytest.mark.parametrize("question", ["고마워", "정말 감사합니다!", "수고하세요~"])
+    def test_thanks(self, question):
+        """감사/인사는 chit_chat"""
+        assert classify_intent(question, {})[0] == "chit_chat"
+
+    @pytest.mark.parametrize("question", [
+        "백엔드 개발자 포지션 추천해주세요",
+        "그럼 면접은 어떻게 준비해야 할까요?",
+        "다른 회사랑 비교하면 연봉은 어때?",
+    ])
+    def test_ambiguous_falls_back_to_llm(self, question):
+        """확신할 수 없는 입력은 None (LLM 분류)"""
+        state = {"job_list": [{"id": "1"}], "selected_job": {"id": "1"}}
+        assert classify_intent(question, state) is None
+
+class TestClassifyConfirmation:
+    @pytest.mark.parametrize("question, expected", [
+        ("네", "start_deep_analysis"),
+        ("네 그렇게 해주세요", "start_deep_analysis"),
+        ("다른 회사 찾아줘", "reset_and_reformulate"),
+        ("고마워", "request_further_action"),
+        ("아니", "request_further_action"),
+    ])
+    def test_trivial_replies(self, question, expected):
+        """단순 응답은 규칙으로 라우팅"""
+        assert classify_confirmation(question)[0] == expected
+
+    def test_topic_question_falls_back_to_llm(self):
+        """새 주제 질문은 LLM이 판단"""
+        assert classify_confirmation("이 회사 연봉은 얼마예요?") is None
+
+class TestCompanyContext:
+    def test_other_company_mentioned(self):
+        assert needs_other_company_context("카카오도 비슷한가요?", ["카카오"])[0] == "1"
+
+    @pytest.mark.parametrize("question", ["고마워요", "네", "연봉은?", "복지 알려줘"])
+    def test_trivial_input_needs_no_context(self, question):
+        assert needs_other_company_context(question, ["카카오"])[0] == "0"
+
+    @pytest.mark.parametrize("question", [
+        "면접 준비는 어떻게 하나요?",
+        "앞서 분석한 회사들 중 워라밸 제일 좋은 데는?",
+        "이전에 본 곳보다 연봉이 높아?",
+        "아까 그 스타트업은 복지가 어땠지?",
+    ])
+    def test_longer_question_falls_back_to_llm(self, question):
+        """이전 회사를 암시할 수 있는 질문은 None (LLM 판단)"""
+        assert needs_other_company_context(question, ["카카오"]) is None
+
+    def test_ambiguous_reference(self):
+        assert needs_other_company_context("그 회사는 어때요?", ["카카오"]) is None
+
+def test_record_path_counts_by_stage():
+    """단계별 경로 집계"""
+    before = path_stats().get("test_stage", {})
+    record_path("test_stage", "rule", "thanks")
+    record_path("test_stage", "llm")
+    after = path_stats()["test_stage"]
+    assert after["rule"] == before.get("rule", 0) + 1
+    assert after["llm"] == before.get("llm", 0) + 1
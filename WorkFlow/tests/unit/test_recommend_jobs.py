@@ -0,0 +1,59 @@
+import asyncio
+import pytest
+from Retriever import hybrid_retriever
+from WorkFlow.SLD import tools
+
+CACHED_VECTOR = "Y2FjaGVk"
+NEW_VECTOR = "bmV3"
+
+@pytest.fixture
+def stub_backend(monkeypatch):
+    """리트리버 백엔드 스텁: return_query_vector를 요청한 경우에만 query_vector를 돌려줌"""
+    requests = []
+
+    def respond(request):
+        requests.append(request)
+        data = {"scores": [1.0], "doc_ids": ["job-1"], "documents": [{"title": "백엔드 개발자", "company_name": "카카오"}]}
+        if request.get("return_query_vector"):
+            data["query_vector"] = request.get("query_vector") or NEW_VECTOR
+        return data
+
+    async def respond_async(request):
+        return respond(request)
+
+    monkeypatch.setattr(hybrid_retriever, "_invoke_with_cache", respond)
+    monkeypatch.setattr(hybrid_retriever, "_invoke_with_cache_async", respond_async)
+    return requests
+
+def _state(cached_vector=None):
+    """HyDE 쿼리 캐시가 있는 검색 상태 (cached_vector가 있으면 쿼리 벡터도 캐시됨)"""
+    user_input = {"candidate_interest": "백엔드", "hyde_query": "가상 공고"}
+    entry = {"hyde_query": "가상 공고"}
+    if cached_vector:
+        entry["query_vector"] = cached_vector
+    return {
+        "user_input": user_input,
+        "retrieval_query_cache": {tools._retrieval_profile_key(user_input): entry},
+    }
+
+class TestRecommendJobs:
+    @pytest.mark.parametrize("cached_vector", [None, CACHED_VECTOR])
+    def test_sync_returns_jobs(self, stub_backend, cached_vector):
+        """쿼리 벡터 캐시 적중 여부와 관계없이 추천 목록을 반환"""
+        result = tools.recommend_jobs_tool.func(_state(cached_vector))
+
+        assert [job["id"] for job in result["job_list"]] == ["job-1"]
+        assert stub_backend[-1].get("query_vector") == cached_vector
+
+    @pytest.mark.parametrize("cached_vector", [None, CACHED_VECTOR])
+    def test_async_returns_jobs(self, stub_backend, cached_vector):
+        result = asyncio.run(tools.recommend_jobs_async_tool.coroutine(_state(cached_vector)))
+
+        assert [job["id"] for job in result["job_list"]] == ["job-1"]
+
+    def test_uncached_vector_is_stored(self, stub_backend):
+        """캐시 미스면 리트리버가 반환한 벡터를 검색 쿼리 캐시에 저장"""
+        result = tools.recommend_jobs_tool.func(_state())
+
+        cache = result["retrieval_query_cache"]
+        assert list(cache.values())[0]["query_vector"] == NEW_VECTOR